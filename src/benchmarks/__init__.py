@@ -0,0 +1,11 @@
+"""Performance benchmarks.
+
+- `python -m benchmarks.cec2017_benchmark` - evaluations per second of cec2017
+  functions (scalar and batched evaluation)
+- `python -m benchmarks.engine_benchmark` - generations per second, memory and
+  allocations of EvolutionaryAlgorithm and CellularEvolutionaryAlgorithm
+
+Each benchmark saves results to a JSON file and can compare them with a saved
+baseline (`--compare baseline.json`).
+
+"""
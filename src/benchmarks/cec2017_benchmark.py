@@ -0,0 +1,133 @@
+"""Evaluations per second of cec2017 functions.
+
+Each function is evaluated with a single vector (scalar path, `f(x)` in a loop)
+and with matrices of several sizes (batch path, `f(X)`).
+
+Usage:
+    python -m benchmarks.cec2017_benchmark --output baseline.json
+    python -m benchmarks.cec2017_benchmark --compare baseline.json --threshold 0.1
+
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from benchmarks.common import load_results, measure, print_comparison, save_results
+from cec2017.functions import all_functions
+
+DIMENSIONS = (10, 30, 50, 100)
+BATCH_SIZES = (1, 16, 256, 4096)
+SCALAR_CALLS = 16
+
+
+def benchmark_function(
+    function, dimension, batch_sizes=BATCH_SIZES, min_time=0.2, repeat=3, seed=0
+):
+    """Measure evaluations per second of the function.
+
+    Arguments:
+        function: cec2017 function
+        dimension: number of dimensions
+        batch_sizes: numbers of rows of evaluated matrices
+        min_time: minimum time (in seconds) of a single measurement
+        repeat: number of measurements (the fastest one is used)
+        seed: seed used to generate evaluated points
+
+    Return:
+        dictionary {case: evaluations per second}, where case is "scalar" or
+        "batch_<size>"
+
+    """
+    rng = np.random.default_rng(seed)
+    rows = max(max(batch_sizes), SCALAR_CALLS)
+    points = rng.uniform(-100, 100, size=(rows, dimension))
+
+    def scalar():
+        for x in points[:SCALAR_CALLS]:
+            function(x)
+
+    results = {"scalar": SCALAR_CALLS / measure(scalar, min_time, repeat)}
+    for size in batch_sizes:
+        batch = points[:size]
+        results[f"batch_{size}"] = size / measure(
+            lambda: function(batch), min_time, repeat
+        )
+    return results
+
+
+def run(functions, dimensions, batch_sizes, min_time, repeat):
+    """Benchmark functions in all dimensions.
+
+    Return:
+        dictionary {"<function>/D<dimension>/<case>": evaluations per second}
+
+    """
+    results = {}
+    for function in functions:
+        for dimension in dimensions:
+            measured = benchmark_function(
+                function, dimension, batch_sizes, min_time, repeat
+            )
+            for case, value in measured.items():
+                results[f"{function.__name__}/D{dimension}/{case}"] = value
+            print(
+                f"{function.__name__:>4} D={dimension:<3} "
+                + " ".join(f"{case}={value:.4g}" for case, value in measured.items()),
+                flush=True,
+            )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--functions", nargs="+", help="eg. f1 f5 f21 (default: f1 - f30)"
+    )
+    parser.add_argument("--dimensions", nargs="+", type=int, default=DIMENSIONS)
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=BATCH_SIZES)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="save results as JSON")
+    parser.add_argument("--compare", help="JSON file with baseline results")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown reported as regression (default: 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    functions = all_functions
+    if args.functions:
+        functions = [
+            function
+            for function in all_functions
+            if function.__name__ in args.functions
+        ]
+
+    results = run(
+        functions, args.dimensions, args.batch_sizes, args.min_time, args.repeat
+    )
+
+    if args.output:
+        save_results(
+            args.output,
+            "cec2017",
+            results,
+            {
+                "dimensions": args.dimensions,
+                "batch_sizes": args.batch_sizes,
+                "min_time": args.min_time,
+                "repeat": args.repeat,
+            },
+        )
+    if args.compare:
+        baseline = load_results(args.compare)
+        if not print_comparison(baseline, results, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
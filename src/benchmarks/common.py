@@ -0,0 +1,123 @@
+import json
+import platform
+from time import perf_counter
+
+import numpy as np
+
+
+def measure(function, min_time=0.2, repeat=3):
+    """Measure the fastest call of `function`.
+
+    `function` is called repeatedly until calls take at least `min_time` seconds,
+    `repeat` times.
+
+    Arguments:
+        function: function without arguments
+        min_time: minimum time (in seconds) of a single measurement
+        repeat: number of measurements
+
+    Return:
+        shortest time (in seconds) of a single call
+
+    """
+    function()  # warm up (caches, lazy loading)
+    best = float("inf")
+    for _ in range(repeat):
+        calls = 0
+        start = perf_counter()
+        while True:
+            function()
+            calls += 1
+            elapsed = perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / calls)
+    return best
+
+
+def environment():
+    """Describe machine and versions used to run the benchmark."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+    }
+
+
+def save_results(filename, name, results, parameters=None, details=None):
+    """Save benchmark results as JSON.
+
+    Arguments:
+        filename: path of the JSON file
+        name: name of the benchmark
+        results: dictionary {case: value} - higher values are better
+        parameters: parameters of the benchmark
+        details: additional measurements (not used by `compare`)
+
+    """
+    data = {
+        "benchmark": name,
+        "environment": environment(),
+        "parameters": parameters or {},
+        "results": results,
+    }
+    if details is not None:
+        data["details"] = details
+    with open(filename, "w") as file:
+        json.dump(data, file, indent=2)
+
+
+def load_results(filename):
+    with open(filename) as file:
+        return json.load(file)["results"]
+
+
+def compare(baseline, results, threshold=0.1):
+    """Compare results with a baseline.
+
+    Arguments:
+        baseline: dictionary {case: value} - higher values are better
+        results: dictionary {case: value}
+        threshold: relative slowdown that is reported as a regression
+            (eg. 0.1 - results lower than 90% of the baseline)
+
+    Return:
+        list of (case, baseline's value, value, ratio) sorted by ratio - cases
+        slower than the threshold allows
+
+    """
+    regressions = []
+    for case, value in results.items():
+        if case not in baseline or not baseline[case]:
+            continue
+        ratio = value / baseline[case]
+        if ratio < 1 - threshold:
+            regressions.append((case, baseline[case], value, ratio))
+    return sorted(regressions, key=lambda regression: regression[-1])
+
+
+def print_comparison(baseline, results, threshold=0.1):
+    """Print comparison with a baseline.
+
+    Return:
+        True if there are no regressions
+
+    """
+    common = [case for case in results if case in baseline]
+    if not common:
+        print("No cases in common with the baseline.")
+        return True
+
+    ratios = np.array([results[case] / baseline[case] for case in common])
+    print(
+        f"{len(common)} cases compared with the baseline, "
+        f"geometric mean of speedups: {np.exp(np.mean(np.log(ratios))):.3f}"
+    )
+    regressions = compare(baseline, results, threshold)
+    for case, before, after, ratio in regressions:
+        print(f"REGRESSION {case}: {before:.4g} -> {after:.4g} ({ratio:.2f}x)")
+    if not regressions:
+        print(f"No regressions (threshold {threshold:.0%}).")
+    return not regressions
@@ -0,0 +1,315 @@
+"""Throughput and memory of EvolutionaryAlgorithm and CellularEvolutionaryAlgorithm.
+
+Engines are run on a cheap objective (sphere), so the engine's overhead dominates.
+Each configuration is measured in a separate process, so its peak RSS is not
+affected by the other configurations.
+
+Usage:
+    python -m benchmarks.engine_benchmark --output baseline.json
+    python -m benchmarks.engine_benchmark --grids 300x300 --engines cea-vectorized
+    python -m benchmarks.engine_benchmark --compare baseline.json --threshold 0.1
+
+"""
+import argparse
+import itertools
+import multiprocessing
+import resource
+import sys
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+
+from benchmarks.common import load_results, print_comparison, save_results
+from cellular_algorithm import (
+    CellularEvolutionaryAlgorithm,
+    CompactNeighborhood,
+    EvolutionaryAlgorithm,
+    GaussianMutation,
+    LinearNeighborhood,
+    RankSelection,
+    RouletteWheelSelection,
+    TournamentSelection,
+    TournamentSuccession,
+    UniformCrossover,
+)
+
+ENGINES = ("ea", "cea", "cea-vectorized")
+GRIDS = ("10x10", "30x30", "100x100", "300x300")
+DIMENSIONS = (10, 30)
+NEIGHBOURHOODS = ("linear1", "compact1", "compact2")
+SELECTIONS = ("tournament", "roulette", "rank")
+
+NEIGHBOURHOOD_TYPES = {"linear": LinearNeighborhood, "compact": CompactNeighborhood}
+SELECTION_FACTORIES = {
+    "tournament": lambda: TournamentSelection(2),
+    "roulette": RouletteWheelSelection,
+    "rank": RankSelection,
+}
+
+
+def sphere(x):
+    return np.sum(x * x, axis=-1)
+
+
+def parse_grid(grid):
+    return tuple(int(size) for size in grid.split("x"))
+
+
+def create_evolution(engine, grid, dimension, neighbourhood, selection, seed=0):
+    """Create evolution of the configuration.
+
+    Arguments:
+        engine: "ea", "cea" or "cea-vectorized"
+        grid: eg. "100x100" (EA uses population with the same number of cells)
+        dimension: number of dimensions
+        neighbourhood: eg. "compact1" - type and distance (ignored by EA)
+        selection: "tournament", "roulette" or "rank"
+        seed: seed of the global generators and evolution's Generator
+
+    """
+    np.random.seed(seed)
+    shape = parse_grid(grid)
+    kwargs = dict(
+        crossover=UniformCrossover(),
+        mutation=GaussianMutation(scale=1),
+        selection=SELECTION_FACTORIES[selection](),
+        succession=TournamentSuccession(tournament_size=2),
+        boundaries=((-100, 100),) * dimension,
+        function=sphere,
+        maximize=False,
+        mutation_probability=0.5,
+        batch_function=True,
+        seed=seed,
+    )
+    if engine == "ea":
+        return EvolutionaryAlgorithm(
+            population_shape=(1, int(np.prod(shape))), **kwargs
+        )
+
+    kind = neighbourhood.rstrip("0123456789")
+    distance = int(neighbourhood[len(kind) :])
+    return CellularEvolutionaryAlgorithm(
+        NEIGHBOURHOOD_TYPES[kind](distance),
+        population_shape=shape,
+        vectorized=engine == "cea-vectorized",
+        **kwargs,
+    )
+
+
+def benchmark_configuration(configuration, min_time=1.0, min_generations=3):
+    """Measure the configuration (runs in a separate process).
+
+    Arguments:
+        configuration: dictionary with `create_evolution` arguments
+        min_time: minimum time (in seconds) of the measurement
+        min_generations: minimum number of measured generations
+
+    Return:
+        dictionary with measurements:
+            - generations_per_second
+            - evaluations_per_second
+            - peak_rss - peak resident memory of the process (in bytes)
+            - allocated_per_generation - bytes allocated during a generation
+                (peak of tracemalloc)
+            - allocations_per_generation - number of memory blocks allocated
+                and not freed during a generation
+
+    """
+    evolution = create_evolution(**configuration)
+    evolution.run_single_iteration()  # warm up (neighbour tables, buffers)
+
+    generations = 0
+    start = perf_counter()
+    while True:
+        evolution.run_single_iteration()
+        generations += 1
+        elapsed = perf_counter() - start
+        if elapsed >= min_time and generations >= min_generations:
+            break
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    evolution.run_single_iteration()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(
+        max(statistic.count_diff, 0)
+        for statistic in after.compare_to(before, "lineno")
+    )
+    evolution.close()
+
+    generations_per_second = generations / elapsed
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "generations_per_second": generations_per_second,
+        "evaluations_per_second": generations_per_second
+        * evolution.population.size,
+        "peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        "allocated_per_generation": peak,
+        "allocations_per_generation": blocks,
+    }
+
+
+def configurations(
+    engines,
+    grids,
+    dimensions,
+    neighbourhoods,
+    selections,
+    max_loop_cells=10_000,
+    max_ea_cells=1_000,
+):
+    """Generate configurations of the benchmark.
+
+    Loop cEA is skipped for grids with more than `max_loop_cells` cells and EA
+    (which selects parents from the whole population for each cell, so its
+    generation takes quadratic time) for grids with more than `max_ea_cells`
+    cells. EA ignores neighbourhood, so it is measured once.
+
+    """
+    limits = {"ea": max_ea_cells, "cea": max_loop_cells}
+    for engine, grid, dimension, selection in itertools.product(
+        engines, grids, dimensions, selections
+    ):
+        if np.prod(parse_grid(grid)) > limits.get(engine, np.inf):
+            continue
+        for neighbourhood in ["-"] if engine == "ea" else neighbourhoods:
+            yield {
+                "engine": engine,
+                "grid": grid,
+                "dimension": dimension,
+                "neighbourhood": neighbourhood,
+                "selection": selection,
+            }
+
+
+def configuration_name(configuration):
+    return "/".join(
+        str(configuration[key])
+        for key in ("engine", "grid", "dimension", "neighbourhood", "selection")
+    )
+
+
+def format_row(configuration, measurement):
+    return (
+        f"{configuration['engine']:<15}{configuration['grid']:>9}"
+        f"{configuration['dimension']:>5}  {configuration['neighbourhood']:<12}"
+        f"{configuration['selection']:<11}"
+        f"{measurement['generations_per_second']:>10.2f}"
+        f"{measurement['evaluations_per_second']:>12.4g}"
+        f"{measurement['peak_rss'] / 2 ** 20:>10.1f}"
+        f"{measurement['allocated_per_generation'] / 2 ** 20:>11.2f}"
+        f"{measurement['allocations_per_generation']:>8}"
+    )
+
+
+HEADER = (
+    f"{'engine':<15}{'grid':>9}{'D':>5}  {'neighbours':<12}{'selection':<11}"
+    f"{'gen/s':>10}{'evals/s':>12}{'RSS MiB':>10}{'alloc MiB':>11}{'blocks':>8}"
+)
+
+
+def _measure(arguments):
+    return benchmark_configuration(*arguments)
+
+
+def run(configurations, min_time=1.0, min_generations=3):
+    """Measure all configurations (each in a new process), print a table.
+
+    Return:
+        list of (configuration, measurement)
+
+    """
+    print(HEADER)
+    measured = []
+    # Each configuration gets a new process, so peak RSS is measured separately
+    with multiprocessing.Pool(1, maxtasksperchild=1) as pool:
+        for configuration in configurations:
+            measurement = pool.apply(
+                _measure, ((configuration, min_time, min_generations),)
+            )
+            print(format_row(configuration, measurement), flush=True)
+            measured.append((configuration, measurement))
+    return measured
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engines", nargs="+", default=ENGINES, choices=ENGINES)
+    parser.add_argument("--grids", nargs="+", default=GRIDS, help="eg. 100x100")
+    parser.add_argument("--dimensions", nargs="+", type=int, default=DIMENSIONS)
+    parser.add_argument(
+        "--neighbourhoods",
+        nargs="+",
+        default=NEIGHBOURHOODS,
+        help="type (linear, compact) followed by distance, eg. compact2",
+    )
+    parser.add_argument(
+        "--selections", nargs="+", default=SELECTIONS, choices=SELECTIONS
+    )
+    parser.add_argument(
+        "--max-loop-cells",
+        type=int,
+        default=10_000,
+        help="skip loop cEA on larger grids (default: 10000)",
+    )
+    parser.add_argument(
+        "--max-ea-cells",
+        type=int,
+        default=1_000,
+        help="skip EA on larger populations (default: 1000)",
+    )
+    parser.add_argument("--min-time", type=float, default=1.0)
+    parser.add_argument("--min-generations", type=int, default=3)
+    parser.add_argument("--output", help="save results as JSON")
+    parser.add_argument("--compare", help="JSON file with baseline results")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown reported as regression (default: 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    measured = run(
+        configurations(
+            args.engines,
+            args.grids,
+            args.dimensions,
+            args.neighbourhoods,
+            args.selections,
+            args.max_loop_cells,
+            args.max_ea_cells,
+        ),
+        args.min_time,
+        args.min_generations,
+    )
+    results = {
+        configuration_name(configuration): measurement["generations_per_second"]
+        for configuration, measurement in measured
+    }
+
+    if args.output:
+        save_results(
+            args.output,
+            "engine",
+            results,
+            {"min_time": args.min_time, "min_generations": args.min_generations},
+            details=[
+                {**configuration, **measurement}
+                for configuration, measurement in measured
+            ],
+        )
+    if args.compare:
+        baseline = load_results(args.compare)
+        if not print_comparison(baseline, results, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
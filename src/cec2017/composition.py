@@ -2,61 +2,256 @@
 # Author: Duncan Tilley
 # Composition function definitions, f21 to f30
 
+from functools import lru_cache
+
 import numpy as np
 
 from . import basic, hybrid, transforms
 
 
 def _calc_w(x, sigma):
-    nx = len(x)
-    w = 0
-    for i in range(0, nx):
-        w += x[i] * x[i]
-    if w != 0:
-        w = ((1.0 / w) ** 0.5) * np.exp(-w / (2.0 * nx * sigma * sigma))
-    else:
-        w = float("inf")
+    nx = x.shape[-1]
+    w = np.einsum("...i,...i->...", x, x)
+    with np.errstate(divide="ignore"):
+        w = np.where(
+            w != 0, ((1.0 / w) ** 0.5) * np.exp(-w / (2.0 * nx * sigma * sigma)), np.inf
+        )
     return w
 
 
+# Maximum number of elements of the (N, n, D) arrays of one block of rows
+_BLOCK_SIZE = 2**16
+
+# Basic functions, sigmas, lambdas and biases of the components of f21 to f28
+_COMPOSITIONS = {
+    21: (
+        [basic.rosenbrock, basic.high_conditioned_elliptic, basic.rastrigin],
+        np.array([10.0, 20.0, 30.0]),
+        np.array([1.0, 1.0e-6, 1.0]),
+        np.array([0.0, 100.0, 200.0]),
+    ),
+    22: (
+        [basic.rastrigin, basic.griewank, basic.modified_schwefel],
+        np.array([10.0, 20.0, 30.0]),
+        np.array([1.0, 10.0, 1.0]),
+        np.array([0.0, 100.0, 200.0]),
+    ),
+    23: (
+        [basic.rosenbrock, basic.ackley, basic.modified_schwefel, basic.rastrigin],
+        np.array([10.0, 20.0, 30.0, 40.0]),
+        np.array([1.0, 10.0, 1.0, 1.0]),
+        np.array([0.0, 100.0, 200.0, 300.0]),
+    ),
+    24: (
+        [
+            basic.ackley,
+            basic.high_conditioned_elliptic,
+            basic.griewank,
+            basic.rastrigin,
+        ],
+        np.array([10.0, 20.0, 30.0, 40.0]),
+        np.array([1.0, 1.0e-6, 10.0, 1.0]),
+        np.array([0.0, 100.0, 200.0, 300.0]),
+    ),
+    25: (
+        [
+            basic.rastrigin,
+            basic.happy_cat,
+            basic.ackley,
+            basic.discus,
+            basic.rosenbrock,
+        ],
+        np.array([10.0, 20.0, 30.0, 40.0, 50.0]),
+        np.array([10.0, 1.0, 10.0, 1.0e-6, 1.0]),
+        np.array([0.0, 100.0, 200.0, 300.0, 400.0]),
+    ),
+    26: (
+        [
+            basic.expanded_schaffers_f6,
+            basic.modified_schwefel,
+            basic.griewank,
+            basic.rosenbrock,
+            basic.rastrigin,
+        ],
+        np.array([10.0, 20.0, 20.0, 30.0, 40.0]),
+        # Note: the lambdas specified in the problem definitions (below) differ
+        # from what is used in the code
+        # np.array([1.0e-26, 10.0, 1.0e-6, 10.0, 5.0e-4])
+        np.array([5.0e-4, 1.0, 10.0, 1.0, 10.0]),
+        np.array([0.0, 100.0, 200.0, 300.0, 400.0]),
+    ),
+    27: (
+        [
+            basic.h_g_bat,
+            basic.rastrigin,
+            basic.modified_schwefel,
+            basic.bent_cigar,
+            basic.high_conditioned_elliptic,
+            basic.expanded_schaffers_f6,
+        ],
+        np.array([10.0, 20.0, 30.0, 40.0, 50.0, 60.0]),
+        np.array([10.0, 10.0, 2.5, 1.0e-26, 1.0e-6, 5.0e-4]),
+        np.array([0.0, 100.0, 200.0, 300.0, 400.0, 500.0]),
+    ),
+    28: (
+        [
+            basic.ackley,
+            basic.griewank,
+            basic.discus,
+            basic.rosenbrock,
+            basic.happy_cat,
+            basic.expanded_schaffers_f6,
+        ],
+        np.array([10.0, 20.0, 30.0, 40.0, 50.0, 60.0]),
+        np.array([10.0, 10.0, 1.0e-6, 1.0, 1.0, 5.0e-4]),
+        np.array([0.0, 100.0, 200.0, 300.0, 400.0, 500.0]),
+    ),
+}
+
+# Hybrid functions (ids of f11 to f20), sigmas and biases of the components of
+# f29 and f30
+_HYBRID_COMPOSITIONS = {
+    29: (
+        [15, 16, 17],
+        np.array([10.0, 30.0, 50.0]),
+        np.array([0.0, 100.0, 200.0]),
+    ),
+    30: (
+        [15, 18, 19],
+        np.array([10.0, 30.0, 50.0]),
+        np.array([0.0, 100.0, 200.0]),
+    ),
+}
+
+
+def _compose(x, rotations, shifts, component, sigmas, lambdas, biases):
+    """
+    Combines the values of N component functions, weighted by the distance of
+    x to the optimum (shift) of each component.
+
+    All components are shifted and rotated with one stacked matrix product and
+    the weights of all components and rows are computed at once.
+
+    Args:
+        x (array): Input vector or matrix (one vector per row).
+        rotations (array): Rotation matrices (NxDxD) of the components.
+        shifts (array): Shift vectors (NxD) of the components.
+        component (function): Returns the values of the i-th component (without
+            its bias), called as component(i, z) with the shifted and rotated
+            input z (one vector per row).
+        sigmas (array): Sigma of each component (N).
+        lambdas (array): Scale of each component (N).
+        biases (array): Bias of each component (N).
+    """
+    shape = np.shape(x)
+    nx = shape[-1]
+    N = len(sigmas)
+    x = np.reshape(x, (-1, nx))
+    constants = sigmas, lambdas, biases
+
+    # large batches are computed in blocks of rows, so the temporary (N, n, D)
+    # arrays stay small
+    rows = max(1, _BLOCK_SIZE // (N * nx))
+    if x.shape[0] > rows:
+        blocks = [
+            _compose(x[k : k + rows], rotations, shifts, component, *constants)
+            for k in range(0, x.shape[0], rows)
+        ]
+        return np.concatenate(blocks).reshape(shape[:-1])
+
+    # computed column-wise, (N, D, n), then viewed as (N, n, D) - the kernels
+    # reduce faster along the last axis of such (column-major) blocks
+    x_shifted = np.ascontiguousarray(x.T)
+    x_shifted = x_shifted - np.asarray(shifts)[:N, :nx, np.newaxis]
+    rotations = rotations[:N]
+    if any(isinstance(rotation, transforms.BlockRotation) for rotation in rotations):
+        # structured rotations are applied one by one
+        x_rotated = np.stack([r @ x_i for r, x_i in zip(rotations, x_shifted)])
+    else:
+        x_rotated = np.matmul(np.asarray(rotations), x_shifted)
+    dtype = x_rotated.dtype
+    sigmas, lambdas, biases = (a.astype(dtype, copy=False) for a in constants)
+    x_shifted = np.swapaxes(x_shifted, -1, -2)
+    x_rotated = np.swapaxes(x_rotated, -1, -2)
+
+    vals = np.empty((N, x.shape[0]), dtype=dtype)
+    for i in range(0, N):
+        vals[i] = component(i, x_rotated[i])
+
+    # (N, n) weights, normalized over the components
+    w = _calc_w(x_shifted, sigmas[:, np.newaxis])
+    w_sm = np.sum(w, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = np.where(w_sm != 0.0, w / w_sm, 1 / N)
+
+    result = np.sum(
+        w * (lambdas[:, np.newaxis] * vals + biases[:, np.newaxis]), axis=0
+    )
+    return result[0] if len(shape) == 1 else result.reshape(shape[:-1])
+
+
+def _basic_composition(x, rotations, shifts, funcs, sigmas, lambdas, biases):
+    """
+    Composition of rotated basic functions (f21 to f28).
+    """
+
+    def component(i, z):
+        return funcs[i](z)
+
+    return _compose(x, rotations, shifts, component, sigmas, lambdas, biases)
+
+
+def _partitions(shuffles, hybrids):
+    # partitions of the permutations of the hybrid components (f29 and f30)
+    return tuple(
+        hybrid._partition(shuffle, hybrid._HYBRIDS[function_id][1])
+        for shuffle, function_id in zip(shuffles, hybrids)
+    )
+
+
+@lru_cache(maxsize=None)
+def _official_partitions(function_id, nx):
+    # partitions of the official permutations of f<function_id>
+    return _partitions(
+        transforms.shuffles_cf[nx][function_id - 29],
+        _HYBRID_COMPOSITIONS[function_id][0],
+    )
+
+
+def _hybrid_composition(x, rotations, shifts, shuffles, hybrids, sigmas, biases):
+    """
+    Composition of hybrid functions (f29 and f30). The hybrid functions are
+    computed from the already shifted and rotated input (their own transforms
+    are the component's rotation and shift).
+    """
+
+    def component(i, z):
+        return hybrid._hybrid(z, shuffles[i], *hybrid._HYBRIDS[hybrids[i]])
+
+    lambdas = np.ones(len(sigmas))
+    return _compose(x, rotations, shifts, component, sigmas, lambdas, biases)
+
+
 def f21(x, rotations=None, shifts=None):
     """
     Composition Function 1 (N=3)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotations is None:
         rotations = transforms.rotations_cf[nx][0]
     if shifts is None:
         shifts = transforms.shifts_cf[0]
 
-    N = 3
-    funcs = [basic.rosenbrock, basic.high_conditioned_elliptic, basic.rastrigin]
-    sigmas = np.array([10.0, 20.0, 30.0])
-    lambdas = np.array([1.0, 1.0e-6, 1.0])
-    biases = np.array([0.0, 100.0, 200.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x - shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if w_sm != 0.0:
-        w /= w_sm
-    else:
-        w = np.full(N, 1 / N)
-
-    return np.sum(w * (lambdas * vals + biases)) + 2100
+    return _basic_composition(x, rotations, shifts, *_COMPOSITIONS[21]) + 2100
 
 
 def f22(x, rotations=None, shifts=None):
@@ -64,39 +259,21 @@ def f22(x, rotations=None, shifts=None):
     Composition Function 2 (N=3)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotations is None:
         rotations = transforms.rotations_cf[nx][1]
     if shifts is None:
         shifts = transforms.shifts_cf[1]
 
-    N = 3
-    funcs = [basic.rastrigin, basic.griewank, basic.modified_schwefel]
-    sigmas = np.array([10.0, 20.0, 30.0])
-    lambdas = np.array([1.0, 10.0, 1.0])
-    biases = np.array([0.0, 100.0, 200.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x - shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if w_sm != 0.0:
-        w /= w_sm
-    else:
-        w = np.full(N, 1 / N)
-
-    return np.sum(w * (lambdas * vals + biases)) + 2200
+    return _basic_composition(x, rotations, shifts, *_COMPOSITIONS[22]) + 2200
 
 
 def f23(x, rotations=None, shifts=None):
@@ -104,39 +281,21 @@ def f23(x, rotations=None, shifts=None):
     Composition Function 3 (N=4)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotations is None:
         rotations = transforms.rotations_cf[nx][2]
     if shifts is None:
         shifts = transforms.shifts_cf[2]
 
-    N = 4
-    funcs = [basic.rosenbrock, basic.ackley, basic.modified_schwefel, basic.rastrigin]
-    sigmas = np.array([10.0, 20.0, 30.0, 40.0])
-    lambdas = np.array([1.0, 10.0, 1.0, 1.0])
-    biases = np.array([0.0, 100.0, 200.0, 300.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x - shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if w_sm != 0.0:
-        w /= w_sm
-    else:
-        w = np.full(N, 1 / N)
-
-    return np.sum(w * (lambdas * vals + biases)) + 2300
+    return _basic_composition(x, rotations, shifts, *_COMPOSITIONS[23]) + 2300
 
 
 def f24(x, rotations=None, shifts=None):
@@ -144,44 +303,21 @@ def f24(x, rotations=None, shifts=None):
     Composition Function 4 (N=4)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotations is None:
         rotations = transforms.rotations_cf[nx][3]
     if shifts is None:
         shifts = transforms.shifts_cf[3]
 
-    N = 4
-    funcs = [
-        basic.ackley,
-        basic.high_conditioned_elliptic,
-        basic.griewank,
-        basic.rastrigin,
-    ]
-    sigmas = np.array([10.0, 20.0, 30.0, 40.0])
-    lambdas = np.array([1.0, 1.0e-6, 10.0, 1.0])
-    biases = np.array([0.0, 100.0, 200.0, 300.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x - shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if w_sm != 0.0:
-        w /= w_sm
-    else:
-        w = np.full(N, 1 / N)
-
-    return np.sum(w * (lambdas * vals + biases)) + 2400
+    return _basic_composition(x, rotations, shifts, *_COMPOSITIONS[24]) + 2400
 
 
 def f25(x, rotations=None, shifts=None):
@@ -189,45 +325,21 @@ def f25(x, rotations=None, shifts=None):
     Composition Function 5 (N=5)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotations is None:
         rotations = transforms.rotations_cf[nx][4]
     if shifts is None:
         shifts = transforms.shifts_cf[4]
 
-    N = 5
-    funcs = [
-        basic.rastrigin,
-        basic.happy_cat,
-        basic.ackley,
-        basic.discus,
-        basic.rosenbrock,
-    ]
-    sigmas = np.array([10.0, 20.0, 30.0, 40.0, 50.0])
-    lambdas = np.array([10.0, 1.0, 10.0, 1.0e-6, 1.0])
-    biases = np.array([0.0, 100.0, 200.0, 300.0, 400.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x - shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if w_sm != 0.0:
-        w /= w_sm
-    else:
-        w = np.full(N, 1 / N)
-
-    return np.sum(w * (lambdas * vals + biases)) + 2500
+    return _basic_composition(x, rotations, shifts, *_COMPOSITIONS[25]) + 2500
 
 
 def f26(x, rotations=None, shifts=None):
@@ -235,47 +347,21 @@ def f26(x, rotations=None, shifts=None):
     Composition Function 6 (N=5)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotations is None:
         rotations = transforms.rotations_cf[nx][5]
     if shifts is None:
         shifts = transforms.shifts_cf[5]
 
-    N = 5
-    funcs = [
-        basic.expanded_schaffers_f6,
-        basic.modified_schwefel,
-        basic.griewank,
-        basic.rosenbrock,
-        basic.rastrigin,
-    ]
-    sigmas = np.array([10.0, 20.0, 20.0, 30.0, 40.0])
-    # Note: the lambdas specified in the problem definitions (below) differ from what is used in the code
-    # lambdas = np.array([1.0e-26, 10.0, 1.0e-6, 10.0, 5.0e-4])
-    lambdas = np.array([5.0e-4, 1.0, 10.0, 1.0, 10.0])
-    biases = np.array([0.0, 100.0, 200.0, 300.0, 400.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x - shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if w_sm != 0.0:
-        w /= w_sm
-    else:
-        w = np.full(N, 1 / N)
-
-    return np.sum(w * (lambdas * vals + biases)) + 2600
+    return _basic_composition(x, rotations, shifts, *_COMPOSITIONS[26]) + 2600
 
 
 def f27(x, rotations=None, shifts=None):
@@ -283,46 +369,21 @@ def f27(x, rotations=None, shifts=None):
     Composition Function 7 (N=6)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotations is None:
         rotations = transforms.rotations_cf[nx][6]
     if shifts is None:
         shifts = transforms.shifts_cf[6]
 
-    N = 6
-    funcs = [
-        basic.h_g_bat,
-        basic.rastrigin,
-        basic.modified_schwefel,
-        basic.bent_cigar,
-        basic.high_conditioned_elliptic,
-        basic.expanded_schaffers_f6,
-    ]
-    sigmas = np.array([10.0, 20.0, 30.0, 40.0, 50.0, 60.0])
-    lambdas = np.array([10.0, 10.0, 2.5, 1.0e-26, 1.0e-6, 5.0e-4])
-    biases = np.array([0.0, 100.0, 200.0, 300.0, 400.0, 500.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x - shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if w_sm != 0.0:
-        w /= w_sm
-    else:
-        w = np.full(N, 1 / N)
-
-    return np.sum(w * (lambdas * vals + biases)) + 2700
+    return _basic_composition(x, rotations, shifts, *_COMPOSITIONS[27]) + 2700
 
 
 def f28(x, rotations=None, shifts=None):
@@ -330,46 +391,21 @@ def f28(x, rotations=None, shifts=None):
     Composition Function 8 (N=6)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
         shifts (array): Optional shift vectors (NxD). If None (default), the
             official vectors from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotations is None:
         rotations = transforms.rotations_cf[nx][7]
     if shifts is None:
         shifts = transforms.shifts_cf[7]
 
-    N = 6
-    funcs = [
-        basic.ackley,
-        basic.griewank,
-        basic.discus,
-        basic.rosenbrock,
-        basic.happy_cat,
-        basic.expanded_schaffers_f6,
-    ]
-    sigmas = np.array([10.0, 20.0, 30.0, 40.0, 50.0, 60.0])
-    lambdas = np.array([10.0, 10.0, 1.0e-6, 1.0, 1.0, 5.0e-4])
-    biases = np.array([0.0, 100.0, 200.0, 300.0, 400.0, 500.0])
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x - shifts[i][:nx]
-        vals[i] = funcs[i](np.matmul(rotations[i], x_shifted))
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if w_sm != 0.0:
-        w /= w_sm
-    else:
-        w = np.full(N, 1 / N)
-
-    return np.sum(w * (lambdas * vals + biases)) + 2800
+    return _basic_composition(x, rotations, shifts, *_COMPOSITIONS[28]) + 2800
 
 
 def f29(x, rotations=None, shifts=None, shuffles=None):
@@ -377,7 +413,8 @@ def f29(x, rotations=None, shifts=None, shuffles=None):
     Composition Function 9 (N=3)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
@@ -386,39 +423,18 @@ def f29(x, rotations=None, shifts=None, shuffles=None):
         shuffles (array): Optional shuffle vectors (NxD). If None (default), the
             official permutation vectors from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotations is None:
         rotations = transforms.rotations_cf[nx][8]
     if shifts is None:
         shifts = transforms.shifts_cf[8]
     if shuffles is None:
-        shuffles = transforms.shuffles_cf[nx][0]
-
-    N = 3
-    funcs = [hybrid.f15, hybrid.f16, hybrid.f17]
-    sigmas = np.array([10.0, 30.0, 50.0])
-    biases = np.array([0.0, 100.0, 200.0])
-    offsets = np.array(
-        [1500, 1600, 1700]
-    )  # subtract F* added at the end of the functions
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x - shifts[i][:nx]
-        vals[i] = funcs[i](
-            x, rotation=rotations[i], shift=shifts[i][:nx], shuffle=shuffles[i]
-        )
-        vals[i] -= offsets[i]
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if w_sm != 0.0:
-        w /= w_sm
-    else:
-        w = np.full(N, 1 / N)
+        shuffles = _official_partitions(29, nx)
 
-    return np.sum(w * (vals + biases)) + 2900
+    return (
+        _hybrid_composition(x, rotations, shifts, shuffles, *_HYBRID_COMPOSITIONS[29])
+        + 2900
+    )
 
 
 def f30(x, rotations=None, shifts=None, shuffles=None):
@@ -426,7 +442,8 @@ def f30(x, rotations=None, shifts=None, shuffles=None):
     Composition Function 10 (N=3)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotations (matrix): Optional rotation matrices (NxDxD). If None
             (default), the official matrices from the benchmark suite will be
             used.
@@ -435,36 +452,15 @@ def f30(x, rotations=None, shifts=None, shuffles=None):
         shuffles (array): Optional shuffle vectors (NxD). If None (default), the
             official permutation vectors from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotations is None:
         rotations = transforms.rotations_cf[nx][9]
     if shifts is None:
         shifts = transforms.shifts_cf[9]
     if shuffles is None:
-        shuffles = transforms.shuffles_cf[nx][1]
-
-    N = 3
-    funcs = [hybrid.f15, hybrid.f18, hybrid.f19]
-    sigmas = np.array([10.0, 30.0, 50.0])
-    biases = np.array([0.0, 100.0, 200.0])
-    offsets = np.array(
-        [1500, 1800, 1900]
-    )  # subtract F* added at the end of the functions
-    vals = np.zeros(N)
-    w = np.zeros(N)
-    w_sm = 0.0
-    for i in range(0, N):
-        x_shifted = x - shifts[i][:nx]
-        vals[i] = funcs[i](
-            x, rotation=rotations[i], shift=shifts[i][:nx], shuffle=shuffles[i]
-        )
-        vals[i] -= offsets[i]
-        w[i] = _calc_w(x_shifted, sigmas[i])
-        w_sm += w[i]
-
-    if w_sm != 0.0:
-        w /= w_sm
-    else:
-        w = np.full(N, 1 / N)
+        shuffles = _official_partitions(30, nx)
 
-    return np.sum(w * (vals + biases)) + 3000
+    return (
+        _hybrid_composition(x, rotations, shifts, shuffles, *_HYBRID_COMPOSITIONS[30])
+        + 3000
+    )
@@ -2,38 +2,189 @@
 # Author: Duncan Tilley
 # Hybrid function definitions, f11 to f20
 
+from collections import namedtuple
+from functools import lru_cache
+
 import numpy as np
 
 from . import basic, transforms
 
 
-def _shuffle_and_partition(x, shuffle, partitions):
+# Gather indices of the partitions of a permutation - see _partition
+_Partition = namedtuple("_Partition", ["shuffle", "slices", "indices"])
+
+
+def _partition(shuffle, partitions):
     """
-    First applies the given permutation, then splits x into partitions given
-    the percentages.
+    Computes the partitions of the permutation, so that they can be resolved
+    once for a function and dimension and passed instead of the permutation.
 
     Args:
-        x (array): Input vector.
         shuffle (array): Shuffle vector.
-        partitions (list): List of percentages. Assumed to add up to 1.0.
+        partitions (tuple): Percentages. Assumed to add up to 1.0.
 
     Returns:
-        (list of arrays): The partitions of x after shuffling.
+        (_Partition): The shuffle vector, slices of the shuffled vector and the
+            gather indices of each partition.
     """
-    nx = len(x)
-    # shuffle
-    xs = np.zeros(x.shape)
-    for i in range(0, nx):
-        xs[i] = x[shuffle[i]]
-    # and partition
-    parts = []
+    shuffle = np.array(shuffle, dtype=np.intp)
+    nx = shuffle.shape[0]
+    slices = []
     start, end = 0, 0
     for p in partitions[:-1]:
         end = start + int(np.ceil(p * nx))
-        parts.append(xs[start:end])
+        slices.append(slice(start, end))
         start = end
-    parts.append(xs[end:])
-    return parts
+    slices.append(slice(end, None))
+    indices = tuple(shuffle[part].copy() for part in slices)
+    return _Partition(shuffle, tuple(slices), indices)
+
+
+@lru_cache(maxsize=None)
+def _official_partition(function_id, nx):
+    # partitions of the official permutation of f<function_id>
+    return _partition(
+        transforms.shuffles[nx][function_id - 11], _HYBRIDS[function_id][1]
+    )
+
+
+def _shuffle_and_partition(x, shuffle, partitions):
+    """
+    First applies the given permutation, then splits x into partitions given
+    the percentages. Partitions of a matrix are gathered directly into
+    contiguous blocks of columns.
+
+    Args:
+        x (array): Input vector or matrix (one vector per row).
+        shuffle (array): Shuffle vector, or its partitions from _partition.
+        partitions (tuple): Percentages. Assumed to add up to 1.0.
+
+    Returns:
+        (list of arrays): The partitions of x after shuffling.
+    """
+    if not isinstance(shuffle, _Partition):
+        shuffle = _partition(shuffle, partitions)
+    if x.ndim == 1:
+        # a single gather is cheaper for a vector
+        xs = x[shuffle.shuffle]
+        return [xs[part] for part in shuffle.slices]
+    return [x[..., index] for index in shuffle.indices]
+
+
+# Basic functions applied to the consecutive partitions of the shuffled vector
+# and sizes of the partitions (fractions of the dimension) of f11 to f20
+_HYBRIDS = {
+    11: (
+        [
+            basic.zakharov,
+            basic.rosenbrock,
+            basic.rastrigin,
+        ],
+        (0.2, 0.4, 0.4),
+    ),
+    12: (
+        [
+            basic.high_conditioned_elliptic,
+            basic.modified_schwefel,
+            basic.bent_cigar,
+        ],
+        (0.3, 0.3, 0.4),
+    ),
+    13: (
+        [
+            basic.bent_cigar,
+            basic.rosenbrock,
+            basic.lunacek_bi_rastrigin,
+        ],
+        (0.3, 0.3, 0.4),
+    ),
+    14: (
+        [
+            basic.high_conditioned_elliptic,
+            basic.ackley,
+            basic.schaffers_f7,
+            basic.rastrigin,
+        ],
+        (0.2, 0.2, 0.2, 0.4),
+    ),
+    15: (
+        [
+            basic.bent_cigar,
+            basic.h_g_bat,
+            basic.rastrigin,
+            basic.rosenbrock,
+        ],
+        (0.2, 0.2, 0.3, 0.3),
+    ),
+    16: (
+        [
+            basic.expanded_schaffers_f6,
+            basic.h_g_bat,
+            basic.rosenbrock,
+            basic.modified_schwefel,
+        ],
+        (0.2, 0.2, 0.3, 0.3),
+    ),
+    17: (
+        [
+            basic.katsuura,
+            basic.ackley,
+            basic.expanded_griewanks_plus_rosenbrock,
+            basic.modified_schwefel,
+            basic.rastrigin,
+        ],
+        (0.1, 0.2, 0.2, 0.2, 0.3),
+    ),
+    18: (
+        [
+            basic.high_conditioned_elliptic,
+            basic.ackley,
+            basic.rastrigin,
+            basic.h_g_bat,
+            basic.discus,
+        ],
+        (0.2, 0.2, 0.2, 0.2, 0.2),
+    ),
+    19: (
+        [
+            basic.bent_cigar,
+            basic.rastrigin,
+            basic.expanded_griewanks_plus_rosenbrock,
+            basic.weierstrass,
+            basic.expanded_schaffers_f6,
+        ],
+        (0.2, 0.2, 0.2, 0.2, 0.2),
+    ),
+    20: (
+        [
+            basic.happy_cat,
+            basic.katsuura,
+            basic.ackley,
+            basic.rastrigin,
+            basic.modified_schwefel,
+            basic.schaffers_f7,
+        ],
+        (0.1, 0.1, 0.2, 0.2, 0.2, 0.2),
+    ),
+}
+
+
+def _hybrid(x, shuffle, funcs, partitions):
+    """
+    Sums the basic functions applied to the partitions of the shuffled x.
+
+    Args:
+        x (array): Shifted and rotated input vector or matrix (one vector per
+            row).
+        shuffle (array): Shuffle vector, or its partitions from _partition.
+        funcs (list): Basic function for each partition.
+        partitions (tuple): Percentages. Assumed to add up to 1.0.
+    """
+    x_parts = _shuffle_and_partition(x, shuffle, partitions)
+    y = funcs[0](x_parts[0])
+    for func, x_part in zip(funcs[1:], x_parts[1:]):
+        y += func(x_part)
+    return y
 
 
 def f11(x, rotation=None, shift=None, shuffle=None):
@@ -41,7 +192,8 @@ def f11(x, rotation=None, shift=None, shuffle=None):
     Hybrid Function 1 (N=3)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -49,21 +201,16 @@ def f11(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][10]
     if shift is None:
         shift = transforms.shifts[10][:nx]
     if shuffle is None:
-        shuffle = transforms.shuffles[nx][0]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.2, 0.4, 0.4])
+        shuffle = _official_partition(11, nx)
 
-    y = basic.zakharov(x_parts[0])
-    y += basic.rosenbrock(x_parts[1])
-    y += basic.rastrigin(x_parts[2])
-    return y + 1100.0
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
+    return _hybrid(x_transformed, shuffle, *_HYBRIDS[11]) + 1100.0
 
 
 def f12(x, rotation=None, shift=None, shuffle=None):
@@ -71,7 +218,8 @@ def f12(x, rotation=None, shift=None, shuffle=None):
     Hybrid Function 2 (N=3)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -79,21 +227,16 @@ def f12(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][11]
     if shift is None:
         shift = transforms.shifts[11][:nx]
     if shuffle is None:
-        shuffle = transforms.shuffles[nx][1]
+        shuffle = _official_partition(12, nx)
 
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.3, 0.3, 0.4])
-
-    y = basic.high_conditioned_elliptic(x_parts[0])
-    y += basic.modified_schwefel(x_parts[1])
-    y += basic.bent_cigar(x_parts[2])
-    return y + 1200.0
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
+    return _hybrid(x_transformed, shuffle, *_HYBRIDS[12]) + 1200.0
 
 
 def f13(x, rotation=None, shift=None, shuffle=None):
@@ -101,7 +244,8 @@ def f13(x, rotation=None, shift=None, shuffle=None):
     Hybrid Function 3 (N=3)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -109,21 +253,16 @@ def f13(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][12]
     if shift is None:
         shift = transforms.shifts[12][:nx]
     if shuffle is None:
-        shuffle = transforms.shuffles[nx][2]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.3, 0.3, 0.4])
+        shuffle = _official_partition(13, nx)
 
-    y = basic.bent_cigar(x_parts[0])
-    y += basic.rosenbrock(x_parts[1])
-    y += basic.lunacek_bi_rastrigin(x_parts[2])
-    return y + 1300.0
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
+    return _hybrid(x_transformed, shuffle, *_HYBRIDS[13]) + 1300.0
 
 
 def f14(x, rotation=None, shift=None, shuffle=None):
@@ -131,7 +270,8 @@ def f14(x, rotation=None, shift=None, shuffle=None):
     Hybrid Function 4 (N=4)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -139,22 +279,16 @@ def f14(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][13]
     if shift is None:
         shift = transforms.shifts[13][:nx]
     if shuffle is None:
-        shuffle = transforms.shuffles[nx][3]
+        shuffle = _official_partition(14, nx)
 
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.2, 0.2, 0.2, 0.4])
-
-    y = basic.high_conditioned_elliptic(x_parts[0])
-    y += basic.ackley(x_parts[1])
-    y += basic.schaffers_f7(x_parts[2])
-    y += basic.rastrigin(x_parts[3])
-    return y + 1400.0
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
+    return _hybrid(x_transformed, shuffle, *_HYBRIDS[14]) + 1400.0
 
 
 def f15(x, rotation=None, shift=None, shuffle=None):
@@ -162,7 +296,8 @@ def f15(x, rotation=None, shift=None, shuffle=None):
     Hybrid Function 5 (N=4)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -170,22 +305,16 @@ def f15(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][14]
     if shift is None:
         shift = transforms.shifts[14][:nx]
     if shuffle is None:
-        shuffle = transforms.shuffles[nx][4]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.2, 0.2, 0.3, 0.3])
+        shuffle = _official_partition(15, nx)
 
-    y = basic.bent_cigar(x_parts[0])
-    y += basic.h_g_bat(x_parts[1])
-    y += basic.rastrigin(x_parts[2])
-    y += basic.rosenbrock(x_parts[3])
-    return y + 1500.0
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
+    return _hybrid(x_transformed, shuffle, *_HYBRIDS[15]) + 1500.0
 
 
 def f16(x, rotation=None, shift=None, shuffle=None):
@@ -193,7 +322,8 @@ def f16(x, rotation=None, shift=None, shuffle=None):
     Hybrid Function 6 (N=4)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -201,22 +331,16 @@ def f16(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][15]
     if shift is None:
         shift = transforms.shifts[15][:nx]
     if shuffle is None:
-        shuffle = transforms.shuffles[nx][5]
+        shuffle = _official_partition(16, nx)
 
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.2, 0.2, 0.3, 0.3])
-
-    y = basic.expanded_schaffers_f6(x_parts[0])
-    y += basic.h_g_bat(x_parts[1])
-    y += basic.rosenbrock(x_parts[2])
-    y += basic.modified_schwefel(x_parts[3])
-    return y + 1600.0
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
+    return _hybrid(x_transformed, shuffle, *_HYBRIDS[16]) + 1600.0
 
 
 def f17(x, rotation=None, shift=None, shuffle=None):
@@ -224,7 +348,8 @@ def f17(x, rotation=None, shift=None, shuffle=None):
     Hybrid Function 7 (N=5)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -232,23 +357,16 @@ def f17(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][16]
     if shift is None:
         shift = transforms.shifts[16][:nx]
     if shuffle is None:
-        shuffle = transforms.shuffles[nx][6]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.1, 0.2, 0.2, 0.2, 0.3])
+        shuffle = _official_partition(17, nx)
 
-    y = basic.katsuura(x_parts[0])
-    y += basic.ackley(x_parts[1])
-    y += basic.expanded_griewanks_plus_rosenbrock(x_parts[2])
-    y += basic.modified_schwefel(x_parts[3])
-    y += basic.rastrigin(x_parts[4])
-    return y + 1700.0
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
+    return _hybrid(x_transformed, shuffle, *_HYBRIDS[17]) + 1700.0
 
 
 def f18(x, rotation=None, shift=None, shuffle=None):
@@ -256,7 +374,8 @@ def f18(x, rotation=None, shift=None, shuffle=None):
     Hybrid Function 8 (N=5)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -264,23 +383,16 @@ def f18(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][17]
     if shift is None:
         shift = transforms.shifts[17][:nx]
     if shuffle is None:
-        shuffle = transforms.shuffles[nx][7]
+        shuffle = _official_partition(18, nx)
 
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.2, 0.2, 0.2, 0.2, 0.2])
-
-    y = basic.high_conditioned_elliptic(x_parts[0])
-    y += basic.ackley(x_parts[1])
-    y += basic.rastrigin(x_parts[2])
-    y += basic.h_g_bat(x_parts[3])
-    y += basic.discus(x_parts[4])
-    return y + 1800.0
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
+    return _hybrid(x_transformed, shuffle, *_HYBRIDS[18]) + 1800.0
 
 
 def f19(x, rotation=None, shift=None, shuffle=None):
@@ -288,7 +400,8 @@ def f19(x, rotation=None, shift=None, shuffle=None):
     Hybrid Function 9 (N=5)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -296,23 +409,16 @@ def f19(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][18]
     if shift is None:
         shift = transforms.shifts[18][:nx]
     if shuffle is None:
-        shuffle = transforms.shuffles[nx][8]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(x_transformed, shuffle, [0.2, 0.2, 0.2, 0.2, 0.2])
+        shuffle = _official_partition(19, nx)
 
-    y = basic.bent_cigar(x_parts[0])
-    y += basic.rastrigin(x_parts[1])
-    y += basic.expanded_griewanks_plus_rosenbrock(x_parts[2])
-    y += basic.weierstrass(x_parts[3])
-    y += basic.expanded_schaffers_f6(x_parts[4])
-    return y + 1900.0
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
+    return _hybrid(x_transformed, shuffle, *_HYBRIDS[19]) + 1900.0
 
 
 def f20(x, rotation=None, shift=None, shuffle=None):
@@ -320,7 +426,8 @@ def f20(x, rotation=None, shift=None, shuffle=None):
     Hybrid Function 10 (N=6)
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -328,26 +435,16 @@ def f20(x, rotation=None, shift=None, shuffle=None):
         shuffle (array): Optionbal shuffle vector. If None (default), the
             official permutation vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][19]
     if shift is None:
         shift = transforms.shifts[19][:nx]
     if shuffle is None:
-        shuffle = transforms.shuffles[nx][9]
-
-    x_transformed = np.matmul(rotation, x - shift)
-    x_parts = _shuffle_and_partition(
-        x_transformed, shuffle, [0.1, 0.1, 0.2, 0.2, 0.2, 0.2]
-    )
+        shuffle = _official_partition(20, nx)
 
-    y = basic.happy_cat(x_parts[0])
-    y += basic.katsuura(x_parts[1])
-    y += basic.ackley(x_parts[2])
-    y += basic.rastrigin(x_parts[3])
-    y += basic.modified_schwefel(x_parts[4])
-    y += basic.schaffers_f7(x_parts[5])
-    return y + 2000.0
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
+    return _hybrid(x_transformed, shuffle, *_HYBRIDS[20]) + 2000.0
 
 
 all_functions = [f11, f12, f13, f14, f15, f16, f17, f18, f19, f20]
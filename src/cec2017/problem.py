@@ -0,0 +1,225 @@
+# cec2017.problem
+# Problem objects - functions f1 to f30 with the official (or generated)
+# rotation, shift and shuffle data resolved once for a given dimension
+
+from functools import lru_cache
+
+import numpy as np
+
+from . import composition, hybrid, transforms
+from .functions import all_functions
+
+
+def _load(arrays, dimension, dtype):
+    # arrays is one of the dicts in transforms (e.g. transforms.rotations)
+    return transforms.load(arrays.names[dimension], dtype)
+
+
+def _cast(value, dtype):
+    # converts generated transforms (arrays, block rotations or tuples of them)
+    if isinstance(value, tuple):
+        return tuple(_cast(v, dtype) for v in value)
+    if isinstance(value, transforms.BlockRotation):
+        return value if value.dtype == dtype else value.astype(dtype)
+    if value.dtype.kind != "f":
+        return value
+    return value.astype(dtype, copy=False)
+
+
+def _partition_shuffles(function_id, kwargs):
+    # replaces permutations with their partitions, so that calls don't compute
+    # them again
+    if "shuffle" in kwargs:
+        kwargs["shuffle"] = hybrid._partition(
+            kwargs["shuffle"], hybrid._HYBRIDS[function_id][1]
+        )
+    if "shuffles" in kwargs:
+        kwargs["shuffles"] = composition._partitions(
+            kwargs["shuffles"], composition._HYBRID_COMPOSITIONS[function_id][0]
+        )
+    return kwargs
+
+
+def _generate(function_id, dimension, dtype, seed, block_size):
+    """
+    Returns the transform arguments and the optimum of the function, with
+    transforms generated by transforms.generate.
+    """
+    if dimension < 2:
+        raise ValueError("Dimension has to be at least 2")
+    if (11 <= function_id <= 20 or function_id >= 29) and dimension < 10:
+        raise ValueError(f"f{function_id} is defined only for dimensions >= 10")
+    if function_id <= 20:
+        components = 1
+    elif function_id <= 28:
+        components = len(composition._COMPOSITIONS[function_id][0])
+    else:
+        components = len(composition._HYBRID_COMPOSITIONS[function_id][0])
+    kwargs = transforms.generate(function_id, dimension, seed, components, block_size)
+    kwargs = {name: _cast(value, dtype) for name, value in kwargs.items()}
+    kwargs = _partition_shuffles(function_id, kwargs)
+    partitions = [kwargs["shuffle"]] if "shuffle" in kwargs else []
+    partitions.extend(kwargs.get("shuffles", ()))
+    if any(len(part) == 0 for p in partitions for part in p.indices):
+        # parts have ceil(percentage * D) coordinates, so the last one may be
+        # empty in some dimensions (e.g. 11 or 12 for f18)
+        raise ValueError(
+            f"f{function_id} can't be split into its parts in dimension {dimension}"
+        )
+    optimum = kwargs["shift"] if function_id <= 20 else kwargs["shifts"][0]
+    return kwargs, optimum
+
+
+@lru_cache(maxsize=None)
+def _bind(function_id, dimension, dtype, seed=None, block_size=None):
+    """
+    Returns the transform arguments of the function for the given dimension
+    and floating point type (passed to the function as keyword arguments) and
+    the optimum. Results are cached, so all problems with the same function,
+    dimension and type share them.
+
+    The official data is used when it exists for the dimension, unless a seed
+    or a block size is given - then the transforms are generated.
+    """
+    needs_shuffle = 11 <= function_id <= 20 or function_id >= 29
+    official = dimension in transforms.rotations.names and (
+        not needs_shuffle or dimension in transforms.shuffles.names
+    )
+    if seed is not None or block_size is not None or not official:
+        seed = 0 if seed is None else seed
+        return _generate(function_id, dimension, dtype, seed, block_size)
+
+    if function_id <= 20:
+        index = function_id - 1
+        shifts = transforms.load("shift", dtype)
+        kwargs = {
+            "rotation": np.ascontiguousarray(
+                _load(transforms.rotations, dimension, dtype)[index]
+            ),
+            "shift": np.ascontiguousarray(shifts[index][:dimension]),
+        }
+        if function_id > 10:
+            kwargs["shuffle"] = hybrid._official_partition(function_id, dimension)
+        optimum = kwargs["shift"]
+    else:
+        index = function_id - 21
+        shifts = transforms.load("shift_cf", dtype)
+        kwargs = {
+            "rotations": np.ascontiguousarray(
+                _load(transforms.rotations_cf, dimension, dtype)[index]
+            ),
+            "shifts": np.ascontiguousarray(shifts[index][:, :dimension]),
+        }
+        if function_id >= 29:
+            kwargs["shuffles"] = composition._official_partitions(
+                function_id, dimension
+            )
+        # the first component has zero bias
+        optimum = kwargs["shifts"][0]
+    return kwargs, optimum
+
+
+class Problem:
+    """
+    One of the benchmark functions (f1 to f30) in a fixed dimension.
+
+    Rotation, shift and shuffle data is resolved once (and shared by all
+    problems with the same function and dimension), so a call only computes
+    the function. Problems can be passed directly to Evolution:
+
+        problem = Problem(5, 10)
+        Evolution(..., function=problem, boundaries=problem.bounds,
+                  batch_function=True)
+
+    Attributes:
+        function_id (int): Number of the function (1 to 30).
+        dimension (int): Dimension of the input vectors.
+        function (function): The benchmark function, e.g. cec2017.simple.f5.
+        bounds (tuple): Search range of each dimension ((-100, 100) each).
+        optimum (array): Location of the global optimum.
+        bias (float): Value of the global optimum (F*).
+        dtype (dtype): Floating point type of the transforms, inputs and values.
+    """
+
+    def __init__(
+        self, function_id, dimension, dtype=np.float64, seed=None, block_size=None
+    ):
+        """
+        Args:
+            function_id (int): Number of the function (1 to 30).
+            dimension (int): Dimension of the input vectors. The official data
+                exists for 2, 10, 20, 30, 50 and 100 (hybrid functions and f29,
+                f30 only 10, 30, 50, 100); transforms of other dimensions (at
+                least 10 for hybrid functions and f29, f30, except a few
+                dimensions where their parts can't be split) are generated with
+                seed 0 (see cec2017.transforms.generate).
+            dtype (dtype): Floating point type of the computations. With
+                np.float32, the transform data is converted once and inputs
+                are converted on each call (see cec2017.utils.dtype_errors for
+                the precision of each function).
+            seed (int): If given, transforms are generated from this seed even
+                if the official data exists.
+            block_size (int): If given, transforms are generated with block
+                rotations of this block size, applied in O(D * block_size)
+                instead of O(D^2) - for very large dimensions.
+        """
+        if not 1 <= function_id <= len(all_functions):
+            raise ValueError(f"Function id has to be in [1, {len(all_functions)}]")
+        self.function_id = function_id
+        self.dimension = dimension
+        self.dtype = np.dtype(dtype)
+        self.seed = seed
+        self.block_size = block_size
+        self.function = all_functions[function_id - 1]
+        self.__name__ = self.function.__name__
+
+        self._kwargs, self.optimum = _bind(
+            function_id, dimension, self.dtype, seed, block_size
+        )
+        self.bounds = ((-100.0, 100.0),) * dimension
+        self.bias = 100.0 * function_id
+
+    def __call__(self, x):
+        """
+        Evaluates a single vector (or a matrix with one vector per row).
+
+        Args:
+            x (array): Input vector of the problem's dimension.
+        """
+        return self.function(np.asarray(x, dtype=self.dtype), **self._kwargs)
+
+    def evaluate(self, X):
+        """
+        Evaluates each row of X.
+
+        Args:
+            X (array): Matrix with one input vector per row (n x D).
+
+        Returns:
+            (array): Values of the function (n).
+        """
+        X = np.asarray(X, dtype=self.dtype)
+        if X.ndim != 2 or X.shape[1] != self.dimension:
+            raise ValueError(f"X has to be a matrix with {self.dimension} columns")
+        return self.function(X, **self._kwargs)
+
+    def __reduce__(self):
+        # processes rebuild problems from (memory-mapped) transform data
+        # instead of receiving a copy of the arrays
+        return Problem, (
+            self.function_id,
+            self.dimension,
+            self.dtype,
+            self.seed,
+            self.block_size,
+        )
+
+    def __repr__(self):
+        args = [str(self.function_id), str(self.dimension)]
+        if self.dtype != np.float64:
+            args.append(f"dtype={self.dtype}")
+        if self.seed is not None:
+            args.append(f"seed={self.seed}")
+        if self.block_size is not None:
+            args.append(f"block_size={self.block_size}")
+        return f"Problem({', '.join(args)})"
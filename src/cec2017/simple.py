@@ -12,18 +12,19 @@ def f1(x, rotation=None, shift=None):
     Shifted and Rotated Bent Cigar Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][0]
     if shift is None:
         shift = transforms.shifts[0][:nx]
-    x_transformed = np.matmul(rotation, x - shift)
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.bent_cigar(x_transformed) + 100.0
 
 
@@ -32,7 +33,8 @@ def f2(x, rotation=None, shift=None):
     (Deprecated) Shifted and Rotated Sum of Different Power Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
@@ -42,12 +44,12 @@ def f2(x, rotation=None, shift=None):
         f2.warned = True
         print("WARNING: f2 has been deprecated from the CEC 2017 benchmark suite")
 
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][1]
     if shift is None:
         shift = transforms.shifts[1][:nx]
-    x_transformed = np.matmul(rotation, x - shift)
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.sum_diff_pow(x_transformed) + 200.0
 
 
@@ -56,18 +58,19 @@ def f3(x, rotation=None, shift=None):
     Shifted and Rotated Zakharov Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][2]
     if shift is None:
         shift = transforms.shifts[2][:nx]
-    x_transformed = np.matmul(rotation, x - shift)
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.zakharov(x_transformed) + 300.0
 
 
@@ -76,18 +79,19 @@ def f4(x, rotation=None, shift=None):
     Shifted and Rotated Rosenbrock’s Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][3]
     if shift is None:
         shift = transforms.shifts[3][:nx]
-    x_transformed = np.matmul(rotation, (x - shift))
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.rosenbrock(x_transformed) + 400.0
 
 
@@ -96,18 +100,19 @@ def f5(x, rotation=None, shift=None):
     Shifted and Rotated Rastrigin's Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][4]
     if shift is None:
         shift = transforms.shifts[4][:nx]
-    x_transformed = np.matmul(rotation, (x - shift))
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.rastrigin(x_transformed) + 500.0
 
 
@@ -116,18 +121,19 @@ def f6(x, rotation=None, shift=None):
     Shifted and Rotated Schaffer’s F7 Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][5]
     if shift is None:
         shift = transforms.shifts[5][:nx]
-    x_transformed = np.matmul(rotation, (x - shift))
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.schaffers_f7(x_transformed) + 600.0
 
 
@@ -136,13 +142,14 @@ def f7(x, rotation=None, shift=None):
     Shifted and Rotated Lunacek Bi-Rastrigin’s Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][6]
     if shift is None:
@@ -156,13 +163,14 @@ def f8(x, rotation=None, shift=None):
     Shifted and Rotated Non-Continuous Rastrigin’s Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][7]
     if shift is None:
@@ -176,18 +184,19 @@ def f9(x, rotation=None, shift=None):
     Shifted and Rotated Levy Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][8]
     if shift is None:
         shift = transforms.shifts[8][:nx]
-    x_transformed = np.matmul(rotation, (x - shift))
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.levy(x_transformed) + 900.0
 
 
@@ -196,18 +205,19 @@ def f10(x, rotation=None, shift=None):
     Shifted and Rotated Schwefel’s Function
 
     Args:
-        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100.
+        x (array): Input vector of dimension 2, 10, 20, 30, 50 or 100, or a
+            matrix with one such vector per row.
         rotation (matrix): Optional rotation matrix. If None (default), the
             official matrix from the benchmark suite will be used.
         shift (array): Optional shift vector. If None (default), the official
             vector from the benchmark suite will be used.
     """
-    nx = len(x)
+    nx = np.shape(x)[-1]
     if rotation is None:
         rotation = transforms.rotations[nx][9]
     if shift is None:
         shift = transforms.shifts[9][:nx]
-    x_transformed = np.matmul(rotation, (x - shift))
+    x_transformed = transforms.shift_rotate(x, shift, rotation)
     return basic.modified_schwefel(x_transformed) + 1000.0
 
 
@@ -3,59 +3,371 @@
 # Contains rotation, shift and shuffle data loaded from data.pkl.
 # Note that these correspond to the many .txt files provided along with the
 # original implementation and should be used for final benchmark results.
+#
+# The data is stored as one .npy file per array (and dimension) in the data/
+# directory, created from data.pkl on first use (or with
+# `python -m cec2017.transforms`). Arrays are memory-mapped read-only when they
+# are first accessed, so importing the module does not load anything and worker
+# processes share the same pages.
+#
+# Transforms for other dimensions (e.g. 200 or 1000) are generated from a seed by
+# generate() and cached in data/generated/ the same way.
 
 import os
 import pickle
+from functools import lru_cache
+from types import MappingProxyType
 
 import numpy as np
 
-with open(os.path.join(os.path.dirname(__file__), "data.pkl"), "rb") as _pkl_file:
-    _pkl = pickle.load(_pkl_file)
+PKL_PATH = os.path.join(os.path.dirname(__file__), "data.pkl")
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+GENERATED_DIR = os.path.join(DATA_DIR, "generated")
+
+
+def _save(path, array):
+    # write to a temporary file first, so other processes never see a partially
+    # written array
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as npy_file:
+        np.save(npy_file, np.ascontiguousarray(array))
+    os.replace(tmp_path, path)
+
+
+def convert_pickle(pkl_path=PKL_PATH, data_dir=DATA_DIR):
+    """
+    Converts data.pkl into .npy files (one per array) that can be
+    memory-mapped.
+
+    Args:
+        pkl_path (str): Path of the pickled data.
+        data_dir (str): Directory where the .npy files are written.
+    """
+    with open(pkl_path, "rb") as pkl_file:
+        pkl = pickle.load(pkl_file)
+
+    for name, array in pkl.items():
+        _save(os.path.join(data_dir, name + ".npy"), array)
+
+
+@lru_cache(maxsize=None)
+def load(name, dtype=None):
+    """
+    Returns the read-only, memory-mapped array with the given name (a key of
+    data.pkl, e.g. "M_D10"), converting data.pkl on first use.
+
+    Args:
+        name (str): Name of the array.
+        dtype (dtype): Optional floating point type, e.g. np.float32. Floating
+            point arrays stored with another type are converted once to a
+            read-only in-memory copy. Permutations are never converted.
+    """
+    if dtype is not None:
+        array = load(name)
+        if array.dtype.kind != "f" or array.dtype == dtype:
+            return array
+        array = array.astype(dtype)
+        array.flags.writeable = False
+        return array
+
+    path = os.path.join(DATA_DIR, name + ".npy")
+    if not os.path.exists(path):
+        convert_pickle()
+    # a plain ndarray view of the mapped file - np.memmap views are slower to
+    # slice and to compute with
+    return np.load(path, mmap_mode="r").view(np.ndarray)
+
+
+class _LazyArrays(dict):
+    """
+    Maps dimensions to arrays. An array is loaded on first access and then
+    stored in the dict, so later lookups cost the same as in a plain dict.
+    """
+
+    def __init__(self, names):
+        super().__init__()
+        self.names = names
+
+    def __missing__(self, dimension):
+        array = self[dimension] = load(self.names[dimension])
+        return array
+
 
 # Each has shape (20, N, N) containing an N-dimensional rotation matrix
 # for functions f1 to f20
-rotations = {
-    2: _pkl["M_D2"],
-    10: _pkl["M_D10"],
-    20: _pkl["M_D20"],
-    30: _pkl["M_D30"],
-    50: _pkl["M_D50"],
-    100: _pkl["M_D100"],
-}
+rotations = _LazyArrays(
+    {
+        2: "M_D2",
+        10: "M_D10",
+        20: "M_D20",
+        30: "M_D30",
+        50: "M_D50",
+        100: "M_D100",
+    }
+)
 
 # Each has shape (10, 10, N, N) containing 10 N-dimensional rotation matrices
 # for functions f21 to f30
-rotations_cf = {
-    2: _pkl["M_cf_d2"],
-    10: _pkl["M_cf_D10"],
-    20: _pkl["M_cf_D20"],
-    30: _pkl["M_cf_D30"],
-    50: _pkl["M_cf_D50"],
-    100: _pkl["M_cf_D100"],
-}
-
-# Shape (20, 100)
-# Contains 100-dimension shift vectors for functions f1 to f20
-shifts = _pkl["shift"]
-
-# Shape (10, 10, 100)
-# Contains 10 100-dimension shift vectors for functions f21 to f30
-shifts_cf = _pkl["shift_cf"]
+rotations_cf = _LazyArrays(
+    {
+        2: "M_cf_d2",
+        10: "M_cf_D10",
+        20: "M_cf_D20",
+        30: "M_cf_D30",
+        50: "M_cf_D50",
+        100: "M_cf_D100",
+    }
+)
 
 # Each has shape (10, N) containing N-dimensional permutations for functions f11
 # to f20 (note: the original were 1-indexed, these are 0-indexed)
-shuffles = {
-    10: _pkl["shuffle_D10"],
-    30: _pkl["shuffle_D30"],
-    50: _pkl["shuffle_D50"],
-    100: _pkl["shuffle_D100"],
-}
+shuffles = _LazyArrays(
+    {
+        10: "shuffle_D10",
+        30: "shuffle_D30",
+        50: "shuffle_D50",
+        100: "shuffle_D100",
+    }
+)
 
 # Each has shape (2, 10, N) containing 10 N-dimensional permutations for
 # functions f29 and f30 (note: the original were 1-indexed, these are 0-indexed)
-shuffles_cf = {
-    10: _pkl["shuffle_cf_D10"],
-    30: _pkl["shuffle_cf_D30"],
-    50: _pkl["shuffle_cf_D50"],
-    100: _pkl["shuffle_cf_D100"],
-}
+shuffles_cf = _LazyArrays(
+    {
+        10: "shuffle_cf_D10",
+        30: "shuffle_cf_D30",
+        50: "shuffle_cf_D50",
+        100: "shuffle_cf_D100",
+    }
+)
+
+# shifts - shape (20, 100)
+# Contains 100-dimension shift vectors for functions f1 to f20
+# shifts_cf - shape (10, 10, 100)
+# Contains 10 100-dimension shift vectors for functions f21 to f30
+_LAZY_ATTRIBUTES = {"shifts": "shift", "shifts_cf": "shift_cf"}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        # store as a module attribute, so __getattr__ is called only once
+        array = globals()[name] = load(_LAZY_ATTRIBUTES[name])
+        return array
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def shift_rotate(x, shift, rotation):
+    """
+    Computes rotation @ (x - shift) for a single vector or for each row of a
+    matrix. A matrix is transformed with a single matrix product.
+
+    Args:
+        x (array): Input vector (D) or matrix (n x D).
+        shift (array): Shift vector (D).
+        rotation (matrix): Rotation matrix (D x D) or BlockRotation.
+    """
+    return (rotation @ (x - shift).T).T
+
+
+def random_rotation(dimension, rng):
+    """
+    Returns a random rotation (orthogonal) matrix, uniformly distributed: the Q
+    of the QR decomposition of a Gaussian matrix, with the signs of its columns
+    fixed so that R has a positive diagonal.
+
+    Args:
+        dimension (int): Size of the matrix.
+        rng (Generator): numpy random generator.
+    """
+    q, r = np.linalg.qr(rng.standard_normal((dimension, dimension)))
+    return q * np.where(np.diag(r) < 0.0, -1.0, 1.0)
+
+
+class BlockRotation:
+    """
+    Structured rotation for large dimensions - a product of layers, each of
+    which permutes the coordinates and then rotates consecutive blocks of b
+    coordinates. Applying it costs O(D * b) instead of O(D^2) for a dense
+    matrix. It is used like a matrix: rotation @ x (x is a vector or has one
+    vector per column), x @ rotation.T (one vector per row).
+    """
+
+    # numpy defers to __matmul__ / __rmatmul__ instead of converting the
+    # rotation to an array
+    __array_ufunc__ = None
+
+    def __init__(self, layers, transposed=False):
+        """
+        Args:
+            layers (list): (permutation, blocks, tail) of each layer, applied in
+                order - a permutation (D), rotations of the full blocks (k x b x
+                b) and a rotation of the remaining D - k * b coordinates.
+            transposed (bool): If the object is the transposed (inverse)
+                rotation.
+        """
+        self.layers = layers
+        self.transposed = transposed
+        self.shape = (len(layers[0][0]), len(layers[0][0]))
+        self._inverses = [np.argsort(permutation) for permutation, _, _ in layers]
+
+    @classmethod
+    def random(cls, dimension, block_size, rng, layers=2):
+        """
+        Returns a random block rotation.
+
+        Args:
+            dimension (int): Dimension of the rotated vectors.
+            block_size (int): Size of the blocks (b).
+            rng (Generator): numpy random generator.
+            layers (int): Number of layers - with a single layer, coordinates
+                are mixed only within their block.
+        """
+        block_size = min(block_size, dimension)
+        k = dimension // block_size
+        result = []
+        for _ in range(layers):
+            permutation = rng.permutation(dimension)
+            blocks = np.empty((k, block_size, block_size))
+            for i in range(0, k):
+                blocks[i] = random_rotation(block_size, rng)
+            tail = random_rotation(dimension - k * block_size, rng)
+            result.append((permutation, blocks, tail))
+        return cls(result)
+
+    @property
+    def T(self):
+        return BlockRotation(self.layers, not self.transposed)
+
+    @property
+    def dtype(self):
+        return self.layers[0][1].dtype
+
+    def astype(self, dtype):
+        layers = [
+            (permutation, blocks.astype(dtype), tail.astype(dtype))
+            for permutation, blocks, tail in self.layers
+        ]
+        return BlockRotation(layers, self.transposed)
+
+    def toarray(self):
+        """
+        Returns the rotation as a dense matrix.
+        """
+        return self @ np.eye(self.shape[0], dtype=self.dtype)
+
+    @staticmethod
+    def _rotate_blocks(x, blocks, tail):
+        # rotates the blocks of each row of x (n x D)
+        k, b, _ = blocks.shape
+        m = k * b
+        head = x[:, :m].reshape(len(x), k, b).transpose(1, 0, 2)
+        head = np.matmul(head, blocks.transpose(0, 2, 1))
+        head = head.transpose(1, 0, 2).reshape(len(x), m)
+        return np.concatenate([head, x[:, m:] @ tail.T], axis=1)
+
+    def _rotate(self, x, transposed):
+        # computes R @ v (or R.T @ v) for each row v of x
+        shape = np.shape(x)
+        x = np.reshape(x, (-1, shape[-1]))
+        if not transposed:
+            for permutation, blocks, tail in self.layers:
+                x = self._rotate_blocks(x[:, permutation], blocks, tail)
+        else:
+            for (_, blocks, tail), inverse in zip(
+                reversed(self.layers), reversed(self._inverses)
+            ):
+                x = self._rotate_blocks(x, blocks.transpose(0, 2, 1), tail.T)
+                x = x[:, inverse]
+        return x.reshape(shape)
+
+    def __matmul__(self, x):
+        # rotation @ x - x is a vector or has one vector per column
+        if np.ndim(x) == 1:
+            return self._rotate(x, self.transposed)
+        return self._rotate(np.swapaxes(x, -1, -2), self.transposed).swapaxes(-1, -2)
+
+    def __rmatmul__(self, x):
+        # x @ rotation - rotates each row of x by the transposed rotation
+        return self._rotate(x, not self.transposed)
+
+
+@lru_cache(maxsize=None)
+def generate(function_id, dimension, seed=0, components=1, block_size=None):
+    """
+    Returns random transforms of function f<function_id> in any dimension, as
+    the function's keyword arguments: rotation and shift (and shuffle for f11
+    to f20), or rotations and shifts of the components of f21 to f30 (and
+    shuffles for f29, f30).
+
+    The transforms only depend on (seed, function_id, dimension, components).
+    Dense rotations, shifts and permutations are saved to data/generated/ when
+    first created and memory-mapped afterwards, as QR decompositions of large
+    matrices are expensive. Block rotations are cheap and are not saved.
+
+    Results are cached and shared by all callers, so they are read-only: a
+    mapping proxy, tuples of block rotations and arrays that are not writeable.
+
+    Args:
+        function_id (int): Number of the function (1 to 30).
+        dimension (int): Dimension of the input vectors.
+        seed (int): Seed of the random generators.
+        components (int): Number of components (composition functions).
+        block_size (int): If given, rotations are BlockRotation objects with
+            blocks of this size instead of dense matrices.
+    """
+
+    def rng(stream):
+        # independent streams, so e.g. shifts do not depend on block_size
+        return np.random.default_rng([seed, function_id, dimension, stream])
+
+    def cached(name, create):
+        path = os.path.join(
+            GENERATED_DIR,
+            f"f{function_id}_D{dimension}_N{components}_seed{seed}_{name}.npy",
+        )
+        if not os.path.exists(path):
+            _save(path, create())
+        return np.load(path, mmap_mode="r").view(np.ndarray)
+
+    def create_rotations():
+        generator = rng(0)
+        return np.array(
+            [random_rotation(dimension, generator) for _ in range(components)]
+        )
+
+    def create_shuffles():
+        generator = rng(2)
+        return np.array([generator.permutation(dimension) for _ in range(components)])
+
+    if block_size is None:
+        rotations = cached("rotation", create_rotations)
+    else:
+        generator = rng(0)
+        rotations = tuple(
+            BlockRotation.random(dimension, block_size, generator)
+            for _ in range(components)
+        )
+        for rotation in rotations:
+            for layer in rotation.layers:
+                for array in layer:
+                    array.flags.writeable = False
+    shifts = cached(
+        "shift", lambda: rng(1).uniform(-80.0, 80.0, (components, dimension))
+    )
+    needs_shuffle = 11 <= function_id <= 20 or function_id >= 29
+    shuffles = cached("shuffle", create_shuffles) if needs_shuffle else None
+
+    if function_id <= 20:
+        kwargs = {"rotation": rotations[0], "shift": shifts[0]}
+        if needs_shuffle:
+            kwargs["shuffle"] = shuffles[0]
+    else:
+        kwargs = {"rotations": rotations, "shifts": shifts}
+        if needs_shuffle:
+            kwargs["shuffles"] = shuffles
+    return MappingProxyType(kwargs)
+
+
+if __name__ == "__main__":
+    convert_pickle()
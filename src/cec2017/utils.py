@@ -80,3 +80,76 @@ def time(function, domain=(-100, 100), points=30):
     for i in range(0, xys.shape[0]):
         zs[i] = function(xys[i])
     return time() - before
+
+
+def dtype_errors(
+    functions=None,
+    dimensions=(10, 30, 50, 100),
+    dtype="float32",
+    samples=1000,
+    domain=(-100, 100),
+    seed=0,
+):
+    """
+    Returns the maximum relative error of each function evaluated with a lower
+    precision floating point type, compared with float64 on the same random
+    samples (the samples are rounded to the type first, so only the error of
+    the computation is measured).
+
+    The error is relative to the float64 error value f(x) - F*, so the bias of
+    the function does not hide the lost precision.
+
+    Args:
+        functions (list): Ids of the functions (1 to 30). All by default.
+        dimensions (list): Dimensions to test. Dimensions not supported by a
+            function are skipped.
+        dtype (dtype): Floating point type to validate, e.g. np.float32.
+        samples (int): Number of random vectors per function and dimension.
+        domain (num, num): The inclusive (min, max) domain for each dimension.
+        seed (int): Seed of the random samples.
+
+    Returns:
+        (dict): {(function id, dimension): maximum relative error}
+    """
+    import numpy as np
+
+    from .problem import Problem
+
+    rng = np.random.default_rng(seed)
+    if functions is None:
+        functions = range(1, 31)
+
+    errors = {}
+    for function_id in functions:
+        for dimension in dimensions:
+            try:
+                reference = Problem(function_id, dimension)
+            except ValueError:
+                continue
+            problem = Problem(function_id, dimension, dtype=dtype)
+
+            x = rng.uniform(domain[0], domain[1], (samples, dimension))
+            x = x.astype(problem.dtype)
+            # overflow of the lower precision type shows as an infinite error
+            with np.errstate(over="ignore", invalid="ignore"):
+                expected = reference.evaluate(x) - reference.bias
+                values = problem.evaluate(x).astype(np.float64) - problem.bias
+                scale = np.maximum(np.abs(expected), np.finfo(np.float64).tiny)
+                errors[(function_id, dimension)] = float(
+                    np.max(np.abs(values - expected) / scale)
+                )
+    return errors
+
+
+if __name__ == "__main__":
+    # prints the precision of float32 evaluation of each function, e.g.
+    # python -m cec2017.utils 1e-4
+    import sys
+
+    threshold = float(sys.argv[1]) if len(sys.argv) > 1 else 1e-4
+    errors = dtype_errors()
+    for function_id in range(1, 31):
+        row = {d: e for (f, d), e in errors.items() if f == function_id}
+        verdict = "ok" if max(row.values()) <= threshold else "use float64"
+        columns = "  ".join(f"D={d}: {e:.2e}" for d, e in row.items())
+        print(f"f{function_id:<3} {columns}  {verdict}")
@@ -1,15 +1,46 @@
 from .individual import Individual
+from .population import Population
 from .grid import Grid
-from .crossover import UniformCrossover, SinglePointCrossover
+from .crossover import (
+    UniformCrossover,
+    SinglePointCrossover,
+    ArithmeticCrossover,
+    BlendCrossover,
+    SimulatedBinaryCrossover,
+)
+from .trace import FileTraceRecorder, TraceFile, TraceRecorder
+from .metrics import (
+    BestFitness,
+    Diversity,
+    MaxFitness,
+    MeanFitness,
+    MedianFitness,
+    Metric,
+    MinFitness,
+    StatisticsCollector,
+    StdFitness,
+    WorstFitness,
+)
+from .profiling import GenerationProfiler, StageTimer, save_report
+from .repair import ClampRepair, ReflectRepair, ResampleRepair, WrapRepair
 from .evolution import CellularEvolutionaryAlgorithm, Evolution, EvolutionaryAlgorithm
+from .islands import IslandModel
 from .mutation import GaussianMutation
-from .neighborhood import CompactNeighborhood, LinearNeighborhood
+from .neighborhood import (
+    CompactNeighborhood,
+    LinearNeighborhood,
+    Neighborhood,
+    OffsetNeighborhood,
+)
 from .selection import RankSelection, TournamentSelection, RouletteWheelSelection
 from .succession import (
     BasicSuccession,
     TournamentSuccession,
     RouletteWheelSuccession,
     RankSuccession,
+    ReplaceIfBetterSuccession,
+    ReplaceIfNotWorseSuccession,
+    StochasticReplacementSuccession,
 )
 from .utils import (
     plot_population_on_the_surface,
@@ -23,9 +23,51 @@ class Crossover(ABC):
         """
         ...
 
+    def recombine_batch(self, parents_1, parents_2, out=None, rng=None):
+        """Recombine each pair of rows to create new coordinates.
+
+        Default implementation calls `recombine` for each pair.
+
+        Arguments:
+            parents_1: (n, D) matrix with coordinates of the first parents
+            parents_2: (n, D) matrix with coordinates of the second parents
+            out: (n, D) matrix where children will be written. If None, new
+                matrix will be created. It cannot share memory with the parents.
+            rng: numpy's random Generator
+
+        Returns:
+            (n, D) matrix with coordinates of the children
+
+        """
+        out = np.empty_like(parents_1) if out is None else out
+        for idx, (parent_1, parent_2) in enumerate(zip(parents_1, parents_2)):
+            out[idx] = self.recombine(
+                Individual(coordinates=parent_1, fitness=None),
+                Individual(coordinates=parent_2, fitness=None),
+            ).coordinates
+        return out
+
+
+class BatchCrossover(Crossover):
+    """Crossover defined by `recombine_batch` only.
+
+    Single pair of parents is recombined as a batch with one row.
+
+    """
+
+    def recombine(self, parent_1, parent_2):
+        coordinates = self.recombine_batch(
+            parent_1.coordinates[np.newaxis], parent_2.coordinates[np.newaxis]
+        )
+        return Individual(coordinates=coordinates[0], fitness=None)
 
-class SinglePointCrossover(Crossover):
     @abstractmethod
+    def recombine_batch(self, parents_1, parents_2, out=None, rng=None):
+        ...
+
+
+class SinglePointCrossover(Crossover):
+    @staticmethod
     def recombine(parent_1, parent_2):
         """Use single point to recombine parent's coordinates and create new Individual.
 
@@ -47,9 +89,35 @@ class SinglePointCrossover(Crossover):
             fitness=None,
         )
 
+    @staticmethod
+    def recombine_batch(parents_1, parents_2, out=None, rng=None):
+        """Use random cut point to recombine each pair of rows.
+
+        Coordinates before the cut point come from the first parent.
+
+        Arguments:
+            parents_1: (n, D) matrix with coordinates of the first parents
+            parents_2: (n, D) matrix with coordinates of the second parents
+            out: (n, D) matrix where children will be written
+            rng: numpy's random Generator
+
+        Returns:
+            (n, D) matrix with coordinates of the children
+
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        out = np.empty_like(parents_1) if out is None else out
+        n, dimensions = parents_1.shape
+        points = rng.integers(0, dimensions, size=n, endpoint=True)
+        mask = np.arange(dimensions) < points[:, np.newaxis]
+
+        np.copyto(out, parents_2)
+        np.copyto(out, parents_1, where=mask)
+        return out
+
 
 class UniformCrossover(Crossover):
-    @abstractmethod
+    @staticmethod
     def recombine(parent_1, parent_2):
         """Use single point to recombine parent's coordinates and create new Individual.
 
@@ -71,3 +139,164 @@ class UniformCrossover(Crossover):
                 coordinates.append(parent_2.coordinates[idx])
 
         return Individual(coordinates=np.array(coordinates), fitness=None)
+
+    @staticmethod
+    def recombine_batch(parents_1, parents_2, out=None, rng=None):
+        """Choose each coordinate from a random parent (random mask).
+
+        Arguments:
+            parents_1: (n, D) matrix with coordinates of the first parents
+            parents_2: (n, D) matrix with coordinates of the second parents
+            out: (n, D) matrix where children will be written
+            rng: numpy's random Generator
+
+        Returns:
+            (n, D) matrix with coordinates of the children
+
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        out = np.empty_like(parents_1) if out is None else out
+        mask = rng.random(parents_1.shape) < 0.5
+
+        np.copyto(out, parents_2)
+        np.copyto(out, parents_1, where=mask)
+        return out
+
+
+class ArithmeticCrossover(BatchCrossover):
+    def __init__(self, weight=None):
+        """
+        Arguments:
+            weight: weight of the first parent (0 <= weight <= 1). If None, weight
+                is drawn uniformly for each child.
+
+        """
+        if weight is not None:
+            assert 0 <= weight <= 1, "Weight needs to be >= 0 and <= 1"
+        self.weight = weight
+
+    def recombine_batch(self, parents_1, parents_2, out=None, rng=None):
+        """Create children as weighted means of their parents.
+
+        child = weight * parent_1 + (1 - weight) * parent_2
+
+        Arguments:
+            parents_1: (n, D) matrix with coordinates of the first parents
+            parents_2: (n, D) matrix with coordinates of the second parents
+            out: (n, D) matrix where children will be written
+            rng: numpy's random Generator
+
+        Returns:
+            (n, D) matrix with coordinates of the children
+
+        """
+        out = np.empty_like(parents_1) if out is None else out
+        if self.weight is None:
+            rng = rng if rng is not None else np.random.default_rng()
+            weight = rng.random((len(parents_1), 1))
+        else:
+            weight = self.weight
+
+        np.subtract(parents_1, parents_2, out=out)
+        out *= weight
+        out += parents_2
+        return out
+
+
+class BlendCrossover(BatchCrossover):
+    def __init__(self, alpha=0.5):
+        """BLX-alpha crossover.
+
+        Arguments:
+            alpha: how far children can be placed outside of the parents' range
+                (relative to the distance between parents)
+
+        """
+        assert alpha >= 0, "Alpha needs to be >= 0"
+        self.alpha = alpha
+        self._difference = None
+
+    def _get_difference_buffer(self, parents):
+        if (
+            self._difference is None
+            or self._difference.shape != parents.shape
+            or self._difference.dtype != parents.dtype
+        ):
+            self._difference = np.empty_like(parents)
+        return self._difference
+
+    def recombine_batch(self, parents_1, parents_2, out=None, rng=None):
+        """Draw each coordinate uniformly from the extended parents' range.
+
+        For parents' coordinates a <= b and d = b - a, child's coordinate is drawn
+        from [a - alpha * d, b + alpha * d].
+
+        Arguments:
+            parents_1: (n, D) matrix with coordinates of the first parents
+            parents_2: (n, D) matrix with coordinates of the second parents
+            out: (n, D) matrix where children will be written
+            rng: numpy's random Generator
+
+        Returns:
+            (n, D) matrix with coordinates of the children
+
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        out = np.empty_like(parents_1) if out is None else out
+
+        # child = parent_2 + u * (parent_1 - parent_2), u ~ U(-alpha, 1 + alpha)
+        difference = self._get_difference_buffer(parents_1)
+        np.subtract(parents_1, parents_2, out=difference)
+        rng.random(out=out, dtype=out.dtype)
+        out *= 1 + 2 * self.alpha
+        out -= self.alpha
+        out *= difference
+        out += parents_2
+        return out
+
+
+class SimulatedBinaryCrossover(BatchCrossover):
+    def __init__(self, eta=15):
+        """SBX crossover.
+
+        Arguments:
+            eta: distribution index - the larger it is, the closer children are
+                to their parents
+
+        """
+        assert eta >= 0, "Eta needs to be >= 0"
+        self.eta = eta
+
+    def recombine_batch(self, parents_1, parents_2, out=None, rng=None):
+        """Simulated binary crossover.
+
+        SBX creates two children symmetric around the parents' mean. Each
+        coordinate is taken from one of them at random.
+
+        Arguments:
+            parents_1: (n, D) matrix with coordinates of the first parents
+            parents_2: (n, D) matrix with coordinates of the second parents
+            out: (n, D) matrix where children will be written
+            rng: numpy's random Generator
+
+        Returns:
+            (n, D) matrix with coordinates of the children
+
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        out = np.empty_like(parents_1) if out is None else out
+
+        u = rng.random(parents_1.shape)
+        exponent = 1 / (self.eta + 1)
+        beta = np.where(
+            u <= 0.5, (2 * u) ** exponent, (1 / (2 * (1 - u))) ** exponent
+        )
+        beta[rng.random(parents_1.shape) < 0.5] *= -1
+
+        # child = (parent_1 + parent_2) / 2 +- beta * (parent_1 - parent_2) / 2
+        np.subtract(parents_1, parents_2, out=out)
+        out *= beta
+        out += parents_1
+        out += parents_2
+        out *= 0.5
+        return out
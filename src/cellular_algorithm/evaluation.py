@@ -0,0 +1,201 @@
+import math
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+
+def evaluate_chunk(function, batch_function, coordinates):
+    """Compute fitness of each row of `coordinates` in the current process.
+
+    Arguments:
+        function: function that will be optimized
+        batch_function: if `function` accepts a matrix and returns fitness of each row
+        coordinates: (n, D) matrix with individuals' coordinates
+
+    Return:
+        (n,) array with fitness values
+
+    """
+    if batch_function:
+        return np.asarray(function(coordinates))
+    return np.array([function(row) for row in coordinates])
+
+
+class Evaluator(ABC):
+    def __init__(self, function, batch_function=False, chunk_size=None):
+        """
+        Arguments:
+            function: function that will be optimized
+            batch_function: if `function` accepts a matrix with one individual's
+                coordinates per row and returns fitness of each row
+            chunk_size: number of individuals evaluated in a single task. If None,
+                individuals are split evenly between workers.
+
+        """
+        self.function = function
+        self.batch_function = batch_function
+        self.chunk_size = chunk_size
+
+    @abstractmethod
+    def evaluate(self, coordinates):
+        """Compute fitness of each row of `coordinates`.
+
+        Arguments:
+            coordinates: (n, D) matrix with individuals' coordinates
+
+        Return:
+            (n,) array with fitness values (in the same order as rows)
+
+        """
+        ...
+
+    def close(self):
+        """Release resources (eg. stop workers)."""
+        pass
+
+
+class SerialEvaluator(Evaluator):
+    """Evaluate all individuals in the current process."""
+
+    def evaluate(self, coordinates):
+        return evaluate_chunk(self.function, self.batch_function, coordinates)
+
+
+class PoolEvaluator(Evaluator):
+    def __init__(self, function, batch_function=False, chunk_size=None, workers=None):
+        """Evaluate chunks of individuals in a pool of workers.
+
+        Pool is created on the first evaluation and reused until `close()`.
+
+        Arguments:
+            function: function that will be optimized
+            batch_function: if `function` accepts a matrix with one individual's
+                coordinates per row and returns fitness of each row
+            chunk_size: number of individuals evaluated in a single task. If None,
+                individuals are split evenly between workers.
+            workers: number of workers. If None, number of CPUs is used.
+
+        """
+        super(PoolEvaluator, self).__init__(function, batch_function, chunk_size)
+        self.workers = workers
+        self._pool = None
+
+    @abstractmethod
+    def create_pool(self):
+        ...
+
+    @abstractmethod
+    def submit_chunks(self, chunks):
+        """Evaluate chunks in the pool, return iterator over results (in order)."""
+        ...
+
+    def split(self, coordinates):
+        """Split rows of `coordinates` into chunks."""
+        workers = self.workers or os.cpu_count() or 1
+        chunk_size = self.chunk_size or max(math.ceil(len(coordinates) / workers), 1)
+        return [
+            coordinates[start : start + chunk_size]
+            for start in range(0, len(coordinates), chunk_size)
+        ]
+
+    def evaluate(self, coordinates):
+        if self._pool is None:
+            self._pool = self.create_pool()
+        results = list(self.submit_chunks(self.split(coordinates)))
+        if not results:
+            return np.empty(0)
+        return np.concatenate(results)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+class ThreadPoolEvaluator(PoolEvaluator):
+    """Evaluate chunks of individuals in a pool of threads.
+
+    Useful for functions that release the GIL (eg. large numpy operations).
+
+    """
+
+    def create_pool(self):
+        return ThreadPoolExecutor(max_workers=self.workers)
+
+    def submit_chunks(self, chunks):
+        return self._pool.map(
+            lambda chunk: evaluate_chunk(self.function, self.batch_function, chunk),
+            chunks,
+        )
+
+
+# Function evaluated by the current worker process - set by `_init_worker`.
+_worker_function = None
+_worker_batch_function = False
+
+
+def _init_worker(function, batch_function):
+    # Function is unpickled once per worker (which imports its module) before the
+    # first task arrives. cec2017 Problems bind their transform data at this point,
+    # plain f1 - f30 load it lazily in the first task.
+    global _worker_function, _worker_batch_function
+    _worker_function = function
+    _worker_batch_function = batch_function
+
+
+def _evaluate_in_worker(coordinates):
+    return evaluate_chunk(_worker_function, _worker_batch_function, coordinates)
+
+
+class ProcessPoolEvaluator(PoolEvaluator):
+    """Evaluate chunks of individuals in a pool of persistent processes.
+
+    Function is sent to each worker once, when the worker starts - it needs to be
+    picklable (eg. defined on the module level). Each task carries only a chunk of
+    coordinates and returns an array of fitness values.
+
+    """
+
+    def create_pool(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.function, self.batch_function),
+        )
+
+    def submit_chunks(self, chunks):
+        return self._pool.map(_evaluate_in_worker, chunks)
+
+
+EVALUATORS = {
+    "serial": SerialEvaluator,
+    "thread": ThreadPoolEvaluator,
+    "process": ProcessPoolEvaluator,
+}
+
+
+def create_evaluator(
+    executor, function, batch_function=False, chunk_size=None, workers=None
+):
+    """Create evaluator.
+
+    Arguments:
+        executor: "serial", "thread", "process" or Evaluator object (returned as is)
+        function: function that will be optimized
+        batch_function: if `function` accepts a matrix and returns fitness of each row
+        chunk_size: number of individuals evaluated in a single task
+        workers: number of workers (ignored by "serial")
+
+    Return:
+        Evaluator
+
+    """
+    if isinstance(executor, Evaluator):
+        return executor
+    if executor not in EVALUATORS:
+        raise ValueError(f"Executor has to be one of: {', '.join(EVALUATORS)}")
+    if executor == "serial":
+        return SerialEvaluator(function, batch_function, chunk_size)
+    return EVALUATORS[executor](function, batch_function, chunk_size, workers)
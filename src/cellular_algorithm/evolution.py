@@ -4,7 +4,14 @@ from abc import ABC, abstractmethod
 import numpy as np
 from tqdm import tqdm
 
-from cellular_algorithm import Grid
+from cellular_algorithm import (
+    ClampRepair,
+    Individual,
+    Population,
+    StageTimer,
+    TraceRecorder,
+)
+from cellular_algorithm.evaluation import SerialEvaluator, create_evaluator
 
 
 class Evolution(ABC):
@@ -22,6 +29,14 @@ class Evolution(ABC):
         parents_num=2,
         population_shape=(1, 100),
         population=None,
+        batch_function=False,
+        seed=None,
+        repair=None,
+        executor="serial",
+        workers=None,
+        chunk_size=None,
+        timer=None,
+        dtype=np.float64,
     ):
         """
         Arguments:
@@ -41,6 +56,24 @@ class Evolution(ABC):
                 - (1, population_num) - for classic evolution
                 - (n_1, ..., n_x) - for cellular evolution
             population - population
+            batch_function: if `function` accepts a matrix with one individual's
+                coordinates per row and returns fitness of each row
+                (eg. cec2017 functions)
+            seed: seed of the random Generator used by the vectorized operators
+            repair: strategy used to move coordinates back inside the boundaries.
+                If None, coordinates are clamped (ClampRepair).
+            executor: how offsprings of each generation are evaluated - "serial",
+                "thread" (pool of threads), "process" (pool of processes) or
+                Evaluator object. Function used with "process" has to be picklable.
+            workers: number of threads or processes. If None, number of CPUs is used.
+            chunk_size: number of individuals evaluated in a single task. If None,
+                offsprings are split evenly between workers.
+            timer: StageTimer that measures stages of each generation. If None,
+                new StageTimer is created (see `timer.report()`).
+            dtype: type of the coordinates and fitness values of the created
+                population, eg. np.float32 to halve memory traffic (use with
+                `cec2017.problem.Problem(..., dtype=np.float32)`). Ignored if
+                `population` is given.
 
         """
 
@@ -50,28 +83,51 @@ class Evolution(ABC):
         self.mutation = mutation
 
         self.boundaries = boundaries
+        self.repair = repair if repair is not None else ClampRepair()
         self.function = function
+        self.batch_function = batch_function
         self.maximize = maximize
+        self.rng = np.random.default_rng(seed)
+        self.timer = timer if timer is not None else StageTimer()
+        self.evaluator = create_evaluator(
+            executor, function, batch_function, chunk_size=chunk_size, workers=workers
+        )
 
         self.mutation_probability = mutation_probability
         self.iterations = iterations
         self.parents_num = parents_num
 
-        if not population and not population_shape:
+        if population is None and not population_shape:
             raise ValueError("You need to specify `grid` or `shape` to create it.")
 
-        if not population:
-            population = Grid(population_shape)
-            population.generate_individuals(self.boundaries, self.function)
+        if population is None:
+            population = Population(
+                population_shape, dimensions=len(boundaries), dtype=dtype
+            )
+            population.generate_individuals(
+                self.boundaries, self.evaluate, batch_function=True
+            )
 
         self.population = population
-        self.population_shape = self.population.grid.shape
-        # Create tmp grid that will be used in each iteration
-        self.offsprings = Grid(self.population_shape)
+        self.population_shape = self.population.shape
+        self.low = np.min(np.asarray(boundaries, dtype=population.dtype), axis=1)
+        self.high = np.max(np.asarray(boundaries, dtype=population.dtype), axis=1)
+        self._offsprings = None
 
         self.best_solution = None
         self.best_solution_position = None
 
+    @property
+    def offsprings(self):
+        """Tmp population used in each iteration (created when first needed)."""
+        if self._offsprings is None:
+            self._offsprings = Population(
+                self.population_shape,
+                dimensions=self.population.dimensions,
+                dtype=self.population.dtype,
+            )
+        return self._offsprings
+
     def get_best(self, individuals):
         if self.maximize:
             return max(*individuals, key=lambda x: x.fitness)
@@ -86,6 +142,85 @@ class Evolution(ABC):
             self.best_solution = individual
             self.best_solution_position = position
 
+    def update_best_solution_from(self, population):
+        """Update best solution using the best individual of the given population."""
+        if self.maximize:
+            index = np.argmax(population.fitness)
+        else:
+            index = np.argmin(population.fitness)
+        self.update_best_solution(
+            population.get_individual(index), population.grid_position(index)
+        )
+
+    def get_best_individuals(self, num):
+        """Get `num` best individuals of the population.
+
+        Return:
+            (coordinates, fitness) - (num, D) and (num,) arrays (best first)
+
+        """
+        order = np.argsort(self.population.fitness, kind="stable")
+        if self.maximize:
+            order = order[::-1]
+        best = order[:num]
+        return (
+            self.population.coordinates[best].copy(),
+            self.population.fitness[best].copy(),
+        )
+
+    def insert_individuals(self, coordinates, fitness):
+        """Replace the worst individuals of the population with given ones.
+
+        If there are more individuals than cells, only the best of them are inserted.
+
+        Arguments:
+            coordinates: (n, D) matrix with individuals' coordinates
+            fitness: (n,) array with individuals' fitness
+
+        """
+        if len(fitness) > self.population.size:
+            order = np.argsort(fitness, kind="stable")
+            if self.maximize:
+                order = order[::-1]
+            best = order[: self.population.size]
+            coordinates, fitness = coordinates[best], fitness[best]
+        order = np.argsort(self.population.fitness, kind="stable")
+        if not self.maximize:
+            order = order[::-1]
+        worst = order[: len(fitness)]
+        self.population.coordinates[worst] = coordinates
+        self.population.set_fitness(fitness, worst)
+        self.update_best_solution_from(self.population)
+
+    def evaluate(self, coordinates):
+        """Compute fitness of each row of `coordinates`.
+
+        Arguments:
+            coordinates: (n, D) matrix with individuals' coordinates
+
+        Return:
+            (n,) array with fitness values
+
+        """
+        with self.timer.stage("evaluation"):
+            return self.evaluator.evaluate(coordinates)
+
+    def close(self):
+        """Stop evaluation workers (they are started again when needed).
+
+        Workers are kept between runs, so that next `run` doesn't start them again.
+        Call `close` (or use the evolution as a context manager) when the evolution
+        is no longer needed.
+
+        """
+        self.evaluator.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def select_parents(self, individuals):
         """Selection.
 
@@ -112,14 +247,12 @@ class Evolution(ABC):
 
     def normalize_coordinates(self, individual):
         """Make sure that individual's coordinates meet boundaries."""
-        result = []
-        for boundary, coordinate in zip(self.boundaries, individual.coordinates):
-            low, high = boundary
-            coordinate = coordinate if coordinate >= low else float(low)
-            coordinate = coordinate if coordinate <= high else float(high)
-            result.append(coordinate)
-
-        individual.coordinates = np.array(result)
+        individual.coordinates = np.asarray(
+            individual.coordinates, dtype=self.population.dtype
+        )
+        self.repair.repair(
+            individual.coordinates[np.newaxis], self.low, self.high, rng=self.rng
+        )
         return individual
 
     def mutate(self, new_individual):
@@ -141,19 +274,52 @@ class Evolution(ABC):
     def run_single_iteration(self):
         ...
 
-    def run(self, save_trace=False):
-        """Run evolution."""
-        population_trace = None
+    def run(self, save_trace=False, trace=None, statistics=None, profiler=None):
+        """Run evolution.
 
-        if save_trace:
-            population_trace = [self.get_population_coordinates()]
+        Arguments:
+            save_trace: if population should be recorded in each generation
+                (with default TraceRecorder)
+            trace: TraceRecorder (eg. FileTraceRecorder) used to record the
+                population. If given, `save_trace` is ignored.
+            statistics: StatisticsCollector that computes metrics of the
+                population in each generation (without recording it)
+            profiler: GenerationProfiler that profiles chosen generations
 
-        for iteration in tqdm(range(self.iterations)):
-            self.run_single_iteration()
-            if save_trace:
-                population_trace.append(self.get_population_coordinates())
+        Return:
+            TraceRecorder or None
 
-        return population_trace
+        """
+        if trace is None and save_trace:
+            trace = TraceRecorder()
+        recorders = [
+            recorder for recorder in (trace, statistics) if recorder is not None
+        ]
+
+        timer = self.timer
+        with timer.stage("trace"):
+            for recorder in recorders:
+                recorder.start(self)
+                recorder.record(0, self.population)
+
+        try:
+            for iteration in tqdm(range(self.iterations)):
+                generation = iteration + 1
+                if profiler is not None:
+                    profiler.start(generation)
+                with timer.stage("generation"):
+                    self.run_single_iteration()
+                if profiler is not None:
+                    profiler.stop(generation)
+
+                with timer.stage("trace"):
+                    for recorder in recorders:
+                        recorder.record(generation, self.population)
+        finally:
+            for recorder in recorders:
+                recorder.close()
+
+        return trace
 
 
 class EvolutionaryAlgorithm(Evolution):
@@ -175,39 +341,113 @@ class EvolutionaryAlgorithm(Evolution):
             self.maximize,
             len(current_population),
         )
-        self.population.grid = np.reshape(next_population, self.population_shape)
+        self.population.set_all_individuals(next_population)
 
     def run_single_iteration(self):
+        timer = self.timer
         for grid_position, individual in self.population.iterate_individuals():
             # Selection and crossover
             if random.uniform(0, 1) < self.crossover_probability:
-                parents = self.select_parents(self.population.get_all_individuals())
-                new_individual = self.recombine(parents)
+                with timer.stage("selection"):
+                    parents = self.select_parents(
+                        self.population.get_all_individuals()
+                    )
+                with timer.stage("crossover"):
+                    new_individual = self.recombine(parents)
             else:
                 new_individual = self.population.get_random_individual()
             # Mutation
             if random.uniform(0, 1) < self.mutation_probability:
-                new_individual = self.mutate(new_individual)
-            # Normalization and fitness computation
-            new_individual = self.normalize_coordinates(new_individual)
-            new_individual.fitness = self.function(new_individual.coordinates)
-
+                with timer.stage("mutation"):
+                    new_individual = self.mutate(new_individual)
+            # Normalization
+            with timer.stage("repair"):
+                new_individual = self.normalize_coordinates(new_individual)
             self.offsprings.set_individual(new_individual, grid_position)
-            self.update_best_solution(new_individual, grid_position)
+
+        # Fitness computation
+        self.offsprings.set_fitness(self.evaluate(self.offsprings.coordinates))
+        self.update_best_solution_from(self.offsprings)
 
         # Succession
-        self.choose_next_population()
+        with timer.stage("succession"):
+            self.choose_next_population()
 
 
 class CellularEvolutionaryAlgorithm(Evolution):
-    def __init__(self, neighbourhood, *args, **kwargs):
+    UPDATE_POLICIES = (
+        "synchronous",
+        "line_sweep",
+        "fixed_random_sweep",
+        "new_random_sweep",
+        "uniform_choice",
+    )
+
+    def __init__(
+        self,
+        neighbourhood,
+        *args,
+        vectorized=False,
+        update_policy="synchronous",
+        **kwargs,
+    ):
         """
         Arguments:
             neighbourhood: describes type of neighbourhood
+            vectorized: if each generation should be computed for the whole grid
+                at once (synchronous update) instead of cell by cell. Like
+                asynchronous policies, it needs `parents_num=2`.
+            update_policy: order in which cells are updated
+                - "synchronous" - offsprings of all cells replace individuals at
+                    the end of the generation
+                - "line_sweep" - cells are updated in place, one by one, in order
+                - "fixed_random_sweep" - as "line_sweep", but in a random order
+                    drawn once
+                - "new_random_sweep" - as "line_sweep", but in a random order
+                    drawn in each generation
+                - "uniform_choice" - in each generation, cells are drawn (with
+                    replacement) as many times as there are cells
+                In asynchronous policies each new individual can be selected as
+                a parent in the same generation. Offsprings are evaluated one by
+                one in the current process (`executor` is not used - a pool would
+                add a round trip per cell). `vectorized` is used only with
+                "synchronous" policy.
 
         """
+        if update_policy not in self.UPDATE_POLICIES:
+            raise ValueError(
+                f"Update policy has to be one of: {', '.join(self.UPDATE_POLICIES)}"
+            )
+
         super(CellularEvolutionaryAlgorithm, self).__init__(*args, **kwargs)
+        if (vectorized or update_policy != "synchronous") and self.parents_num != 2:
+            raise ValueError(
+                "Vectorized and asynchronous generations use batch crossovers, "
+                "which need exactly 2 parents (parents_num=2)"
+            )
         self.neighbourhood = neighbourhood
+        self.vectorized = vectorized
+        self.update_policy = update_policy
+        # Parents' coordinates gathered in each iteration
+        self._parents = None
+        self._sweep_order = None
+        if update_policy == "fixed_random_sweep":
+            self._sweep_order = self.rng.permutation(self.population.size)
+        # Asynchronous policies evaluate single cells in the current process
+        self._cell_evaluator = SerialEvaluator(self.function, self.batch_function)
+
+    @property
+    def neighbours_table(self):
+        """Neighbours' indices of each cell - see `Neighborhood.get_index_table`."""
+        return self.neighbourhood.get_index_table(self.population_shape)
+
+    def _get_parents_buffer(self, rows):
+        if self._parents is None or self._parents.shape[1] != rows:
+            self._parents = np.empty(
+                (self.parents_num, rows, self.population.dimensions),
+                dtype=self.population.dtype,
+            )
+        return self._parents
 
     def select_parents(self, grid_position):
         """Selection.
@@ -221,48 +461,183 @@ class CellularEvolutionaryAlgorithm(Evolution):
             List of neighbours that will be used to create new individual.
 
         """
-        positions = self.neighbourhood.get_neighbours(
-            self.population_shape, grid_position
-        )
-        neighbours = self.population.get_individuals(positions)
-        return super().select_parents(neighbours)
+        with self.timer.stage("neighbours"):
+            table, sizes = self.neighbours_table
+            index = self.population.flat_index(grid_position)
+            neighbours = self.population.take_individuals(
+                table[index, : sizes[index]]
+            )
+        with self.timer.stage("selection"):
+            return super().select_parents(neighbours)
 
     def choose_next_population(self):
         """Succession.
 
-        For each cell choose better individual.
-
-        Arguments:
-            offsprings: grid with newly create individuals
+        For each cell choose individual or offspring (see `Succession.replace_mask`).
 
         """
-        for individual_info, offspring_info in zip(
-            self.population.iterate_individuals(),
-            self.offsprings.iterate_individuals(),
-        ):
-            position, individual = individual_info
-            _, offspring = offspring_info
-
-            result = self.succession.select(
-                np.array([individual]), np.array([offspring]), self.maximize, 1
+        replaced = self.succession.replace_mask(
+            self.population.fitness,
+            self.offsprings.fitness,
+            self.maximize,
+            rng=self.rng,
+        )
+        self.population.replace(self.offsprings, replaced)
+
+    def run_vectorized_iteration(self):
+        """Compute next generation for all cells at once (synchronous update)."""
+        population = self.population
+        offsprings = self.offsprings
+        timer = self.timer
+        parents_buffer = self._get_parents_buffer(population.size)
+
+        with timer.stage("neighbours"):
+            table, sizes = self.neighbours_table
+            neighbours_fitness = population.fitness[table]
+        # Selection
+        with timer.stage("selection"):
+            selected = self.selection.select_batch(
+                neighbours_fitness,
+                self.maximize,
+                self.parents_num,
+                sizes=sizes,
+                rng=self.rng,
+            )
+            parents = np.take_along_axis(table, selected, axis=1)
+        # Crossover
+        with timer.stage("crossover"):
+            for idx in range(self.parents_num):
+                np.take(
+                    population.coordinates,
+                    parents[:, idx],
+                    axis=0,
+                    out=parents_buffer[idx],
+                )
+            self.crossover.recombine_batch(
+                parents_buffer[0],
+                parents_buffer[1],
+                out=offsprings.coordinates,
+                rng=self.rng,
             )
-            self.population.set_individual(result[0], position)
+        # Mutation
+        with timer.stage("mutation"):
+            mutated = self.rng.random(population.size) < self.mutation_probability
+            self.mutation.mutate_batch(offsprings.coordinates, mutated, rng=self.rng)
+        # Normalization and fitness computation
+        with timer.stage("repair"):
+            self.repair.repair(
+                offsprings.coordinates, self.low, self.high, rng=self.rng
+            )
+        offsprings.set_fitness(self.evaluate(offsprings.coordinates))
+        self.update_best_solution_from(offsprings)
+
+        # Succession
+        with timer.stage("succession"):
+            self.choose_next_population()
+
+    def get_update_order(self):
+        """Order in which cells are updated by asynchronous policies."""
+        size = self.population.size
+        if self.update_policy == "line_sweep":
+            return range(size)
+        if self.update_policy == "fixed_random_sweep":
+            return self._sweep_order
+        if self.update_policy == "new_random_sweep":
+            return self.rng.permutation(size)
+        return self.rng.integers(0, size, size=size)
+
+    def run_asynchronous_iteration(self):
+        """Update cells one by one, in place (see `update_policy`).
+
+        Each cell is processed by batch operators as a one-row batch. Offspring
+        replaces individual immediately, so it can become a parent of the next
+        cells.
+
+        """
+        population = self.population
+        timer = self.timer
+        table, sizes = self.neighbours_table
+        parents_buffer = self._get_parents_buffer(1)
+        offspring = np.empty((1, population.dimensions), dtype=population.dtype)
+        order = self.get_update_order()
+        # one decision per update step - with uniform choice a cell can be
+        # updated several times in a generation
+        mutated = self.rng.random(len(order)) < self.mutation_probability
+
+        for step, index in enumerate(order):
+            cell = slice(index, index + 1)
+            with timer.stage("neighbours"):
+                neighbours_fitness = population.fitness[table[cell]]
+            # Selection
+            with timer.stage("selection"):
+                selected = self.selection.select_batch(
+                    neighbours_fitness,
+                    self.maximize,
+                    self.parents_num,
+                    sizes=sizes[cell],
+                    rng=self.rng,
+                )
+                parents = table[index, selected[0]]
+            # Crossover
+            with timer.stage("crossover"):
+                for idx in range(self.parents_num):
+                    parents_buffer[idx] = population.coordinates[parents[idx]]
+                self.crossover.recombine_batch(
+                    parents_buffer[0], parents_buffer[1], out=offspring, rng=self.rng
+                )
+            # Mutation
+            if mutated[step]:
+                with timer.stage("mutation"):
+                    self.mutation.mutate_batch(offspring, rng=self.rng)
+            # Normalization and fitness computation
+            with timer.stage("repair"):
+                self.repair.repair(offspring, self.low, self.high, rng=self.rng)
+            with timer.stage("evaluation"):
+                fitness = self._cell_evaluator.evaluate(offspring)
+            if self.best_solution is None or (
+                fitness[0] > self.best_solution.fitness
+                if self.maximize
+                else fitness[0] < self.best_solution.fitness
+            ):
+                self.update_best_solution(
+                    Individual(coordinates=offspring[0].copy(), fitness=fitness[0]),
+                    population.grid_position(index),
+                )
+
+            # Succession
+            with timer.stage("succession"):
+                if self.succession.replace_mask(
+                    population.fitness[cell], fitness, self.maximize, rng=self.rng
+                )[0]:
+                    population.coordinates[index] = offspring[0]
+                    population.set_fitness(fitness[0], index)
 
     def run_single_iteration(self):
+        if self.update_policy != "synchronous":
+            return self.run_asynchronous_iteration()
+        if self.vectorized:
+            return self.run_vectorized_iteration()
+
+        timer = self.timer
         for grid_position, individual in self.population.iterate_individuals():
             # Selection
             parents = self.select_parents(grid_position)
             # Crossover
-            new_individual = self.recombine(parents)
+            with timer.stage("crossover"):
+                new_individual = self.recombine(parents)
             # Mutation
             if random.uniform(0, 1) < self.mutation_probability:
-                new_individual = self.mutate(new_individual)
-            # Normalization and fitness computation
-            new_individual = self.normalize_coordinates(new_individual)
-            new_individual.fitness = self.function(new_individual.coordinates)
-
+                with timer.stage("mutation"):
+                    new_individual = self.mutate(new_individual)
+            # Normalization
+            with timer.stage("repair"):
+                new_individual = self.normalize_coordinates(new_individual)
             self.offsprings.set_individual(new_individual, grid_position)
-            self.update_best_solution(new_individual, grid_position)
+
+        # Fitness computation
+        self.offsprings.set_fitness(self.evaluate(self.offsprings.coordinates))
+        self.update_best_solution_from(self.offsprings)
 
         # Succession.
-        self.choose_next_population()
+        with timer.stage("succession"):
+            self.choose_next_population()
@@ -0,0 +1,224 @@
+import math
+import multiprocessing
+import random
+
+import numpy as np
+
+
+def ring_topology(islands):
+    """Each island sends migrants to the next one."""
+    return {index: [(index + 1) % islands] for index in range(islands)}
+
+
+def star_topology(islands):
+    """First island exchanges migrants with all other islands."""
+    topology = {0: list(range(1, islands))}
+    topology.update({index: [0] for index in range(1, islands)})
+    return topology
+
+
+def fully_connected_topology(islands):
+    """Each island sends migrants to all other islands."""
+    return {
+        index: [target for target in range(islands) if target != index]
+        for index in range(islands)
+    }
+
+
+TOPOLOGIES = {
+    "ring": ring_topology,
+    "star": star_topology,
+    "fully_connected": fully_connected_topology,
+}
+
+
+def _run_island(factory, seed, migrants, connection, inherited=()):
+    """Island's process.
+
+    Receives `(generations, immigrants)` messages, sends back `migrants` best
+    individuals after each of them. `None` ends the evolution - island sends its
+    final state and stops. Island also stops when the main process closes the
+    connection.
+
+    `inherited` are main process' ends of the pipes (inherited when the process is
+    forked) - they are closed, so that only the main process keeps them open.
+
+    """
+    for other in inherited:
+        other.close()
+    random.seed(seed)
+    np.random.seed(seed)
+    evolution = factory()
+    if seed is not None:
+        evolution.rng = np.random.default_rng(seed)
+
+    try:
+        while True:
+            try:
+                message = connection.recv()
+            except EOFError:
+                return
+            if message is None:
+                break
+            generations, immigrants = message
+            if immigrants is not None:
+                evolution.insert_individuals(*immigrants)
+            for _ in range(generations):
+                evolution.run_single_iteration()
+            connection.send(evolution.get_best_individuals(migrants))
+
+        if evolution.best_solution is None:
+            # no generations were computed - use the initial population
+            coordinates, fitness = evolution.get_best_individuals(1)
+            best_coordinates, best_fitness = coordinates[0], fitness[0]
+        else:
+            best_coordinates = evolution.best_solution.coordinates
+            best_fitness = evolution.best_solution.fitness
+        connection.send(
+            {
+                "best_coordinates": best_coordinates,
+                "best_fitness": best_fitness,
+                "maximize": evolution.maximize,
+                "population_coordinates": evolution.population.coordinates,
+                "population_fitness": evolution.population.fitness,
+            }
+        )
+    finally:
+        evolution.close()
+        connection.close()
+
+
+class IslandModel:
+    def __init__(
+        self, factories, migration_interval, migrants=1, topology="ring", seed=None
+    ):
+        """Run independent evolutions (islands) in separate processes.
+
+        Every `migration_interval` generations each island sends copies of its best
+        individuals to its neighbours in `topology`, where they replace the worst
+        individuals. Migrants are sent through pipes as coordinates and fitness
+        arrays.
+
+        Arguments:
+            factories: list of callables (one per island) that create Evolution
+                objects. Each island can use different grid and operators.
+                Factories need to be picklable (eg. functools.partial of a class).
+            migration_interval: number of generations between migrations
+            migrants: number of individuals sent by each island
+            topology: "ring", "star", "fully_connected" or dict
+                {island: list of islands that receive its migrants}
+            seed: base seed - island `i` seeds `random`, `np.random` and evolution's
+                Generator with `seed + i`. If None, islands are not seeded.
+
+        """
+        self.factories = factories
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+
+        if isinstance(topology, str):
+            if topology not in TOPOLOGIES:
+                raise ValueError(f"Topology has to be one of: {', '.join(TOPOLOGIES)}")
+            topology = TOPOLOGIES[topology](len(factories))
+        self.topology = topology
+        self.seed = seed
+
+    def get_immigrants(self, emigrants):
+        """Collect migrants sent to each island.
+
+        Arguments:
+            emigrants: list of (coordinates, fitness) sent by each island
+
+        Return:
+            list of (coordinates, fitness) received by each island (or None)
+
+        """
+        received = [[] for _ in self.factories]
+        for source, targets in self.topology.items():
+            for target in targets:
+                received[target].append(emigrants[source])
+
+        return [
+            (
+                np.concatenate([coordinates for coordinates, _ in immigrants]),
+                np.concatenate([fitness for _, fitness in immigrants]),
+            )
+            if immigrants
+            else None
+            for immigrants in received
+        ]
+
+    def run(self, generations):
+        """Run all islands.
+
+        Arguments:
+            generations: number of generations computed by each island (with 0,
+                islands return their initial populations)
+
+        Return:
+            dictionary with keys:
+                - best_coordinates, best_fitness, best_island - best solution found
+                - islands - list of islands' final states (best solution and
+                    population's coordinates and fitness)
+
+        """
+        if generations < 0:
+            raise ValueError("Number of generations can't be negative")
+
+        connections = []
+        processes = []
+        for index, factory in enumerate(self.factories):
+            seed = None if self.seed is None else self.seed + index
+            parent_connection, child_connection = multiprocessing.Pipe()
+            # not daemonic - islands can start their own process pools
+            process = multiprocessing.Process(
+                target=_run_island,
+                args=(
+                    factory,
+                    seed,
+                    self.migrants,
+                    child_connection,
+                    connections + [parent_connection],
+                ),
+            )
+            process.start()
+            child_connection.close()
+            connections.append(parent_connection)
+            processes.append(process)
+
+        try:
+            immigrants = [None] * len(connections)
+            for epoch in range(math.ceil(generations / self.migration_interval)):
+                epoch_generations = min(
+                    self.migration_interval,
+                    generations - epoch * self.migration_interval,
+                )
+                for connection, received in zip(connections, immigrants):
+                    connection.send((epoch_generations, received))
+                emigrants = [connection.recv() for connection in connections]
+                immigrants = self.get_immigrants(emigrants)
+
+            for connection in connections:
+                connection.send(None)
+            islands = [connection.recv() for connection in connections]
+        finally:
+            # closed connections stop islands waiting for a message (eg. after
+            # an error); islands still computing generations are terminated
+            for connection in connections:
+                connection.close()
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+
+        fitness = [island["best_fitness"] for island in islands]
+        if islands[0]["maximize"]:
+            best_island = int(np.argmax(fitness))
+        else:
+            best_island = int(np.argmin(fitness))
+        return {
+            "best_coordinates": islands[best_island]["best_coordinates"],
+            "best_fitness": islands[best_island]["best_fitness"],
+            "best_island": best_island,
+            "islands": islands,
+        }
@@ -0,0 +1,155 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class Metric(ABC):
+    # Key of the metric's values in `StatisticsCollector.results`
+    name = None
+
+    @abstractmethod
+    def compute(self, population, maximize):
+        """Compute value of the metric for the population.
+
+        Arguments:
+            population: Population
+            maximize: if function is maximized
+
+        Return:
+            float
+
+        """
+        ...
+
+
+class MaxFitness(Metric):
+    name = "max_fitness"
+
+    def compute(self, population, maximize):
+        return np.max(population.fitness)
+
+
+class MinFitness(Metric):
+    name = "min_fitness"
+
+    def compute(self, population, maximize):
+        return np.min(population.fitness)
+
+
+class BestFitness(Metric):
+    name = "best_fitness"
+
+    def compute(self, population, maximize):
+        return np.max(population.fitness) if maximize else np.min(population.fitness)
+
+
+class WorstFitness(Metric):
+    name = "worst_fitness"
+
+    def compute(self, population, maximize):
+        return np.min(population.fitness) if maximize else np.max(population.fitness)
+
+
+class MeanFitness(Metric):
+    name = "mean_fitness"
+
+    def compute(self, population, maximize):
+        return np.mean(population.fitness)
+
+
+class MedianFitness(Metric):
+    name = "median_fitness"
+
+    def compute(self, population, maximize):
+        return np.median(population.fitness)
+
+
+class StdFitness(Metric):
+    name = "std_fitness"
+
+    def compute(self, population, maximize):
+        return np.std(population.fitness)
+
+
+class Diversity(Metric):
+    """Mean Euclidean distance between individuals and the population's centroid."""
+
+    name = "diversity"
+
+    def compute(self, population, maximize):
+        coordinates = population.coordinates
+        deviation = coordinates - np.mean(coordinates, axis=0)
+        return np.mean(np.sqrt(np.einsum("ij,ij->i", deviation, deviation)))
+
+
+class StatisticsCollector:
+    def __init__(self, metrics=None, every=1):
+        """Compute metrics of the population during the evolution.
+
+        Values are stored in preallocated arrays - one value of each metric per
+        recorded generation. Use as `evolution.run(statistics=collector)`.
+
+        Arguments:
+            metrics: list of Metric objects. If None: best, worst, mean, median and
+                std of fitness and diversity.
+            every: record every `every`-th generation
+
+        """
+        if metrics is None:
+            metrics = [
+                BestFitness(),
+                WorstFitness(),
+                MeanFitness(),
+                MedianFitness(),
+                StdFitness(),
+                Diversity(),
+            ]
+        self.metrics = metrics
+        self.every = every
+        self.maximize = True
+
+        self.values = None
+        self.generations = None
+        self.frames = 0
+
+    def start(self, evolution):
+        """Allocate arrays for all recorded generations of the evolution."""
+        frames = evolution.iterations // self.every + 1
+        self.maximize = evolution.maximize
+        self.values = {metric.name: np.empty(frames) for metric in self.metrics}
+        self.generations = np.empty(frames, dtype=np.int64)
+        self.frames = 0
+
+    def record(self, generation, population):
+        """Compute metrics if `generation` is one of the recorded generations."""
+        if generation % self.every or self.frames == len(self.generations):
+            return
+        for metric in self.metrics:
+            self.values[metric.name][self.frames] = metric.compute(
+                population, self.maximize
+            )
+        self.generations[self.frames] = generation
+        self.frames += 1
+
+    def close(self):
+        """Finish recording."""
+        pass
+
+    @property
+    def results(self):
+        """Recorded values.
+
+        Return:
+            dictionary {metric's name: array with values in recorded generations}
+            with additional `generation` key. If best and worst fitness were
+            recorded, `max_fitness` and `min_fitness` are added, so results can be
+            passed to `summary_plots`.
+
+        """
+        results = {name: values[: self.frames] for name, values in self.values.items()}
+        if "best_fitness" in results and "worst_fitness" in results:
+            best, worst = results["best_fitness"], results["worst_fitness"]
+            results.setdefault("max_fitness", best if self.maximize else worst)
+            results.setdefault("min_fitness", worst if self.maximize else best)
+        results["generation"] = self.generations[: self.frames]
+        return results
@@ -2,17 +2,53 @@ from abc import ABC, abstractmethod
 
 import numpy as np
 
+from cellular_algorithm import Individual
+
 
 class Mutation(ABC):
     @abstractmethod
     def mutate(individual):
         ...
 
+    def mutate_batch(self, coordinates, mask=None, rng=None):
+        """Mutate selected rows of `coordinates` in place.
+
+        Default implementation calls `mutate` for each selected row.
+
+        Arguments:
+            coordinates: (n, D) matrix with individuals' coordinates
+            mask: (n,) boolean array - which rows should be mutated. If None, all
+                rows will be mutated.
+            rng: numpy's random Generator
+
+        Return:
+            modified coordinates
+
+        """
+        rows = range(len(coordinates)) if mask is None else np.flatnonzero(mask)
+        for index in rows:
+            individual = Individual(coordinates=coordinates[index].copy(), fitness=None)
+            coordinates[index] = self.mutate(individual).coordinates
+        return coordinates
+
 
 class GaussianMutation(Mutation):
-    def __init__(self, scale):
+    def __init__(self, scale, gene_probability=None):
+        """
+        Arguments:
+            scale: standard deviation of the noise
+            gene_probability: probability of mutating each coordinate of the mutated
+                individual. If None, all coordinates are mutated.
+
+        """
         self.scale = scale
         self.loc = 0
+        self.gene_probability = gene_probability
+
+        # Buffers reused by `mutate_batch`
+        self._noise = None
+        self._gene_draws = None
+        self._gene_mask = None
 
     def mutate(self, individual):
         """Add noise to the individual's coordinates.
@@ -27,5 +63,53 @@ class GaussianMutation(Mutation):
         noise = np.random.normal(
             loc=self.loc, scale=self.scale, size=len(individual.coordinates)
         )
+        if self.gene_probability is not None:
+            noise[np.random.uniform(size=len(noise)) >= self.gene_probability] = 0
         individual.coordinates += noise
         return individual
+
+    def _get_buffers(self, coordinates):
+        if (
+            self._noise is None
+            or self._noise.shape != coordinates.shape
+            or self._noise.dtype != coordinates.dtype
+        ):
+            self._noise = np.empty(coordinates.shape, dtype=coordinates.dtype)
+            self._gene_draws = np.empty(coordinates.shape, dtype=coordinates.dtype)
+            self._gene_mask = np.empty(coordinates.shape, dtype=bool)
+        return self._noise, self._gene_draws, self._gene_mask
+
+    def mutate_batch(self, coordinates, mask=None, rng=None):
+        """Add noise to the selected rows of `coordinates` (in place).
+
+        Noise for the whole matrix is drawn at once into a reused buffer and added
+        only to the selected rows (and coordinates, if `gene_probability` is set).
+
+        Arguments:
+            coordinates: (n, D) matrix with individuals' coordinates
+            mask: (n,) boolean array - which rows should be mutated. If None, all
+                rows will be mutated.
+            rng: numpy's random Generator
+
+        Return:
+            modified coordinates
+
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        noise, gene_draws, gene_mask = self._get_buffers(coordinates)
+
+        rng.standard_normal(out=noise, dtype=noise.dtype)
+        noise *= self.scale
+        if self.loc:
+            noise += self.loc
+
+        where = True if mask is None else mask[:, np.newaxis]
+        if self.gene_probability is not None:
+            rng.random(out=gene_draws, dtype=gene_draws.dtype)
+            np.less(gene_draws, self.gene_probability, out=gene_mask)
+            if mask is not None:
+                gene_mask &= where
+            where = gene_mask
+
+        np.add(coordinates, noise, out=coordinates, where=where)
+        return coordinates
@@ -1,15 +1,21 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from itertools import product
 
+import numpy as np
+
 
 class Neighborhood(ABC):
-    def __init__(self, distance):
+    def __init__(self, distance, toroidal=False):
         """Init neighborhood.
         Arguments:
             distance: max distance from the individual
+            toroidal: if grid's edges should wrap around (torus). Otherwise
+                neighbourhoods of the border cells are clipped.
 
         """
         self.distance = distance
+        self.toroidal = toroidal
 
     @abstractmethod
     def get_neighbours(self, grid_shape, idx):
@@ -25,8 +31,72 @@ class Neighborhood(ABC):
         """
         pass
 
+    def get_index_table(self, grid_shape):
+        """Get neighbours of all cells as a table of indices.
+
+        Tables are built once for each grid shape (by calling `get_neighbours` for
+        each cell) and then cached. Cells are indexed in C-order (like rows of
+        `Population`'s arrays).
+
+        Arguments:
+            grid_shape: shape of the grid that we want to get individuals from
+
+        Return:
+            (table, sizes) - `table[i, :sizes[i]]` contains indices of i-th cell's
+            neighbours in the same order as `get_neighbours`. Remaining columns
+            contain i-th cell's index.
+
+        """
+        grid_shape = tuple(grid_shape)
+        # neighbours may depend on the instance, so tables are cached by it
+        tables = self.__dict__.setdefault("_index_tables", {})
+        if grid_shape not in tables:
+            tables[grid_shape] = _build_index_table(self, grid_shape)
+        return tables[grid_shape]
+
+
+def _build_index_table(neighbourhood, grid_shape):
+    # index table of any neighbourhood, from `get_neighbours` of each cell
+    rows = [
+        np.ravel_multi_index(
+            tuple(np.array(neighbourhood.get_neighbours(grid_shape, idx)).T),
+            grid_shape,
+        )
+        for idx in np.ndindex(*grid_shape)
+    ]
+    sizes = np.array([len(row) for row in rows])
+    table = np.repeat(np.arange(len(rows))[:, np.newaxis], sizes.max(), axis=1)
+    for i, row in enumerate(rows):
+        table[i, : len(row)] = row
+
+    table.flags.writeable = False
+    sizes.flags.writeable = False
+    return table, sizes
+
+
+class OffsetNeighborhood(Neighborhood):
+    """Neighbourhood given by the same offsets for every cell.
+
+    Index tables are compiled from the offsets with array operations and shared by
+    all neighbourhoods with the same offsets, grid shape, distance and topology.
+
+    """
+
+    @staticmethod
+    @abstractmethod
+    def get_offsets(ndim, distance):
+        """Get positions of the neighbours relative to the individual.
+
+        Arguments:
+            ndim: number of grid's dimensions
+            distance: max distance from the individual
+
+        Return:
+            List of offsets (tuples of length `ndim`).
+
+        """
+        pass
 
-class LinearNeighborhood(Neighborhood):
     def get_neighbours(self, grid_shape, idx):
         """Get list of neighbours' positions on the grid.
 
@@ -41,41 +111,96 @@ class LinearNeighborhood(Neighborhood):
         assert len(grid_shape) == len(idx)
 
         result = []
-
-        # idx = (11, 24, 13) => position_0 = 11, position_1 = 24, etc.
-        for axis, position in enumerate(idx):
-            first_neighbor_pos = max(position - self.distance, 0)
-            last_neighbor_pos = min(position + self.distance + 1, grid_shape[axis])
-
-            for neighbor_position in range(first_neighbor_pos, last_neighbor_pos):
-                neighbor_idx = list(idx)
-                neighbor_idx[axis] = neighbor_position
-                result.append(tuple(neighbor_idx))
+        for offset in self.get_offsets(len(grid_shape), self.distance):
+            position = [pos + shift for pos, shift in zip(idx, offset)]
+            if self.toroidal:
+                position = [pos % size for pos, size in zip(position, grid_shape)]
+            elif any(pos < 0 or pos >= size for pos, size in zip(position, grid_shape)):
+                continue
+            result.append(tuple(position))
 
         return result
 
+    def get_index_table(self, grid_shape):
+        """Get neighbours of all cells as a table of indices.
 
-class CompactNeighborhood(Neighborhood):
-    def get_neighbours(self, grid_shape, idx):
-        """Get list of neighbours' positions on the grid.
+        See `Neighborhood.get_index_table`. In toroidal grid each row is full.
+
+        """
+        return _compile_index_table(
+            type(self).get_offsets, tuple(grid_shape), self.distance, self.toroidal
+        )
+
+
+@lru_cache(maxsize=None)
+def _compile_index_table(get_offsets, grid_shape, distance, toroidal):
+    shape = np.array(grid_shape)
+    offsets = np.array(get_offsets(len(grid_shape), distance))
+    cells = np.indices(grid_shape).reshape(len(grid_shape), -1).T
+
+    # (cells, neighbours, ndim) positions of the neighbours
+    positions = cells[:, np.newaxis, :] + offsets[np.newaxis, :, :]
+    if toroidal:
+        positions %= shape
+        valid = np.ones(positions.shape[:2], dtype=bool)
+    else:
+        valid = np.all((positions >= 0) & (positions < shape), axis=2)
+        positions = np.clip(positions, 0, shape - 1)
+
+    table = np.ravel_multi_index(tuple(np.moveaxis(positions, 2, 0)), grid_shape)
+    # Move valid neighbours to the front of each row (keep their order).
+    order = np.argsort(~valid, axis=1, kind="stable")
+    table = np.take_along_axis(table, order, axis=1)
+    sizes = valid.sum(axis=1)
+    padding = np.arange(table.shape[1]) >= sizes[:, np.newaxis]
+    table[padding] = np.broadcast_to(np.arange(len(table))[:, np.newaxis], table.shape)[
+        padding
+    ]
+
+    table.flags.writeable = False
+    sizes.flags.writeable = False
+    return table, sizes
+
+
+class LinearNeighborhood(OffsetNeighborhood):
+    @staticmethod
+    def get_offsets(ndim, distance):
+        """Get positions of the neighbours relative to the individual.
+
+        Neighbours lie on the lines parallel to grid's axes.
 
         Arguments:
-            grid_shape: shape of the grid that we want to get individuals from
-            idx: individual's position on the grid
+            ndim: number of grid's dimensions
+            distance: max distance from the individual
 
         Return:
-            Set of neighbours' positions.
+            List of offsets (tuples of length `ndim`).
 
         """
-        assert len(grid_shape) == len(idx)
+        result = []
+        # offset = (0, -2, 0) => position on axis 1 changes by -2
+        for axis in range(ndim):
+            for shift in range(-distance, distance + 1):
+                offset = [0] * ndim
+                offset[axis] = shift
+                result.append(tuple(offset))
+
+        return result
 
-        ranges = []
 
-        # idx = (11, 24, 13) => position_0 = 11, position_1 = 24, etc.
-        for axis, position in enumerate(idx):
-            first_neighbor_pos = max(position - self.distance, 0)
-            last_neighbor_pos = min(position + self.distance + 1, grid_shape[axis])
+class CompactNeighborhood(OffsetNeighborhood):
+    @staticmethod
+    def get_offsets(ndim, distance):
+        """Get positions of the neighbours relative to the individual.
 
-            ranges.append(range(first_neighbor_pos, last_neighbor_pos))
+        Neighbours fill hypercube around the individual.
 
-        return list(product(*ranges))
+        Arguments:
+            ndim: number of grid's dimensions
+            distance: max distance from the individual
+
+        Return:
+            List of offsets (tuples of length `ndim`).
+
+        """
+        return list(product(range(-distance, distance + 1), repeat=ndim))
@@ -0,0 +1,217 @@
+import numpy as np
+
+from cellular_algorithm import Individual
+
+
+class Population:
+    def __init__(self, shape, dimensions=None, dtype=np.float64):
+        """Population stored as arrays.
+
+        Coordinates of all individuals are kept in one contiguous `(cells, D)` array
+        and their fitness values in one `(cells,)` array. Position on the grid is
+        the C-order (row-major) index of the cell. `evaluated` marks cells whose
+        fitness has been set (any value, including NaN, is a valid fitness).
+
+        Arguments:
+            shape: describes population's (grid's) shape
+            dimensions: number of coordinates of each individual. If None, arrays
+                will be allocated when the first individual is added
+            dtype: type of the coordinates and fitness values
+
+        """
+        self._shape = tuple(np.atleast_1d(shape).tolist())
+        self.size = int(np.prod(self._shape))
+        self.dtype = np.dtype(dtype)
+
+        self.coordinates = None
+        self.fitness = None
+        self.evaluated = None
+        if dimensions is not None:
+            self._allocate(dimensions)
+
+    def __repr__(self):
+        return f"{self.grid}"
+
+    def __len__(self):
+        return self.size
+
+    def _allocate(self, dimensions):
+        self.coordinates = np.zeros((self.size, dimensions), dtype=self.dtype)
+        self.fitness = np.full(self.size, np.nan, dtype=self.dtype)
+        self.evaluated = np.zeros(self.size, dtype=bool)
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def dimensions(self):
+        return None if self.coordinates is None else self.coordinates.shape[1]
+
+    @property
+    def coordinates_grid(self):
+        """View of the coordinates with shape `(*shape, D)`."""
+        return self.coordinates.reshape(self._shape + (self.dimensions,))
+
+    @property
+    def fitness_grid(self):
+        """View of the fitness values with shape `shape`."""
+        return self.fitness.reshape(self._shape)
+
+    @property
+    def grid(self):
+        """Array of Individual objects with population's shape.
+
+        Individuals are created on demand - modifying them does not modify the
+        population.
+
+        """
+        return np.reshape(self.get_all_individuals(), self._shape)
+
+    @grid.setter
+    def grid(self, individuals):
+        self.set_all_individuals(np.asarray(individuals).flatten())
+
+    def flat_index(self, grid_position):
+        """Convert position on the grid into the index of the row in arrays."""
+        return int(np.ravel_multi_index(grid_position, self._shape))
+
+    def grid_position(self, index):
+        """Convert index of the row in arrays into the position on the grid."""
+        return tuple(int(position) for position in np.unravel_index(index, self._shape))
+
+    def generate_individuals(self, boundaries, function, batch_function=False):
+        """Fill population with random individuals.
+
+        Split grid into discrits of equal size. Generate individual inside each discrit.
+        Grid's axes split first dimensions of the search space, remaining
+        coordinates are drawn from the whole range.
+
+        Arguments:
+            boundaries: describes range of possible solutions
+                eg. ((0, 10), (100, 200), (3, 15)) =>
+                0 < x < 10, 100 < y < 200, 3 < z < 15
+            function: optimized function
+            batch_function: if `function` accepts a matrix with one individual's
+                coordinates per row and returns fitness of each row
+
+        """
+        boundaries = np.asarray(boundaries, dtype=self.dtype)
+        if self.coordinates is None:
+            self._allocate(len(boundaries))
+
+        min_vals = boundaries.min(axis=1)
+        max_vals = boundaries.max(axis=1)
+        low = np.tile(min_vals, (self.size, 1))
+        high = np.tile(max_vals, (self.size, 1))
+
+        # For each position on the grid, compute coresponding discrit.
+        axes = min(len(self._shape), len(boundaries))
+        steps = (max_vals[:axes] - min_vals[:axes]) / np.array(self._shape[:axes])
+        positions = np.indices(self._shape).reshape(len(self._shape), -1).T
+        low[:, :axes] = positions[:, :axes] * steps + min_vals[:axes]
+        high[:, :axes] = low[:, :axes] + steps
+
+        self.coordinates[:] = np.random.uniform(low=low, high=high)
+        if batch_function:
+            self.set_fitness(function(self.coordinates))
+        else:
+            self.set_fitness([function(coordinates) for coordinates in self.coordinates])
+
+    def set_fitness(self, fitness, index=slice(None)):
+        """Set fitness of the given rows (all by default), mark them as evaluated.
+
+        Arguments:
+            fitness: fitness value(s)
+            index: index, slice or array of indices of the rows
+
+        """
+        self.fitness[index] = fitness
+        self.evaluated[index] = True
+
+    def get_individual(self, index):
+        """Create Individual from the given row of the arrays.
+
+        Individual holds a copy of the row - modifying it does not modify the
+        population. Its fitness is None if the cell has not been evaluated.
+
+        """
+        return Individual(
+            coordinates=self.coordinates[index].copy(),
+            fitness=self.fitness[index] if self.evaluated[index] else None,
+        )
+
+    def set_individual(self, individual, grid_position):
+        """Set new individual on the given position.
+
+        Arguments:
+            individual: individual we want to set on the given position
+            grid_position: individual's position on the grid
+
+        """
+        if self.coordinates is None:
+            self._allocate(len(individual.coordinates))
+
+        index = self.flat_index(grid_position)
+        self.coordinates[index] = individual.coordinates
+        if individual.fitness is None:
+            self.fitness[index] = np.nan
+            self.evaluated[index] = False
+        else:
+            self.set_fitness(individual.fitness, index)
+
+    def set_all_individuals(self, individuals):
+        """Replace whole population with given individuals (in C-order)."""
+        assert len(individuals) == self.size
+        for index, individual in enumerate(individuals):
+            self.set_individual(individual, self.grid_position(index))
+
+    def replace(self, other, mask):
+        """Copy individuals from `other` population to the selected cells.
+
+        Arguments:
+            other: population with the same shape and dimensions
+            mask: (cells,) boolean array - which cells should be replaced
+
+        """
+        np.copyto(self.coordinates, other.coordinates, where=mask[:, np.newaxis])
+        np.copyto(self.fitness, other.fitness, where=mask)
+        np.copyto(self.evaluated, other.evaluated, where=mask)
+
+    def iterate_individuals(self):
+        for index, grid_position in enumerate(np.ndindex(*self._shape)):
+            yield grid_position, self.get_individual(index)
+
+    def get_individuals(self, indices):
+        """Get individuals from the given positions.
+
+        Arguments:
+            indices: list of positions on the grid
+
+        Return:
+            Array of individuals.
+
+        """
+        flat_indices = np.ravel_multi_index(tuple(np.transpose(indices)), self._shape)
+        return self.take_individuals(flat_indices)
+
+    def take_individuals(self, indices):
+        """Get individuals (copies) from the given rows of the arrays.
+
+        Arguments:
+            indices: list of rows' indices
+
+        Return:
+            Array of individuals.
+
+        """
+        individuals = np.empty(len(indices), dtype=Individual)
+        for idx, index in enumerate(indices):
+            individuals[idx] = self.get_individual(index)
+        return individuals
+
+    def get_all_individuals(self):
+        return self.take_individuals(range(self.size))
+
+    def get_random_individual(self):
+        return self.get_individual(np.random.randint(0, self.size))
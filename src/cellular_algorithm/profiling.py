@@ -0,0 +1,240 @@
+import cProfile
+import json
+import os
+import pstats
+import tracemalloc
+from time import perf_counter
+
+
+class _Stage:
+    """Context manager that adds its duration to the timer's stage.
+
+    One object is reused by all measurements of the stage, so it can not be
+    entered again before it exits.
+
+    """
+
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        if self.start is not None:
+            raise RuntimeError(f"Stage {self.name!r} is already being measured")
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = perf_counter() - self.start
+        self.start = None
+        self.timer.add(self.name, elapsed)
+        return False
+
+
+class StageTimer:
+    def __init__(self):
+        """Aggregate wall time and number of calls of evolution's stages.
+
+        Only totals are stored, so the timer can stay enabled during long runs.
+        Stages: neighbours, selection, crossover, mutation, repair, evaluation,
+        succession, trace and generation (whole `run_single_iteration`).
+
+        """
+        self.totals = {}
+        self.calls = {}
+        self._stages = {}
+
+    def stage(self, name):
+        """Context manager that measures a stage.
+
+        Stage can not be nested in itself - entering it again before it exits
+        raises RuntimeError.
+
+        """
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = _Stage(self, name)
+            self.totals.setdefault(name, 0.0)
+            self.calls.setdefault(name, 0)
+        return stage
+
+    def add(self, name, elapsed):
+        """Add measured duration of a stage."""
+        self.totals[name] = self.totals.get(name, 0.0) + elapsed
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def reset(self):
+        self.totals = {name: 0.0 for name in self.totals}
+        self.calls = {name: 0 for name in self.calls}
+
+    def report(self):
+        """
+        Return:
+            dictionary {stage: {"calls": int, "total": seconds, "mean": seconds}}
+
+        """
+        return {
+            name: {
+                "calls": self.calls[name],
+                "total": self.totals[name],
+                "mean": self.totals[name] / self.calls[name] if self.calls[name] else 0,
+            }
+            for name in self.totals
+        }
+
+
+class GenerationProfiler:
+    def __init__(self, generations, mode="cprofile", top=20, directory=None):
+        """Profile chosen generations with cProfile or tracemalloc.
+
+        Use as `evolution.run(profiler=profiler)`.
+
+        Arguments:
+            generations: numbers of generations that will be profiled (first
+                generation computed by `run` is 1)
+            mode: "cprofile" (time spent in functions) or "tracemalloc" (memory
+                allocated by lines of code). If tracemalloc is already tracing, it
+                is left running and allocations are reported as differences from
+                the start of the generation (peak memory is the caller's peak).
+            top: number of the most expensive entries kept in the report
+            directory: if given, cProfile stats are also saved there as
+                `generation_<number>.prof` files (readable with pstats/snakeviz)
+
+        """
+        if mode not in {"cprofile", "tracemalloc"}:
+            raise ValueError("Only cprofile and tracemalloc modes are allowed")
+        self.generations = set(generations)
+        self.mode = mode
+        self.top = top
+        self.directory = directory
+        self.results = []
+        self._profile = None
+        self._started_tracing = False
+        self._snapshot = None
+
+    def start(self, generation):
+        """Start profiling if `generation` is one of the chosen generations."""
+        if generation not in self.generations:
+            return
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif tracemalloc.is_tracing():
+            # tracing started by the caller - report allocations since this point
+            # and leave it running
+            self._started_tracing = False
+            self._snapshot = tracemalloc.take_snapshot()
+        else:
+            self._started_tracing = True
+            self._snapshot = None
+            tracemalloc.start()
+
+    def stop(self, generation):
+        """Stop profiling, store the results."""
+        if generation not in self.generations:
+            return
+        if self.mode == "cprofile":
+            self._profile.disable()
+            result = self._cprofile_result(self._profile, generation)
+            self._profile = None
+        else:
+            result = self._tracemalloc_result()
+            if self._started_tracing:
+                tracemalloc.stop()
+            self._snapshot = None
+
+        result["generation"] = generation
+        self.results.append(result)
+
+    def _cprofile_result(self, profile, generation):
+        if self.directory is not None:
+            profile.dump_stats(
+                os.path.join(self.directory, f"generation_{generation}.prof")
+            )
+        stats = pstats.Stats(profile).stats
+        functions = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+        return {
+            "total_time": sum(item[2] for item in stats.values()),
+            "functions": [
+                {
+                    "function": f"{filename}:{line}({name})",
+                    "calls": calls,
+                    "total_time": total_time,
+                    "cumulative_time": cumulative_time,
+                }
+                for (filename, line, name), (
+                    _,
+                    calls,
+                    total_time,
+                    cumulative_time,
+                    _,
+                ) in functions[: self.top]
+            ],
+        }
+
+    def _tracemalloc_result(self):
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        if self._snapshot is None:
+            allocations = [
+                {
+                    "location": str(statistic.traceback),
+                    "size": statistic.size,
+                    "count": statistic.count,
+                }
+                for statistic in snapshot.statistics("lineno")[: self.top]
+            ]
+        else:
+            allocations = [
+                {
+                    "location": str(statistic.traceback),
+                    "size": statistic.size_diff,
+                    "count": statistic.count_diff,
+                }
+                for statistic in snapshot.compare_to(self._snapshot, "lineno")[
+                    : self.top
+                ]
+            ]
+        return {
+            "current_memory": current,
+            "peak_memory": peak,
+            "allocations": allocations,
+        }
+
+    def report(self):
+        return {"mode": self.mode, "generations": self.results}
+
+
+def save_report(filename, evolution, profiler=None):
+    """Save report of the evolution's run as JSON.
+
+    Arguments:
+        filename: path of the JSON file
+        evolution: evolution object (after `run`)
+        profiler: GenerationProfiler used in `run` (optional)
+
+    Return:
+        dictionary saved to the file
+
+    """
+    report = {
+        "function": getattr(evolution.function, "__name__", repr(evolution.function)),
+        "iterations": evolution.iterations,
+        "population_shape": list(evolution.population_shape),
+        "dimensions": evolution.population.dimensions,
+        "best_fitness": (
+            None
+            if evolution.best_solution is None
+            else float(evolution.best_solution.fitness)
+        ),
+        "stages": evolution.timer.report(),
+    }
+    if profiler is not None:
+        report["profile"] = profiler.report()
+
+    with open(filename, "w") as file:
+        json.dump(report, file, indent=2)
+    return report
@@ -0,0 +1,78 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class Repair(ABC):
+    @abstractmethod
+    def repair(self, coordinates, low, high, rng=None):
+        """Move coordinates that do not meet boundaries back inside (in place).
+
+        Arguments:
+            coordinates: (n, D) matrix with individuals' coordinates
+            low: (D,) array with the lower boundaries
+            high: (D,) array with the upper boundaries
+            rng: numpy's random Generator
+
+        Return:
+            repaired coordinates
+
+        """
+        ...
+
+
+class ClampRepair(Repair):
+    """Replace coordinates that exceed boundaries with the nearest boundary."""
+
+    def repair(self, coordinates, low, high, rng=None):
+        return np.clip(coordinates, low, high, out=coordinates)
+
+
+class ReflectRepair(Repair):
+    """Reflect coordinates that exceed boundaries back into the range.
+
+    Coordinates that exceed boundaries by more than the range's width are
+    reflected repeatedly. Coordinates with zero-width range are set to `low`.
+
+    """
+
+    def repair(self, coordinates, low, high, rng=None):
+        outside = (coordinates < low) | (coordinates > high)
+        if outside.any():
+            width = high - low
+            # modulo of zero width is NaN - these columns are replaced with `low`
+            with np.errstate(invalid="ignore", divide="ignore"):
+                distance = np.mod(coordinates - low, 2 * width)
+            distance = np.where(distance > width, 2 * width - distance, distance)
+            reflected = np.where(width == 0, low, low + distance)
+            np.copyto(coordinates, reflected, where=outside)
+        return coordinates
+
+
+class WrapRepair(Repair):
+    """Wrap coordinates that exceed boundaries around the range (torus).
+
+    Coordinates with zero-width range are set to `low`.
+
+    """
+
+    def repair(self, coordinates, low, high, rng=None):
+        outside = (coordinates < low) | (coordinates > high)
+        if outside.any():
+            width = high - low
+            # modulo of zero width is NaN - these columns are replaced with `low`
+            with np.errstate(invalid="ignore", divide="ignore"):
+                wrapped = low + np.mod(coordinates - low, width)
+            wrapped = np.where(width == 0, low, wrapped)
+            np.copyto(coordinates, wrapped, where=outside)
+        return coordinates
+
+
+class ResampleRepair(Repair):
+    """Draw coordinates that exceed boundaries uniformly from the range."""
+
+    def repair(self, coordinates, low, high, rng=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        rows, columns = np.nonzero((coordinates < low) | (coordinates > high))
+        coordinates[rows, columns] = rng.uniform(low[columns], high[columns])
+        return coordinates
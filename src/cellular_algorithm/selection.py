@@ -2,12 +2,45 @@ import math
 import random
 from abc import ABC, abstractmethod
 
+import numpy as np
+
+from cellular_algorithm import Individual
+
 
 class Selection(ABC):
     @abstractmethod
     def select(self, individuals, maximize, num):
         ...
 
+    def select_batch(self, fitness, maximize, num, sizes=None, rng=None):
+        """Select `num` candidates in each row of `fitness`.
+
+        Default implementation calls `select` for each row.
+
+        Arguments:
+            fitness: (n, k) matrix with fitness of the candidates
+            maximize: if fitness should be maximized or not (minimized)
+            num: number of candidates that should be selected in each row
+            sizes: number of valid candidates in each row - only first `sizes[i]`
+                columns of i-th row can be selected. If None, all columns are valid.
+            rng: numpy's random Generator
+
+        Return:
+            (n, num) matrix with columns of the selected candidates
+
+        """
+        result = np.empty((len(fitness), num), dtype=np.intp)
+        for row, row_fitness in enumerate(fitness):
+            size = len(row_fitness) if sizes is None else sizes[row]
+            # Candidates' coordinates are replaced by their columns.
+            candidates = [
+                Individual(coordinates=column, fitness=value)
+                for column, value in enumerate(row_fitness[:size])
+            ]
+            selected = self.select(candidates, maximize, num)[:num]
+            result[row] = [individual.coordinates for individual in selected]
+        return result
+
 
 class TournamentSelection(Selection):
     def __init__(self, tournament_size):
@@ -34,44 +67,124 @@ class TournamentSelection(Selection):
             parents.append(winner)
         return parents
 
+    def select_batch(self, fitness, maximize, num, sizes=None, rng=None):
+        """Run `num` tournaments in each row of `fitness`.
+
+        Arguments:
+            fitness: (n, k) matrix with fitness of the candidates
+            maximize: if fitness should be maximized or not (minimized)
+            num: number of candidates that should be selected in each row
+            sizes: number of valid candidates in each row. If None, all columns
+                are valid.
+            rng: numpy's random Generator
+
+        Return:
+            (n, num) matrix with columns of the winners
+
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        n, k = fitness.shape
+        sizes = np.full(n, k) if sizes is None else np.asarray(sizes)
+
+        # Draw candidates (with replacement) for each tournament.
+        draws = rng.random((n, num, self.tournament_size))
+        tournaments = (draws * sizes[:, np.newaxis, np.newaxis]).astype(np.intp)
+        tournaments_fitness = np.take_along_axis(
+            fitness, tournaments.reshape(n, -1), axis=1
+        ).reshape(tournaments.shape)
+
+        if maximize:
+            winners = np.argmax(tournaments_fitness, axis=2)
+        else:
+            winners = np.argmin(tournaments_fitness, axis=2)
+        return np.take_along_axis(tournaments, winners[..., np.newaxis], axis=2)[..., 0]
+
 
 class RouletteWheelSelection(Selection):
+    def __init__(self, offset=0.1):
+        """
+        Arguments:
+            offset: when minimizing, weight added to each candidate, as a fraction
+                of the fitness range in the row - so that the worst candidate can
+                be drawn too. See `get_weights`.
+
+        """
+        if offset < 0:
+            raise ValueError("Offset has to be non-negative")
+        self.offset = offset
+
+    def get_weights(self, fitness, maximize, valid):
+        """Compute weights of the candidates in each row of `fitness`.
+
+        When maximizing, weight is equal to the fitness (it has to be non-negative).
+        When minimizing, weight is equal to `worst - fitness + offset * (worst -
+        best)`, where `worst` and `best` are the worst and the best fitness in the
+        row. Row in which all weights are equal to 0 gets uniform weights.
+
+        Arguments:
+            fitness: (n, k) matrix with fitness of the candidates
+            maximize: if fitness should be maximized or not (minimized)
+            valid: (n, k) boolean matrix - False for candidates that cannot be drawn
+
+        Return:
+            (n, k) matrix with weights
+
+        """
+        if maximize:
+            if np.any(valid & (fitness < 0)):
+                raise ValueError(
+                    "Roulette wheel selection needs non-negative fitness when "
+                    "maximizing"
+                )
+            weights = np.where(valid, fitness, 0.0)
+        else:
+            worst = np.max(np.where(valid, fitness, -np.inf), axis=1, keepdims=True)
+            best = np.min(np.where(valid, fitness, np.inf), axis=1, keepdims=True)
+            offset = self.offset * (worst - best)
+            weights = np.where(valid, worst - fitness + offset, 0.0)
+        total = weights.sum(axis=1, keepdims=True)
+        return np.where(total > 0, weights, valid.astype(weights.dtype))
+
     def select(self, individuals, maximize, num):
         """Roulette wheel selection.
 
-        Can be used with maximize=True only.
-
         Arguments:
             individuals: list of the individuals we choose from
             maximize: if fitness should be maximized or not (minimized).
-                WARNING: It has to be True.
-            num: number of individuals that should be returned. If `fraction` has been
-                given, it will be used instead of `num`
+                See `get_weights`.
+            num: number of individuals that should be returned
 
         """
-        if not maximize:
-            raise ValueError("RouletteWheel cannot be used with minimalization")
-
-        fitness_sum = sum([individual.fitness for individual in individuals])
-
-        roulette = [individual.fitness / fitness_sum for individual in individuals]
-
-        result = []
-        # Draw `num` individuals
-        for required_length in range(num):
-            drawn = random.uniform(0, 1)
-            proba_sum = 0
-            # Add single individual
-            for idx, proba in enumerate(roulette):
-                proba_sum += proba
-                if proba_sum >= drawn:
-                    result.append(individuals[idx])
-                    break
-            # If individual has not been added yet, add last item from individuals list
-            if len(result) < required_length:
-                result.append(individuals[-1])
+        fitness = np.array([[individual.fitness for individual in individuals]])
+        weights = self.get_weights(fitness, maximize, np.ones(fitness.shape, dtype=bool))
+        return random.choices(individuals, weights=weights[0], k=num)
 
-        return result
+    def select_batch(self, fitness, maximize, num, sizes=None, rng=None):
+        """Draw `num` candidates in each row of `fitness`.
+
+        Arguments:
+            fitness: (n, k) matrix with fitness of the candidates
+            maximize: if fitness should be maximized or not (minimized).
+                See `get_weights`.
+            num: number of candidates that should be selected in each row
+            sizes: number of valid candidates in each row. If None, all columns
+                are valid.
+            rng: numpy's random Generator
+
+        Return:
+            (n, num) matrix with columns of the selected candidates
+
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        n, k = fitness.shape
+        sizes = np.full(n, k) if sizes is None else np.asarray(sizes)
+        valid = np.arange(k) < sizes[:, np.newaxis]
+
+        cumulative = np.cumsum(self.get_weights(fitness, maximize, valid), axis=1)
+        draws = rng.random((n, num)) * cumulative[:, -1:]
+        # Index of the first candidate whose cumulative weight exceeds the draw.
+        selected = np.sum(cumulative[:, np.newaxis, :] <= draws[..., np.newaxis], axis=2)
+        return np.minimum(selected, sizes[:, np.newaxis] - 1)
 
 
 class RankSelection(Selection):
@@ -102,3 +215,42 @@ class RankSelection(Selection):
             individuals_num = num
 
         return individuals[:individuals_num]
+
+    def select_batch(self, fitness, maximize, num, sizes=None, rng=None):
+        """Select `num` best candidates in each row of `fitness`.
+
+        Ties are resolved like in `select` (earlier column first). Rows with fewer
+        valid candidates than requested repeat their ranking from the beginning.
+
+        If `fraction` has been given, each row selects `ceil(size * fraction)` best
+        candidates (like `select` with row's valid candidates). The matrix has
+        `ceil(k * fraction)` columns - rows with fewer selected candidates repeat
+        them from the beginning.
+
+        Arguments:
+            fitness: (n, k) matrix with fitness of the candidates
+            maximize: if fitness should be maximized or not (minimized)
+            num: number of candidates that should be selected in each row. If
+                `fraction` has been given, it will be ignored
+            sizes: number of valid candidates in each row. If None, all columns
+                are valid.
+            rng: this argument will be ignored
+
+        Return:
+            (n, num) matrix with columns of the selected candidates
+
+        """
+        n, k = fitness.shape
+        sizes = np.full(n, k) if sizes is None else np.asarray(sizes)
+        if self.fraction:
+            num = math.ceil(k * self.fraction)
+            selected_num = np.ceil(sizes * self.fraction).astype(sizes.dtype)
+        else:
+            selected_num = np.minimum(sizes, num)
+
+        keys = -fitness if maximize else fitness.copy()
+        keys[np.arange(k) >= sizes[:, np.newaxis]] = np.inf
+        ranking = np.argsort(keys, axis=1, kind="stable")
+
+        positions = np.arange(num) % selected_num[:, np.newaxis]
+        return np.take_along_axis(ranking, positions, axis=1)
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 
 import numpy as np
 
-from cellular_algorithm import (RankSelection, RouletteWheelSelection,
+from cellular_algorithm import (Individual, RankSelection, RouletteWheelSelection,
                                 TournamentSelection)
 
 
@@ -11,6 +11,32 @@ class Succession(ABC):
     def select(self, individuals, offsprings, maximize, num):
         ...
 
+    def replace_mask(self, population_fitness, offsprings_fitness, maximize, rng=None):
+        """Choose cells in which offspring replaces individual.
+
+        Each individual competes only with the offspring created in the same cell.
+        Default implementation calls `select` for each cell.
+
+        Arguments:
+            population_fitness: (n,) array with fitness of the individuals
+            offsprings_fitness: (n,) array with fitness of the offsprings
+            maximize: if fitness should be maximized or not (minimized)
+            rng: numpy's random Generator
+
+        Return:
+            (n,) boolean array - True if offspring should replace the individual
+
+        """
+        mask = np.empty(len(population_fitness), dtype=bool)
+        for idx, fitness in enumerate(zip(population_fitness, offsprings_fitness)):
+            individual = Individual(coordinates=None, fitness=fitness[0])
+            offspring = Individual(coordinates=None, fitness=fitness[1])
+            result = self.select(
+                np.array([individual]), np.array([offspring]), maximize, 1
+            )
+            mask[idx] = result[0] is offspring
+        return mask
+
 
 class TournamentSuccession(TournamentSelection, Succession):
     """Select individuals using TournamentSelection.
@@ -23,6 +49,12 @@ class TournamentSuccession(TournamentSelection, Succession):
         individuals = np.concatenate((population, offsprings), axis=None)
         return super().select(individuals=individuals, maximize=maximize, num=num)
 
+    def replace_mask(self, population_fitness, offsprings_fitness, maximize, rng=None):
+        """Run a tournament between individual and offspring in each cell."""
+        fitness = np.column_stack((population_fitness, offsprings_fitness))
+        winners = self.select_batch(fitness, maximize, 1, rng=rng)
+        return winners[:, 0] == 1
+
 
 class RouletteWheelSuccession(RouletteWheelSelection, Succession):
     """Select individuals using RouletteWheelSelection.
@@ -35,6 +67,12 @@ class RouletteWheelSuccession(RouletteWheelSelection, Succession):
         individuals = np.concatenate((population, offsprings), axis=None)
         return super().select(individuals=individuals, maximize=maximize, num=num)
 
+    def replace_mask(self, population_fitness, offsprings_fitness, maximize, rng=None):
+        """Spin the roulette for individual and offspring in each cell."""
+        fitness = np.column_stack((population_fitness, offsprings_fitness))
+        winners = self.select_batch(fitness, maximize, 1, rng=rng)
+        return winners[:, 0] == 1
+
 
 class RankSuccession(RankSelection, Succession):
     """Select individuals using RankSelection.
@@ -47,9 +85,77 @@ class RankSuccession(RankSelection, Succession):
         individuals = np.concatenate((population, offsprings), axis=None)
         return super().select(individuals=individuals, maximize=maximize, num=num)
 
+    def replace_mask(self, population_fitness, offsprings_fitness, maximize, rng=None):
+        """Keep better one in each cell (individual wins ties)."""
+        return ReplaceIfBetterSuccession().replace_mask(
+            population_fitness, offsprings_fitness, maximize
+        )
+
 
 class BasicSuccession(Succession):
     """Select individuals from `offsprings` only."""
 
     def select(self, population, offsprings, maximize, num):
-        return RankSuccession().select(offsprings, maximize, num)
+        return RankSelection().select(offsprings, maximize, num)
+
+    def replace_mask(self, population_fitness, offsprings_fitness, maximize, rng=None):
+        """Offspring replaces individual in each cell."""
+        return np.ones(len(offsprings_fitness), dtype=bool)
+
+
+class ReplacementSuccession(Succession):
+    """Succession defined by `replace_mask` only.
+
+    Individual competes with the offspring from the same position, so `population`
+    and `offsprings` passed to `select` need to have the same length.
+
+    """
+
+    def select(self, population, offsprings, maximize, num):
+        population_fitness = np.array([individual.fitness for individual in population])
+        offsprings_fitness = np.array([individual.fitness for individual in offsprings])
+        mask = self.replace_mask(population_fitness, offsprings_fitness, maximize)
+        return np.where(mask, offsprings, population)[:num]
+
+    @abstractmethod
+    def replace_mask(self, population_fitness, offsprings_fitness, maximize, rng=None):
+        ...
+
+
+class ReplaceIfBetterSuccession(ReplacementSuccession):
+    """Offspring replaces individual only if it is strictly better."""
+
+    def replace_mask(self, population_fitness, offsprings_fitness, maximize, rng=None):
+        if maximize:
+            return offsprings_fitness > population_fitness
+        return offsprings_fitness < population_fitness
+
+
+class ReplaceIfNotWorseSuccession(ReplacementSuccession):
+    """Offspring replaces individual if it is better or equally good."""
+
+    def replace_mask(self, population_fitness, offsprings_fitness, maximize, rng=None):
+        if maximize:
+            return offsprings_fitness >= population_fitness
+        return offsprings_fitness <= population_fitness
+
+
+class StochasticReplacementSuccession(ReplacementSuccession):
+    def __init__(self, probability):
+        """Offspring replaces individual if it is better. Otherwise it replaces
+        individual with the given probability.
+
+        Arguments:
+            probability: probability of accepting offspring that is not better
+
+        """
+        assert 0 <= probability <= 1, "Probability needs to be >= 0 and <= 1"
+        self.probability = probability
+
+    def replace_mask(self, population_fitness, offsprings_fitness, maximize, rng=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        better = ReplaceIfBetterSuccession().replace_mask(
+            population_fitness, offsprings_fitness, maximize
+        )
+        accepted = rng.random(len(offsprings_fitness)) < self.probability
+        return better | accepted
@@ -0,0 +1,236 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+# Trace file layout: MAGIC, header's length (uint32, little-endian), JSON header
+# (padded with spaces, so frames start at a multiple of HEADER_ALIGNMENT) and
+# frames written one after another in C order.
+MAGIC = b"CEATRACE"
+HEADER_ALIGNMENT = 64
+
+
+class TraceRecorder:
+    def __init__(self, every=1, dtype=np.float64, fitness_only=False):
+        """Record population in a preallocated array.
+
+        Each recorded frame is a (cells, D + 1) matrix - individuals' coordinates
+        followed by their fitness (like rows of `get_population_coordinates()`),
+        or a (cells, 1) matrix if `fitness_only` is set.
+
+        Arguments:
+            every: record every `every`-th generation (initial population and
+                generations `every`, `2 * every`, ...)
+            dtype: dtype of the recorded values (eg. np.float32 to halve memory)
+            fitness_only: if only fitness of the individuals should be recorded
+
+        """
+        if every < 1:
+            raise ValueError("`every` has to be a positive integer.")
+        self.every = every
+        self.dtype = np.dtype(dtype)
+        self.fitness_only = fitness_only
+
+        self.data = None
+        self.generations = None
+        self.frames = 0
+
+    def start(self, evolution):
+        """Allocate buffer for all frames of the evolution."""
+        population = evolution.population
+        frames = evolution.iterations // self.every + 1
+        columns = 1 if self.fitness_only else population.dimensions + 1
+
+        self.data = np.empty((frames, population.size, columns), dtype=self.dtype)
+        self.generations = np.empty(frames, dtype=np.int64)
+        self.frames = 0
+
+    def fill_frame(self, frame, population):
+        """Write population's coordinates and fitness into `frame`."""
+        if not self.fitness_only:
+            frame[:, :-1] = population.coordinates
+        frame[:, -1] = population.fitness
+
+    def record(self, generation, population):
+        """Record population if `generation` is one of the recorded generations."""
+        if generation % self.every or self.frames == len(self.data):
+            return
+        self.fill_frame(self.data[self.frames], population)
+        self.generations[self.frames] = generation
+        self.frames += 1
+
+    def close(self):
+        """Finish recording."""
+        pass
+
+    @property
+    def trace(self):
+        """(frames, cells, D + 1) or (frames, cells, 1) array with recorded frames."""
+        return self.data[: self.frames]
+
+    def __len__(self):
+        return self.frames
+
+    def __getitem__(self, key):
+        return self.trace[key]
+
+    def __iter__(self):
+        return iter(self.trace)
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.trace, dtype=dtype)
+
+
+class FileTraceRecorder(TraceRecorder):
+    def __init__(
+        self, path, every=1, dtype=np.float64, fitness_only=False, chunk_frames=1
+    ):
+        """Append recorded frames to a file (see `TraceFile`).
+
+        Only `chunk_frames` frames are kept in memory. Frames are written to the
+        file each time the chunk is full, so the file can be read (eg. by
+        `summary(path)`) while evolution is still running.
+
+        Arguments:
+            path: path of the trace file (it will be overwritten)
+            every: record every `every`-th generation
+            dtype: dtype of the recorded values
+            fitness_only: if only fitness of the individuals should be recorded
+            chunk_frames: number of frames written to the file at once
+
+        """
+        super(FileTraceRecorder, self).__init__(every, dtype, fitness_only)
+        self.path = os.fspath(path)
+        self.chunk_frames = chunk_frames
+        self._file = None
+        self._pending = 0
+
+    def start(self, evolution):
+        """Write file's header, allocate chunk buffer."""
+        population = evolution.population
+        columns = 1 if self.fitness_only else population.dimensions + 1
+        header = {
+            "dtype": self.dtype.str,
+            "cells": population.size,
+            "columns": columns,
+            "shape": list(population.shape),
+            "every": self.every,
+            "fitness_only": self.fitness_only,
+            "function": getattr(
+                evolution.function, "__name__", repr(evolution.function)
+            ),
+            "boundaries": np.asarray(evolution.boundaries, dtype=float).tolist(),
+        }
+        header = json.dumps(header).encode()
+        length = len(MAGIC) + 4 + len(header)
+        header += b" " * (-length % HEADER_ALIGNMENT)
+
+        self.close()
+        self._file = open(self.path, "wb")
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+        self._file.flush()
+
+        self.data = np.empty(
+            (self.chunk_frames, population.size, columns), dtype=self.dtype
+        )
+        self.frames = 0
+        self._pending = 0
+
+    def record(self, generation, population):
+        """Record population if `generation` is one of the recorded generations."""
+        if generation % self.every:
+            return
+        self.fill_frame(self.data[self._pending], population)
+        self._pending += 1
+        self.frames += 1
+        if self._pending == len(self.data):
+            self.flush()
+
+    def flush(self):
+        """Write recorded frames to the file."""
+        if self._pending:
+            self._file.write(self.data[: self._pending].tobytes())
+            self._pending = 0
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def read(self):
+        """Open recorded file."""
+        return TraceFile(self.path)
+
+    @property
+    def trace(self):
+        return self.read()
+
+    def __fspath__(self):
+        return self.path
+
+
+class TraceFile:
+    def __init__(self, path):
+        """Read trace file written by `FileTraceRecorder`.
+
+        Frames are memory-mapped, so they are loaded from the disk only when
+        accessed. Only complete frames are visible - file can be read while it is
+        still being written.
+
+        Arguments:
+            path: path of the trace file
+
+        """
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a trace file.")
+            (length,) = struct.unpack("<I", file.read(4))
+            self.header = json.loads(file.read(length))
+
+        self.offset = len(MAGIC) + 4 + length
+        self.dtype = np.dtype(self.header["dtype"])
+        self.cells = self.header["cells"]
+        self.columns = self.header["columns"]
+        self.every = self.header["every"]
+        self.fitness_only = self.header["fitness_only"]
+        self.function_name = self.header["function"]
+        self.boundaries = self.header["boundaries"]
+        self.frame_size = self.cells * self.columns * self.dtype.itemsize
+
+    @property
+    def shape(self):
+        return (len(self), self.cells, self.columns)
+
+    @property
+    def generations(self):
+        return np.arange(len(self)) * self.every
+
+    def __len__(self):
+        return max(os.path.getsize(self.path) - self.offset, 0) // self.frame_size
+
+    @property
+    def data(self):
+        """Memory-mapped (frames, cells, columns) array with complete frames."""
+        frames = len(self)
+        if not frames:
+            return np.empty((0, self.cells, self.columns), dtype=self.dtype)
+        return np.memmap(
+            self.path,
+            dtype=self.dtype,
+            mode="r",
+            offset=self.offset,
+            shape=(frames, self.cells, self.columns),
+        )
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.data, dtype=dtype)
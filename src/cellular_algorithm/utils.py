@@ -1,9 +1,11 @@
-import statistics
+import os
 
 import matplotlib.pyplot as plt
 import numpy as np
 from celluloid import Camera
 
+from cellular_algorithm.trace import TraceFile, TraceRecorder
+
 
 def plot_population_on_the_surface(
     function,
@@ -44,7 +46,7 @@ def plot_population_on_the_surface(
         surface=(X, Y, Z),
     )
     # If population has been given, plot population on the surface.
-    if population_coordinates:
+    if population_coordinates is not None:
         plot_population(ax, population_coordinates)
 
     if filename is not None:
@@ -129,6 +131,31 @@ def compute_surface(function, boundaries=(-100, 100), points=30):
     return X, Y, Z
 
 
+def _get_trace(population_trace):
+    """Get population trace's frames.
+
+    Arguments:
+        population_trace: list of populations' coordinates in each iteration,
+            (frames, cells, columns) array, TraceRecorder or path of a trace file
+
+    Return:
+        generations - (frames,) array with generation of each frame
+        trace - (frames, cells, columns) array (or memory-mapped TraceFile),
+            fitness in the last column
+
+    """
+    if isinstance(population_trace, (str, os.PathLike)):
+        trace = TraceFile(population_trace)
+        return trace.generations, trace
+    if isinstance(population_trace, TraceRecorder):
+        return population_trace.generations[: len(population_trace)], np.asarray(
+            population_trace
+        )
+
+    trace = np.asarray(population_trace)
+    return np.arange(len(trace)), trace
+
+
 def plot_population(ax, population_coordinates):
     """Plot 3D population.
 
@@ -200,7 +227,9 @@ def record(
     Displays surface and population.
 
     Arguments:
-        population_trace: list of populations' coordinates in each iteration
+        population_trace: list of populations' coordinates in each iteration,
+            array or TraceRecorder returned by evolution.run(save_trace=True)
+            or path of a trace file (see FileTraceRecorder)
         evolution: evolution object that has been used to generate `population_trace`
         points (int): The number of points to collect on each dimension. A total
             of points^2 function evaluations will be performed
@@ -234,9 +263,13 @@ def record(
     camera = Camera(ax.figure)
     surface = compute_surface(evolution.function, evolution.boundaries, points)
 
+    generations, trace = _get_trace(population_trace)
+    if trace.shape[-1] < 3:
+        raise ValueError("Population trace needs to contain coordinates.")
+
     # Record population after given number of `iteration_step`s
-    for iteration, population_coordinates in enumerate(population_trace):
-        if iteration % iteration_step == 0:
+    for generation, population_coordinates in zip(generations, trace):
+        if generation % iteration_step == 0:
             generate_frame(ax, population_coordinates, surface, title, camera)
 
     # Display or save image
@@ -252,28 +285,36 @@ def summary(population_trace):
     """Compute min, max and mean value for each iteration.
 
     Arguments:
-        population_trace: list of populations' coordinates in each iteration
+        population_trace: list of populations' coordinates in each iteration,
+            array or TraceRecorder returned by evolution.run(save_trace=True)
+            or path of a trace file (see FileTraceRecorder)
 
     Return:
         dictionary with keys:
             - max_fitness - list of max fitnesses in each iteration
             - min_fitness - list of min fitnesses in each iteration
             - mean_fitness - list of mean fitnesses in each iteration
+            - generation - list of recorded iterations
 
     """
+    generations, trace = _get_trace(population_trace)
     max_fitness = []
     min_fitness = []
     mean_fitness = []
 
-    for iteration in population_trace:
-        max_fitness.append(max(iteration, key=lambda x: x[-1])[-1])
-        min_fitness.append(min(iteration, key=lambda x: x[-1])[-1])
-        mean_fitness.append(statistics.mean(individual[-1] for individual in iteration))
+    # Frames are processed one by one, so memory-mapped traces are not loaded
+    # into memory at once
+    for frame in trace:
+        fitness = frame[:, -1]
+        max_fitness.append(float(np.max(fitness)))
+        min_fitness.append(float(np.min(fitness)))
+        mean_fitness.append(float(np.mean(fitness, dtype=np.float64)))
 
     return {
         "max_fitness": max_fitness,
         "min_fitness": min_fitness,
         "mean_fitness": mean_fitness,
+        "generation": generations.tolist(),
     }
 
 
@@ -289,7 +330,7 @@ def summary_plots(summary_dict, ax=None, filename=None, display=False):
     """
     ax = ax if ax is not None else plt.subplots()[1]
 
-    x = range(len(summary_dict["max_fitness"]))
+    x = summary_dict.get("generation", range(len(summary_dict["max_fitness"])))
 
     ax.plot(x, summary_dict["max_fitness"], label="max fitness")
     ax.plot(x, summary_dict["min_fitness"], label="min fitness")
@@ -312,7 +353,9 @@ def population_fitness_plot(population_trace, ax=None, filename=None, display=Fa
     """Plot fitnesses of all individuals in each iteration.
 
     Arguments:
-        population_trace: trace of the population returned by evolution.run(save_trace=True)
+        population_trace: trace of the population returned by
+            evolution.run(save_trace=True) (TraceRecorder, array or list) or
+            path of a trace file (see FileTraceRecorder)
         ax: ax or None
         filename: path used to save the plot
         display: if plot should be displayed
@@ -320,10 +363,10 @@ def population_fitness_plot(population_trace, ax=None, filename=None, display=Fa
     """
     ax = ax if ax is not None else plt.subplots()[1]
 
-    for iteration, population in enumerate(population_trace):
-        x = [iteration for _ in range(len(population))]
-        y = [individual[-1] for individual in population]
-        ax.scatter(x, y, s=1, c="black")
+    generations, trace = _get_trace(population_trace)
+    for generation, frame in zip(generations, trace):
+        fitness = frame[:, -1]
+        ax.scatter(np.full(len(fitness), generation), fitness, s=1, c="black")
 
     ax.set_title("Population fitness distribution")
     ax.set_xlabel("iteration")
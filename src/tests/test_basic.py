@@ -0,0 +1,43 @@
+# Regression tests of cec2017.basic kernels and f1 - f30 against the original
+# implementation.
+#
+# data/cec2017_reference.npz holds 4 random vectors per dimension (x_<D>) and
+# the values computed by the loop-based kernels of the original cec2017-py code
+# one vector at a time (<name>_<D>, basic.<name>_<D> for the kernels). The
+# vectorized kernels reorder the sums, so values may differ by rounding only.
+
+import os
+
+import numpy as np
+import pytest
+
+from cec2017 import basic
+from cec2017.functions import all_functions
+
+REFERENCE = np.load(
+    os.path.join(os.path.dirname(__file__), "data", "cec2017_reference.npz")
+)
+DIMENSIONS = [10, 30, 50, 100]
+RTOL = 1e-10
+
+
+@pytest.mark.parametrize("dimension", DIMENSIONS)
+@pytest.mark.parametrize("kernel", basic.all_functions, ids=lambda f: f.__name__)
+def test_kernel_matches_reference(kernel, dimension):
+    X = REFERENCE[f"x_{dimension}"]
+    expected = REFERENCE[f"basic.{kernel.__name__}_{dimension}"]
+
+    single = np.array([kernel(x) for x in X])
+    np.testing.assert_allclose(single, expected, rtol=RTOL)
+    np.testing.assert_allclose(kernel(X), expected, rtol=RTOL)
+
+
+@pytest.mark.parametrize("dimension", DIMENSIONS)
+@pytest.mark.parametrize("function", all_functions, ids=lambda f: f.__name__)
+def test_function_matches_reference(function, dimension):
+    X = REFERENCE[f"x_{dimension}"]
+    expected = REFERENCE[f"{function.__name__}_{dimension}"]
+
+    single = np.array([function(x) for x in X])
+    np.testing.assert_allclose(single, expected, rtol=RTOL)
+    np.testing.assert_allclose(function(X), expected, rtol=RTOL)
@@ -0,0 +1,169 @@
+import numpy as np
+import pytest
+
+from cellular_algorithm import (
+    ArithmeticCrossover,
+    BlendCrossover,
+    Individual,
+    SimulatedBinaryCrossover,
+    SinglePointCrossover,
+    UniformCrossover,
+)
+
+ROWS = 20000
+DIMENSIONS = 4
+
+
+@pytest.fixture
+def parents():
+    rng = np.random.default_rng(0)
+    shape = (ROWS, DIMENSIONS)
+    return rng.uniform(-10, 10, shape), rng.uniform(-10, 10, shape)
+
+
+def assert_mean_is_midpoint(parents_1, parents_2, children, spread):
+    # mean of (child - midpoint) is 0, its standard error is below spread /
+    # sqrt(rows)
+    offsets = (children - (parents_1 + parents_2) / 2) / np.abs(parents_1 - parents_2)
+    mean = offsets.mean(axis=0)
+    assert np.all(np.abs(mean) < 5 * spread / np.sqrt(len(children)))
+
+
+def test_arithmetic_with_weight(parents):
+    parents_1, parents_2 = parents
+    children = ArithmeticCrossover(0.25).recombine_batch(parents_1, parents_2)
+    np.testing.assert_allclose(children, 0.25 * parents_1 + 0.75 * parents_2)
+
+
+def test_arithmetic_with_random_weight(parents):
+    parents_1, parents_2 = parents
+    rng = np.random.default_rng(1)
+    children = ArithmeticCrossover().recombine_batch(parents_1, parents_2, rng=rng)
+
+    low, high = np.minimum(parents_1, parents_2), np.maximum(parents_1, parents_2)
+    assert np.all((children >= low) & (children <= high))
+    # one weight per child - all coordinates lie on the segment between parents
+    weights = (children - parents_2) / (parents_1 - parents_2)
+    np.testing.assert_allclose(weights, weights[:, :1] * np.ones(DIMENSIONS))
+    assert_mean_is_midpoint(parents_1, parents_2, children, 0.3)
+
+
+@pytest.mark.parametrize("alpha", [0, 0.5, 1])
+def test_blend(parents, alpha):
+    parents_1, parents_2 = parents
+    children = BlendCrossover(alpha).recombine_batch(
+        parents_1, parents_2, rng=np.random.default_rng(2)
+    )
+
+    low, high = np.minimum(parents_1, parents_2), np.maximum(parents_1, parents_2)
+    distance = high - low
+    assert np.all(children >= low - alpha * distance)
+    assert np.all(children <= high + alpha * distance)
+    assert_mean_is_midpoint(parents_1, parents_2, children, 0.3 * (1 + 2 * alpha))
+
+    # same values as the formula
+    u = np.random.default_rng(2).random(parents_1.shape) * (1 + 2 * alpha) - alpha
+    np.testing.assert_allclose(children, parents_2 + u * (parents_1 - parents_2))
+
+
+def test_blend_reuses_buffer(parents):
+    parents_1, parents_2 = parents
+    crossover = BlendCrossover()
+    out = np.empty_like(parents_1)
+    assert crossover.recombine_batch(parents_1, parents_2, out=out) is out
+    buffer = crossover._difference
+    crossover.recombine_batch(parents_1, parents_2, out=out)
+    assert crossover._difference is buffer
+
+    single = crossover.recombine_batch(
+        parents_1[:5].astype(np.float32), parents_2[:5].astype(np.float32)
+    )
+    assert single.dtype == np.float32
+    assert crossover._difference.shape == (5, DIMENSIONS)
+
+
+@pytest.mark.parametrize("eta", [0, 2, 15])
+def test_simulated_binary(parents, eta):
+    parents_1, parents_2 = parents
+    children = SimulatedBinaryCrossover(eta).recombine_batch(
+        parents_1, parents_2, rng=np.random.default_rng(3)
+    )
+
+    # spread factor beta <= 1 (child between the parents) with probability 0.5
+    low, high = np.minimum(parents_1, parents_2), np.maximum(parents_1, parents_2)
+    inside = np.mean((children >= low) & (children <= high))
+    assert inside == pytest.approx(0.5, abs=0.01)
+    # children are symmetric around the midpoint
+    offsets = (children - (parents_1 + parents_2) / 2) / np.abs(parents_1 - parents_2)
+    assert np.mean(offsets > 0) == pytest.approx(0.5, abs=0.01)
+    quantiles = [0.1, 0.25, 0.4]
+    np.testing.assert_allclose(
+        np.quantile(offsets, quantiles),
+        -np.quantile(offsets, [1 - q for q in quantiles]),
+        rtol=0.05,
+    )
+
+
+def test_simulated_binary_children_approach_parents(parents):
+    parents_1, parents_2 = parents
+    distances = []
+    for eta in [1, 15, 100]:
+        children = SimulatedBinaryCrossover(eta).recombine_batch(
+            parents_1, parents_2, rng=np.random.default_rng(4)
+        )
+        distance = np.minimum(
+            np.abs(children - parents_1), np.abs(children - parents_2)
+        )
+        distances.append(np.median(distance / np.abs(parents_1 - parents_2)))
+    assert distances[0] > distances[1] > distances[2]
+
+
+@pytest.mark.parametrize(
+    "crossover",
+    [ArithmeticCrossover(), BlendCrossover(), SimulatedBinaryCrossover()],
+    ids=lambda crossover: type(crossover).__name__,
+)
+def test_equal_parents(crossover):
+    parents = np.random.default_rng(5).uniform(-10, 10, (10, DIMENSIONS))
+    np.testing.assert_allclose(crossover.recombine_batch(parents, parents), parents)
+
+
+@pytest.mark.parametrize("crossover", [SinglePointCrossover, UniformCrossover])
+def test_children_take_coordinates_from_parents(crossover, parents):
+    parents_1, parents_2 = parents
+    children = crossover.recombine_batch(
+        parents_1, parents_2, rng=np.random.default_rng(6)
+    )
+    from_first = children == parents_1
+    assert np.all(from_first | (children == parents_2))
+    if crossover is SinglePointCrossover:
+        # coordinates before the cut point come from the first parent
+        assert np.all(from_first[:, 1:] <= from_first[:, :-1])
+    else:
+        assert np.mean(from_first) == pytest.approx(0.5, abs=0.01)
+
+
+@pytest.mark.parametrize("crossover", [SinglePointCrossover, UniformCrossover])
+def test_recombine_is_static(crossover):
+    # the original API passed the class itself, instances work the same way
+    parent_1 = Individual(np.zeros(DIMENSIONS), None)
+    parent_2 = Individual(np.ones(DIMENSIONS), None)
+    for child in (
+        crossover.recombine(parent_1, parent_2),
+        crossover().recombine(parent_1, parent_2),
+    ):
+        assert child.coordinates.shape == (DIMENSIONS,)
+        assert np.all((child.coordinates == 0) | (child.coordinates == 1))
+
+
+@pytest.mark.parametrize(
+    "crossover",
+    [ArithmeticCrossover(0.5), BlendCrossover(), SimulatedBinaryCrossover()],
+    ids=lambda crossover: type(crossover).__name__,
+)
+def test_recombine_single_pair(crossover):
+    parent_1 = Individual(np.full(DIMENSIONS, 2.0), 1.0)
+    parent_2 = Individual(np.full(DIMENSIONS, 2.0), 3.0)
+    child = crossover.recombine(parent_1, parent_2)
+    assert child.fitness is None
+    np.testing.assert_allclose(child.coordinates, parent_1.coordinates)
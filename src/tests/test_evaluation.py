@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+from cec2017.functions import f1
+from cellular_algorithm import CellularEvolutionaryAlgorithm, CompactNeighborhood
+from cellular_algorithm import GaussianMutation, TournamentSelection, UniformCrossover
+from cellular_algorithm import ReplaceIfBetterSuccession
+from cellular_algorithm.evaluation import (
+    ProcessPoolEvaluator,
+    SerialEvaluator,
+    ThreadPoolEvaluator,
+    create_evaluator,
+)
+
+
+def sphere(x):
+    return float(np.sum(x * x))
+
+
+def sphere_batch(x):
+    return np.sum(x * x, axis=-1)
+
+
+COORDINATES = np.random.default_rng(0).uniform(-100, 100, (23, 10))
+
+
+@pytest.mark.parametrize(
+    "function, batch_function", [(sphere, False), (sphere_batch, True), (f1, True)]
+)
+@pytest.mark.parametrize("evaluator_class", [ThreadPoolEvaluator, ProcessPoolEvaluator])
+@pytest.mark.parametrize("chunk_size", [None, 1, 5, 100])
+def test_pool_matches_serial(evaluator_class, function, batch_function, chunk_size):
+    expected = SerialEvaluator(function, batch_function).evaluate(COORDINATES)
+    evaluator = evaluator_class(function, batch_function, chunk_size, workers=2)
+    try:
+        # batches of different sizes may differ by rounding (cec2017)
+        np.testing.assert_allclose(evaluator.evaluate(COORDINATES), expected, rtol=1e-12)
+        # the pool is reused by the next evaluation
+        pool = evaluator._pool
+        values = evaluator.evaluate(COORDINATES[:3])
+        np.testing.assert_allclose(values, expected[:3], rtol=1e-12)
+        assert evaluator._pool is pool
+    finally:
+        evaluator.close()
+    assert evaluator._pool is None
+
+
+def test_serial_evaluates_rows():
+    values = SerialEvaluator(sphere).evaluate(COORDINATES)
+    np.testing.assert_array_equal(values, [sphere(row) for row in COORDINATES])
+
+
+def test_pool_evaluates_empty_matrix():
+    evaluator = ThreadPoolEvaluator(sphere_batch, True, workers=2)
+    try:
+        assert evaluator.evaluate(np.empty((0, 10))).shape == (0,)
+    finally:
+        evaluator.close()
+
+
+@pytest.mark.parametrize(
+    "chunk_size, workers, sizes",
+    [
+        (None, 2, [12, 11]),
+        (None, 4, [6, 6, 6, 5]),
+        (None, 50, [1] * 23),
+        (5, 2, [5, 5, 5, 5, 3]),
+        (30, 2, [23]),
+    ],
+)
+def test_split(chunk_size, workers, sizes):
+    evaluator = ThreadPoolEvaluator(sphere, chunk_size=chunk_size, workers=workers)
+    chunks = evaluator.split(COORDINATES)
+    assert [len(chunk) for chunk in chunks] == sizes
+    np.testing.assert_array_equal(np.concatenate(chunks), COORDINATES)
+
+
+def test_create_evaluator():
+    assert isinstance(create_evaluator("serial", sphere), SerialEvaluator)
+    evaluator = create_evaluator("process", sphere, True, chunk_size=3, workers=2)
+    assert isinstance(evaluator, ProcessPoolEvaluator)
+    assert (evaluator.batch_function, evaluator.chunk_size, evaluator.workers) == (
+        True,
+        3,
+        2,
+    )
+    # evaluators are returned as they are
+    assert create_evaluator(evaluator, sphere) is evaluator
+
+
+def test_create_evaluator_rejects_unknown_executor():
+    with pytest.raises(ValueError, match="Executor has to be one of"):
+        create_evaluator("gpu", sphere)
+
+
+def create_evolution(**kwargs):
+    return CellularEvolutionaryAlgorithm(
+        CompactNeighborhood(1),
+        crossover=UniformCrossover(),
+        mutation=GaussianMutation(scale=1),
+        selection=TournamentSelection(2),
+        succession=ReplaceIfBetterSuccession(),
+        boundaries=((-100, 100),) * 10,
+        function=sphere_batch,
+        maximize=False,
+        population_shape=(4, 4),
+        batch_function=True,
+        vectorized=True,
+        iterations=2,
+        seed=0,
+        **kwargs,
+    )
+
+
+def test_pool_is_kept_between_runs():
+    with create_evolution(executor="process", workers=2) as evolution:
+        evolution.run()
+        pool = evolution.evaluator._pool
+        assert pool is not None
+        evolution.run()
+        assert evolution.evaluator._pool is pool
+    assert evolution.evaluator._pool is None
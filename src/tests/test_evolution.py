@@ -0,0 +1,148 @@
+import numpy as np
+import pytest
+
+from cellular_algorithm import (
+    CellularEvolutionaryAlgorithm,
+    CompactNeighborhood,
+    GaussianMutation,
+    ReplaceIfBetterSuccession,
+    TournamentSelection,
+    UniformCrossover,
+)
+
+SHAPE = (5, 6)
+CELLS = 30
+
+
+def sphere(x):
+    return np.sum(x * x, axis=-1)
+
+
+def create_cea(function=sphere, **kwargs):
+    options = dict(
+        crossover=UniformCrossover(),
+        mutation=GaussianMutation(scale=5),
+        selection=TournamentSelection(2),
+        succession=ReplaceIfBetterSuccession(),
+        boundaries=((-100, 100),) * 4,
+        function=function,
+        maximize=False,
+        mutation_probability=0.5,
+        population_shape=SHAPE,
+        batch_function=True,
+        iterations=5,
+        seed=0,
+    )
+    options.update(kwargs)
+    return CellularEvolutionaryAlgorithm(CompactNeighborhood(1), **options)
+
+
+class CountingFunction:
+    # records the number of evaluated rows (in the current process only)
+    def __init__(self):
+        self.rows = 0
+
+    def __call__(self, x):
+        self.rows += len(x)
+        return sphere(x)
+
+
+def test_line_sweep_updates_cells_in_order():
+    evolution = create_cea(update_policy="line_sweep")
+    assert list(evolution.get_update_order()) == list(range(CELLS))
+
+
+def test_fixed_random_sweep_keeps_its_order():
+    evolution = create_cea(update_policy="fixed_random_sweep")
+    order = list(evolution.get_update_order())
+    assert sorted(order) == list(range(CELLS))
+    assert order != list(range(CELLS))
+    evolution.run_single_iteration()
+    assert list(evolution.get_update_order()) == order
+
+
+def test_new_random_sweep_draws_new_order():
+    evolution = create_cea(update_policy="new_random_sweep")
+    orders = [tuple(evolution.get_update_order()) for _ in range(5)]
+    for order in orders:
+        assert sorted(order) == list(range(CELLS))
+    assert len(set(orders)) == len(orders)
+
+
+def test_uniform_choice_draws_cells_with_replacement():
+    evolution = create_cea(update_policy="uniform_choice")
+    order = np.asarray(evolution.get_update_order())
+    assert len(order) == CELLS
+    assert np.all((order >= 0) & (order < CELLS))
+
+
+@pytest.mark.parametrize(
+    "update_policy",
+    ["line_sweep", "fixed_random_sweep", "new_random_sweep", "uniform_choice"],
+)
+def test_asynchronous_generation_evaluates_each_step_in_process(update_policy):
+    function = CountingFunction()
+    evolution = create_cea(function, update_policy=update_policy, executor="process")
+    with evolution:
+        # initial population is evaluated by the pool, offsprings of the cells in
+        # the current process - one row per update step
+        initial = function.rows
+        evolution.run_single_iteration()
+    assert function.rows - initial == CELLS
+    np.testing.assert_array_equal(
+        evolution.population.fitness, sphere(evolution.population.coordinates)
+    )
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_generations_keep_population_valid(vectorized):
+    evolution = create_cea(vectorized=vectorized, iterations=1)
+    low, high = -100, 100
+    best = [evolution.population.fitness.min()]
+    best_offspring = np.inf
+    for _ in range(15):
+        evolution.run_single_iteration()
+        population = evolution.population
+        assert population.coordinates.shape == (CELLS, 4)
+        assert np.all((population.coordinates >= low) & (population.coordinates <= high))
+        np.testing.assert_allclose(population.fitness, sphere(population.coordinates))
+        best.append(population.fitness.min())
+        # best solution is the best offspring found so far
+        best_offspring = min(best_offspring, evolution.offsprings.fitness.min())
+        assert evolution.best_solution.fitness == best_offspring
+
+    # ReplaceIfBetterSuccession is elitist - cells never get worse
+    assert all(later <= earlier for earlier, later in zip(best, best[1:]))
+    assert best[-1] < best[0]
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_cells_never_get_worse_with_elitist_succession(vectorized):
+    evolution = create_cea(vectorized=vectorized)
+    for _ in range(5):
+        fitness = evolution.population.fitness.copy()
+        evolution.run_single_iteration()
+        assert np.all(evolution.population.fitness <= fitness)
+
+
+@pytest.mark.parametrize(
+    "options", [{"vectorized": True}, {"update_policy": "line_sweep"}]
+)
+def test_batch_crossovers_need_two_parents(options):
+    with pytest.raises(ValueError, match="parents_num=2"):
+        create_cea(parents_num=3, **options)
+
+
+@pytest.mark.parametrize("maximize", [False, True])
+def test_insert_more_individuals_than_cells_keeps_best(maximize):
+    evolution = create_cea(maximize=maximize)
+    rng = np.random.default_rng(1)
+    coordinates = rng.uniform(-1, 1, (3 * CELLS, 4))
+    fitness = sphere(coordinates)
+
+    evolution.insert_individuals(coordinates, fitness)
+
+    order = np.sort(fitness)
+    expected = order[-CELLS:] if maximize else order[:CELLS]
+    inserted = np.sort(evolution.population.fitness.ravel())
+    np.testing.assert_array_equal(inserted, expected)
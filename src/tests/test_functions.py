@@ -0,0 +1,35 @@
+# Tests of evaluating (n, D) matrices with cec2017 functions f1 - f30
+
+import numpy as np
+import pytest
+
+from cec2017.functions import all_functions
+
+# dimensions of the official data; functions which need shuffle data (f11 - f20,
+# f29, f30) are defined only for some of them
+DIMENSIONS = [2, 10, 20, 30, 50, 100]
+SHUFFLED_DIMENSIONS = [10, 30, 50, 100]
+SHUFFLED = {f"f{i}" for i in [*range(11, 21), 29, 30]}
+
+
+def official_cases():
+    # every function with every dimension of the official data
+    cases = []
+    for function in all_functions:
+        if function.__name__ in SHUFFLED:
+            dimensions = SHUFFLED_DIMENSIONS
+        else:
+            dimensions = DIMENSIONS
+        for dimension in dimensions:
+            case_id = f"{function.__name__}-D{dimension}"
+            cases.append(pytest.param(function, dimension, id=case_id))
+    return cases
+
+
+@pytest.mark.parametrize("function, dimension", official_cases())
+def test_batch_matches_single_vectors(function, dimension):
+    X = np.random.default_rng(dimension).uniform(-100, 100, (8, dimension))
+
+    values = function(X)
+    assert values.shape == (len(X),)
+    np.testing.assert_allclose(values, [function(x) for x in X], rtol=1e-12)
@@ -0,0 +1,94 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+from cellular_algorithm import (
+    CellularEvolutionaryAlgorithm,
+    CompactNeighborhood,
+    GaussianMutation,
+    IslandModel,
+    ReplaceIfBetterSuccession,
+    TournamentSelection,
+    UniformCrossover,
+)
+
+
+def sphere(x):
+    return np.sum(x * x, axis=-1)
+
+
+def create_island(shape):
+    return CellularEvolutionaryAlgorithm(
+        CompactNeighborhood(1),
+        crossover=UniformCrossover(),
+        mutation=GaussianMutation(scale=5),
+        selection=TournamentSelection(2),
+        succession=ReplaceIfBetterSuccession(),
+        boundaries=((-100, 100),) * 3,
+        function=sphere,
+        maximize=False,
+        mutation_probability=0.5,
+        population_shape=shape,
+        batch_function=True,
+        vectorized=True,
+    )
+
+
+def failing_island():
+    raise RuntimeError("island failed")
+
+
+def create_model(topology="ring", shapes=((4, 4), (4, 4), (3, 3)), **kwargs):
+    factories = [partial(create_island, shape) for shape in shapes]
+    return IslandModel(factories, migration_interval=3, topology=topology, **kwargs)
+
+
+@pytest.mark.parametrize("topology", ["ring", "star", "fully_connected"])
+def test_run_returns_best_island(topology):
+    result = create_model(topology, migrants=2, seed=1).run(10)
+
+    assert len(result["islands"]) == 3
+    fitness = [island["best_fitness"] for island in result["islands"]]
+    assert result["best_island"] == int(np.argmin(fitness))
+    assert result["best_fitness"] == min(fitness)
+    assert sphere(result["best_coordinates"]) == pytest.approx(result["best_fitness"])
+    for island, shape in zip(result["islands"], [(4, 4), (4, 4), (3, 3)]):
+        assert island["population_coordinates"].shape == (np.prod(shape), 3)
+        assert island["best_fitness"] <= island["population_fitness"].min()
+
+
+def test_run_is_reproducible_with_seed():
+    first = create_model(seed=3).run(7)
+    second = create_model(seed=3).run(7)
+    assert first["best_fitness"] == second["best_fitness"]
+    for island, other in zip(first["islands"], second["islands"]):
+        np.testing.assert_array_equal(
+            island["population_coordinates"], other["population_coordinates"]
+        )
+
+
+def test_more_immigrants_than_cells():
+    # the centre of the star receives 5 * 3 migrants on a grid of 4 cells
+    model = create_model("star", shapes=[(2, 2)] * 4, migrants=5, seed=0)
+    result = model.run(6)
+    assert len(result["islands"]) == 4
+
+
+def test_run_without_generations_returns_initial_population():
+    result = create_model(seed=0).run(0)
+    for island in result["islands"]:
+        assert island["best_fitness"] == island["population_fitness"].min()
+
+
+def test_negative_generations_are_rejected():
+    with pytest.raises(ValueError):
+        create_model().run(-1)
+
+
+def test_failing_island_does_not_block():
+    # the only other open end of the pipe belonged to the failed island, so the
+    # main process gets an error instead of waiting forever
+    factories = [partial(create_island, (3, 3)), failing_island]
+    with pytest.raises((EOFError, ConnectionError)):
+        IslandModel(factories, migration_interval=2).run(4)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from cellular_algorithm import (
+    BestFitness,
+    Diversity,
+    MaxFitness,
+    MinFitness,
+    StatisticsCollector,
+    TraceRecorder,
+    WorstFitness,
+)
+from cellular_algorithm.utils import summary
+from test_evolution import create_cea, sphere
+
+
+def negative_sphere(x):
+    return -sphere(x)
+
+
+@pytest.mark.parametrize("every", [1, 3])
+@pytest.mark.parametrize("maximize", [False, True])
+def test_statistics_match_summary(maximize, every):
+    function = negative_sphere if maximize else sphere
+    evolution = create_cea(function=function, maximize=maximize, iterations=10)
+    trace = TraceRecorder(every=every)
+    statistics = StatisticsCollector(every=every)
+
+    evolution.run(trace=trace, statistics=statistics)
+
+    expected = summary(trace)
+    results = statistics.results
+    assert results["generation"].tolist() == expected["generation"]
+    for name in ["max_fitness", "min_fitness", "mean_fitness"]:
+        np.testing.assert_allclose(results[name], expected[name], rtol=1e-12)
+    best = results["max_fitness"] if maximize else results["min_fitness"]
+    np.testing.assert_array_equal(results["best_fitness"], best)
+
+
+def test_metrics_of_population():
+    evolution = create_cea(iterations=0)
+    statistics = StatisticsCollector(
+        [MaxFitness(), MinFitness(), BestFitness(), WorstFitness(), Diversity()]
+    )
+    evolution.run(statistics=statistics)
+
+    population = evolution.population
+    results = statistics.results
+    assert results["max_fitness"][0] == results["worst_fitness"][0]
+    assert results["min_fitness"][0] == results["best_fitness"][0]
+    assert results["min_fitness"][0] == population.fitness.min()
+    centroid = population.coordinates.mean(axis=0)
+    distances = np.linalg.norm(population.coordinates - centroid, axis=1)
+    assert results["diversity"][0] == pytest.approx(distances.mean())
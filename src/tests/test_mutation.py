@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from cellular_algorithm import GaussianMutation, Individual
+from cellular_algorithm.mutation import Mutation
+
+ROWS = 5000
+DIMENSIONS = 8
+
+
+@pytest.fixture
+def coordinates():
+    return np.random.default_rng(0).uniform(-10, 10, (ROWS, DIMENSIONS))
+
+
+@pytest.mark.parametrize("gene_probability", [None, 0, 0.2, 1])
+def test_only_masked_genes_change(coordinates, gene_probability):
+    rng = np.random.default_rng(1)
+    mask = rng.random(ROWS) < 0.3
+    mutated = coordinates.copy()
+    mutation = GaussianMutation(scale=2, gene_probability=gene_probability)
+
+    assert mutation.mutate_batch(mutated, mask, rng=rng) is mutated
+
+    changed = mutated != coordinates
+    assert not changed[~mask].any()
+    expected = 1 if gene_probability is None else gene_probability
+    assert changed[mask].mean() == pytest.approx(expected, abs=0.01)
+    noise = (mutated - coordinates)[changed]
+    if len(noise):
+        assert noise.mean() == pytest.approx(0, abs=0.05)
+        assert noise.std() == pytest.approx(2, rel=0.03)
+
+
+def test_gene_mask_matches_draws(coordinates):
+    # the same draws decide which genes of the selected rows are mutated
+    mask = np.zeros(ROWS, dtype=bool)
+    mask[::2] = True
+    mutated = coordinates.copy()
+    GaussianMutation(scale=1, gene_probability=0.5).mutate_batch(
+        mutated, mask, rng=np.random.default_rng(2)
+    )
+
+    rng = np.random.default_rng(2)
+    noise = rng.standard_normal(coordinates.shape)
+    genes = (rng.random(coordinates.shape) < 0.5) & mask[:, np.newaxis]
+    np.testing.assert_array_equal(mutated, np.where(genes, coordinates + noise, coordinates))
+
+
+def test_mutate_all_rows(coordinates):
+    mutated = GaussianMutation(scale=1).mutate_batch(coordinates.copy())
+    assert np.all(mutated != coordinates)
+
+
+def test_buffers_follow_dtype(coordinates):
+    mutation = GaussianMutation(scale=1, gene_probability=0.5)
+    mutation.mutate_batch(coordinates.copy())
+    single = coordinates[:10].astype(np.float32)
+    assert mutation.mutate_batch(single).dtype == np.float32
+    assert mutation._noise.shape == single.shape
+    assert mutation._noise.dtype == np.float32
+
+
+@pytest.mark.parametrize("gene_probability", [None, 0])
+def test_mutate_single_individual(gene_probability):
+    np.random.seed(0)
+    individual = Individual(np.zeros(DIMENSIONS), None)
+    mutated = GaussianMutation(scale=1, gene_probability=gene_probability).mutate(
+        individual
+    )
+    assert np.all(mutated.coordinates != 0) == (gene_probability is None)
+    assert np.all(mutated.coordinates == 0) == (gene_probability == 0)
+
+
+class ConstantMutation(Mutation):
+    @staticmethod
+    def mutate(individual):
+        individual.coordinates += 1
+        return individual
+
+
+def test_default_batch_calls_mutate(coordinates):
+    mask = np.arange(ROWS) % 3 == 0
+    mutated = ConstantMutation().mutate_batch(coordinates.copy(), mask)
+    np.testing.assert_array_equal(mutated[mask], coordinates[mask] + 1)
+    np.testing.assert_array_equal(mutated[~mask], coordinates[~mask])
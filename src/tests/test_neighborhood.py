@@ -0,0 +1,122 @@
+from itertools import product
+
+import numpy as np
+import pytest
+
+from cellular_algorithm import (
+    CompactNeighborhood,
+    LinearNeighborhood,
+    Neighborhood,
+)
+
+SHAPES = [(1, 7), (5, 4), (6, 6), (3, 4, 5)]
+
+
+def linear_neighbours(grid_shape, idx, distance):
+    # get_neighbours of the original LinearNeighborhood (clipped grid)
+    result = []
+    for axis, position in enumerate(idx):
+        first = max(position - distance, 0)
+        last = min(position + distance + 1, grid_shape[axis])
+        for neighbour_position in range(first, last):
+            neighbour = list(idx)
+            neighbour[axis] = neighbour_position
+            result.append(tuple(neighbour))
+    return result
+
+
+def compact_neighbours(grid_shape, idx, distance):
+    # get_neighbours of the original CompactNeighborhood (clipped grid)
+    ranges = [
+        range(max(position - distance, 0), min(position + distance + 1, size))
+        for position, size in zip(idx, grid_shape)
+    ]
+    return list(product(*ranges))
+
+
+def toroidal_neighbours(offsets, grid_shape, idx):
+    return [
+        tuple((pos + shift) % size for pos, shift, size in zip(idx, offset, grid_shape))
+        for offset in offsets
+    ]
+
+
+def expected_neighbours(neighbourhood, grid_shape, idx):
+    distance = neighbourhood.distance
+    if neighbourhood.toroidal:
+        offsets = neighbourhood.get_offsets(len(grid_shape), distance)
+        return toroidal_neighbours(offsets, grid_shape, idx)
+    if isinstance(neighbourhood, LinearNeighborhood):
+        return linear_neighbours(grid_shape, idx, distance)
+    return compact_neighbours(grid_shape, idx, distance)
+
+
+def assert_table_matches(neighbourhood, grid_shape, expected):
+    table, sizes = neighbourhood.get_index_table(grid_shape)
+    assert len(table) == len(sizes) == np.prod(grid_shape)
+    for index, idx in enumerate(np.ndindex(*grid_shape)):
+        neighbours = expected(grid_shape, idx)
+        flat = [np.ravel_multi_index(position, grid_shape) for position in neighbours]
+        assert sizes[index] == len(neighbours)
+        assert list(table[index, : sizes[index]]) == flat
+        # padding repeats the cell's own index
+        assert np.all(table[index, sizes[index] :] == index)
+
+
+@pytest.mark.parametrize("toroidal", [False, True])
+@pytest.mark.parametrize("distance", [1, 2])
+@pytest.mark.parametrize("neighbourhood_class", [LinearNeighborhood, CompactNeighborhood])
+@pytest.mark.parametrize("grid_shape", SHAPES, ids=str)
+def test_index_table_matches_neighbours(
+    neighbourhood_class, distance, toroidal, grid_shape
+):
+    neighbourhood = neighbourhood_class(distance, toroidal=toroidal)
+
+    def expected(shape, idx):
+        return expected_neighbours(neighbourhood, shape, idx)
+
+    assert_table_matches(neighbourhood, grid_shape, expected)
+    # get_neighbours agrees with the original implementation too
+    for idx in np.ndindex(*grid_shape):
+        assert neighbourhood.get_neighbours(grid_shape, idx) == expected(grid_shape, idx)
+
+
+@pytest.mark.parametrize("grid_shape", SHAPES, ids=str)
+def test_toroidal_rows_are_full(grid_shape):
+    table, sizes = CompactNeighborhood(1, toroidal=True).get_index_table(grid_shape)
+    assert np.all(sizes == table.shape[1])
+
+
+def test_index_table_is_cached_and_read_only():
+    neighbourhood = LinearNeighborhood(1)
+    table, sizes = neighbourhood.get_index_table((4, 4))
+    assert LinearNeighborhood(1).get_index_table((4, 4))[0] is table
+    with pytest.raises(ValueError):
+        table[0, 0] = 1
+    with pytest.raises(ValueError):
+        sizes[0] = 1
+
+
+class NeighboursOnly(Neighborhood):
+    # neighbourhood written against the original API - only get_neighbours
+    def get_neighbours(self, grid_shape, idx):
+        return compact_neighbours(grid_shape, idx, self.distance)
+
+
+@pytest.mark.parametrize("distance", [1, 2])
+@pytest.mark.parametrize("grid_shape", SHAPES, ids=str)
+def test_index_table_from_get_neighbours(distance, grid_shape):
+    neighbourhood = NeighboursOnly(distance)
+
+    def expected(shape, idx):
+        return compact_neighbours(shape, idx, distance)
+
+    assert_table_matches(neighbourhood, grid_shape, expected)
+    assert neighbourhood.get_index_table(grid_shape) is neighbourhood.get_index_table(
+        grid_shape
+    )
+
+
+def test_neighbourhood_is_abstract():
+    with pytest.raises(TypeError):
+        Neighborhood(1)
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from cellular_algorithm import Individual, Population
+
+SHAPE = (3, 4)
+BOUNDARIES = ((-10, 10), (0, 20), (5, 6))
+
+
+def sphere(x):
+    return np.sum(np.asarray(x) ** 2, axis=-1)
+
+
+def random_individuals(seed=0, size=12, dimensions=3):
+    rng = np.random.default_rng(seed)
+    return [
+        Individual(coordinates=rng.uniform(-1, 1, dimensions), fitness=rng.normal())
+        for _ in range(size)
+    ]
+
+
+def test_round_trip():
+    individuals = random_individuals()
+    population = Population(SHAPE)
+    population.set_all_individuals(individuals)
+
+    assert population.dimensions == 3
+    assert population.coordinates_grid.shape == (3, 4, 3)
+    assert population.fitness_grid.shape == SHAPE
+    assert np.all(population.evaluated)
+    for index, (position, individual) in enumerate(population.iterate_individuals()):
+        assert position == population.grid_position(index)
+        assert population.flat_index(position) == index
+        np.testing.assert_array_equal(
+            individual.coordinates, individuals[index].coordinates
+        )
+        assert individual.fitness == individuals[index].fitness
+        np.testing.assert_array_equal(
+            population.coordinates_grid[position], individual.coordinates
+        )
+
+    grid = population.grid
+    assert grid.shape == SHAPE
+    assert grid[1, 2].fitness == individuals[6].fitness
+    taken = population.get_individuals([(0, 1), (2, 3)])
+    assert [individual.fitness for individual in taken] == [
+        individuals[1].fitness,
+        individuals[11].fitness,
+    ]
+
+
+def test_individuals_are_copies():
+    population = Population(SHAPE)
+    population.set_all_individuals(random_individuals())
+    coordinates = population.coordinates.copy()
+
+    individual = population.get_individual(5)
+    individual.coordinates[:] = 100
+    individual.fitness = 100
+    population.grid[0, 0].coordinates[:] = 100
+
+    np.testing.assert_array_equal(population.coordinates, coordinates)
+    assert population.fitness[5] != 100
+
+
+def test_nan_fitness_is_valid_fitness():
+    population = Population(SHAPE, dimensions=3)
+    assert not np.any(population.evaluated)
+    assert population.get_individual(0).fitness is None
+
+    population.set_individual(Individual(np.zeros(3), np.nan), (0, 0))
+    population.set_fitness(np.nan, 1)
+    for index in (0, 1):
+        assert population.evaluated[index]
+        assert np.isnan(population.get_individual(index).fitness)
+
+    population.set_individual(Individual(np.zeros(3), None), (0, 0))
+    assert not population.evaluated[0]
+    assert population.get_individual(0).fitness is None
+
+
+def test_replace():
+    population = Population(SHAPE)
+    population.set_all_individuals(random_individuals(0))
+    other = Population(SHAPE, dimensions=3)
+    other.coordinates[:] = np.arange(36).reshape(12, 3)
+    other.set_fitness(np.arange(6), np.arange(6))
+    mask = np.zeros(12, dtype=bool)
+    mask[[0, 3, 8]] = True
+    coordinates = population.coordinates.copy()
+    fitness = population.fitness.copy()
+
+    population.replace(other, mask)
+
+    np.testing.assert_array_equal(population.coordinates[mask], other.coordinates[mask])
+    np.testing.assert_array_equal(population.coordinates[~mask], coordinates[~mask])
+    np.testing.assert_array_equal(population.fitness[[0, 3]], [0, 3])
+    np.testing.assert_array_equal(population.fitness[~mask], fitness[~mask])
+    # cell 8 of `other` has not been evaluated
+    assert population.get_individual(8).fitness is None
+    assert np.sum(population.evaluated) == 11
+
+
+@pytest.mark.parametrize("shape", [SHAPE, (2, 2, 2, 2), (5,)])
+def test_generate_individuals(shape):
+    np.random.seed(0)
+    batch = Population(shape)
+    batch.generate_individuals(BOUNDARIES, sphere, batch_function=True)
+    np.random.seed(0)
+    single = Population(shape)
+    single.generate_individuals(BOUNDARIES, sphere)
+
+    np.testing.assert_array_equal(batch.coordinates, single.coordinates)
+    np.testing.assert_allclose(batch.fitness, single.fitness, rtol=1e-12)
+    np.testing.assert_allclose(batch.fitness, sphere(batch.coordinates))
+    assert np.all(batch.evaluated)
+
+    low, high = np.min(BOUNDARIES, axis=1), np.max(BOUNDARIES, axis=1)
+    assert np.all((batch.coordinates >= low) & (batch.coordinates <= high))
+    # each cell is inside its own part of the grid
+    axes = min(len(shape), len(BOUNDARIES))
+    steps = (high[:axes] - low[:axes]) / np.array(shape[:axes])
+    for index in range(batch.size):
+        position = np.array(batch.grid_position(index)[:axes])
+        part = (batch.coordinates[index, :axes] - low[:axes]) // steps
+        np.testing.assert_array_equal(part, position)
+
+
+def test_float32_population():
+    population = Population(SHAPE, dtype=np.float32)
+    population.generate_individuals(BOUNDARIES, sphere, batch_function=True)
+    assert population.coordinates.dtype == population.fitness.dtype == np.float32
@@ -0,0 +1,119 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from cec2017 import transforms
+from cec2017.functions import all_functions
+from cec2017.problem import Problem
+from cec2017.utils import dtype_errors
+
+FUNCTION_IDS = range(1, 31)
+# 10 - official data, 15 - generated transforms
+DIMENSIONS = [10, 15]
+
+
+@pytest.fixture(autouse=True, scope="module")
+def generated_dir(tmp_path_factory):
+    # generated transforms are cached in a temporary directory
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        path = tmp_path_factory.mktemp("generated")
+        monkeypatch.setattr(transforms, "GENERATED_DIR", str(path))
+        yield path
+
+
+@pytest.mark.parametrize("dimension", DIMENSIONS)
+@pytest.mark.parametrize("function_id", FUNCTION_IDS)
+def test_attributes(function_id, dimension):
+    problem = Problem(function_id, dimension)
+    assert problem.function is all_functions[function_id - 1]
+    assert problem.__name__ == f"f{function_id}"
+    assert problem.bounds == ((-100.0, 100.0),) * dimension
+    assert problem.bias == 100.0 * function_id
+    assert problem.optimum.shape == (dimension,)
+    assert np.all(np.abs(problem.optimum) <= 100)
+
+
+@pytest.mark.parametrize("dimension", DIMENSIONS)
+@pytest.mark.parametrize("function_id", FUNCTION_IDS)
+def test_value_at_optimum(function_id, dimension):
+    problem = Problem(function_id, dimension)
+    # compositions divide by the distance to the optimum, so they are
+    # evaluated next to it
+    optimum = problem.optimum + (1e-9 if function_id > 20 else 0)
+    value = problem(optimum)
+
+    X = np.random.default_rng(function_id).uniform(-100, 100, (50, dimension))
+    assert value < problem.evaluate(X).min()
+    if function_id != 9:
+        # levy of the original implementation is not 0 in the optimum
+        assert value == pytest.approx(problem.bias, rel=1e-3)
+
+
+@pytest.mark.parametrize("dimension", DIMENSIONS)
+@pytest.mark.parametrize("function_id", FUNCTION_IDS)
+def test_call_matches_evaluate(function_id, dimension):
+    problem = Problem(function_id, dimension)
+    X = np.random.default_rng(dimension).uniform(-100, 100, (6, dimension))
+
+    values = problem.evaluate(X)
+    assert values.shape == (6,)
+    np.testing.assert_allclose(values, problem(X), rtol=1e-12)
+    np.testing.assert_allclose(values, [problem(x) for x in X], rtol=1e-12)
+    np.testing.assert_allclose(values, problem.evaluate(X.tolist()), rtol=1e-12)
+
+
+@pytest.mark.parametrize("shape", [(10,), (3, 9), (3, 11), (2, 3, 10)])
+def test_evaluate_needs_matrix(shape):
+    with pytest.raises(ValueError):
+        Problem(1, 10).evaluate(np.zeros(shape))
+
+
+@pytest.mark.parametrize("function_id", [0, 31])
+def test_function_id_is_validated(function_id):
+    with pytest.raises(ValueError):
+        Problem(function_id, 10)
+
+
+@pytest.mark.parametrize(
+    "args, kwargs",
+    [
+        ((5, 10), {}),
+        ((29, 30), {}),
+        ((3, 10), {"dtype": np.float32}),
+        ((12, 15), {"seed": 2}),
+        ((7, 20), {"block_size": 4}),
+    ],
+)
+def test_pickle(args, kwargs):
+    problem = Problem(*args, **kwargs)
+    copy = pickle.loads(pickle.dumps(problem))
+    assert repr(copy) == repr(problem)
+    assert copy.dtype == problem.dtype
+    # transform data is bound again (and shared), not copied
+    assert copy._kwargs is problem._kwargs
+    X = np.random.default_rng(0).uniform(-100, 100, (4, problem.dimension))
+    np.testing.assert_array_equal(copy.evaluate(X), problem.evaluate(X))
+
+
+def test_problems_share_transforms():
+    assert Problem(4, 30)._kwargs is Problem(4, 30)._kwargs
+    assert Problem(4, 30)._kwargs is not Problem(4, 30, seed=0)._kwargs
+    assert Problem(4, 30)._kwargs is not Problem(4, 30, dtype=np.float32)._kwargs
+
+
+@pytest.mark.parametrize("function_id", [f for f in FUNCTION_IDS if f != 2])
+def test_float32_error(function_id):
+    # bounds stated in the README
+    bound = 1e-3 if function_id in (3, 8) else 1e-4
+    errors = dtype_errors([function_id], dimensions=(10, 30, 50, 100), samples=200)
+    assert max(errors.values()) < bound
+
+
+def test_float32_values():
+    problem = Problem(5, 30, dtype=np.float32)
+    X = np.random.default_rng(0).uniform(-100, 100, (4, 30))
+    assert problem.evaluate(X).dtype == np.float32
+    assert problem(X[0]).dtype == np.float32
+    assert problem._kwargs["rotation"].dtype == np.float32
+    np.testing.assert_allclose(problem.evaluate(X), Problem(5, 30).evaluate(X), rtol=1e-5)
@@ -0,0 +1,110 @@
+import json
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from cellular_algorithm import GenerationProfiler, StageTimer, save_report
+from test_evolution import create_cea
+
+
+def test_stage_timer():
+    timer = StageTimer()
+    for _ in range(3):
+        with timer.stage("a"):
+            with timer.stage("b"):
+                time.sleep(0.001)
+
+    report = timer.report()
+    assert report["a"]["calls"] == report["b"]["calls"] == 3
+    assert report["a"]["total"] >= report["b"]["total"] >= 0.003
+    assert report["b"]["mean"] == pytest.approx(report["b"]["total"] / 3)
+
+    timer.reset()
+    assert timer.report()["a"] == {"calls": 0, "total": 0.0, "mean": 0}
+
+
+def test_stage_can_not_be_reentered():
+    timer = StageTimer()
+    with timer.stage("a"):
+        with pytest.raises(RuntimeError):
+            with timer.stage("a"):
+                pass
+    assert timer.calls["a"] == 1
+
+    # stage is measured again after an exception
+    with pytest.raises(ValueError):
+        with timer.stage("a"):
+            raise ValueError
+    with timer.stage("a"):
+        pass
+    assert timer.calls["a"] == 3
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_run_times_stages(vectorized):
+    evolution = create_cea(vectorized=vectorized, iterations=3)
+    evolution.run()
+    report = evolution.timer.report()
+    assert report["generation"]["calls"] == 3
+    for stage in ["selection", "crossover", "mutation", "repair", "succession"]:
+        assert report[stage]["calls"] >= 3
+    assert report["evaluation"]["calls"] >= 4
+
+
+@pytest.mark.parametrize("tracing", [False, True])
+def test_tracemalloc_state_is_restored(tracing):
+    if tracing:
+        tracemalloc.start()
+    try:
+        profiler = GenerationProfiler([2], mode="tracemalloc", top=5)
+        evolution = create_cea(iterations=3)
+        evolution.run(profiler=profiler)
+        assert tracemalloc.is_tracing() == tracing
+    finally:
+        tracemalloc.stop()
+
+    (result,) = profiler.report()["generations"]
+    assert result["generation"] == 2
+    assert result["peak_memory"] >= result["current_memory"] > 0
+    assert 0 < len(result["allocations"]) <= 5
+
+
+def test_cprofile(tmp_path):
+    profiler = GenerationProfiler([1, 3], top=5, directory=str(tmp_path))
+    evolution = create_cea(iterations=3)
+    evolution.run(profiler=profiler)
+
+    results = profiler.report()["generations"]
+    assert [result["generation"] for result in results] == [1, 3]
+    for result in results:
+        assert 0 < len(result["functions"]) <= 5
+        assert result["total_time"] > 0
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "generation_1.prof",
+        "generation_3.prof",
+    ]
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        GenerationProfiler([1], mode="perf")
+
+
+def test_save_report(tmp_path):
+    profiler = GenerationProfiler([1])
+    evolution = create_cea(iterations=2)
+    evolution.run(profiler=profiler)
+
+    path = tmp_path / "report.json"
+    report = save_report(str(path), evolution, profiler)
+    with open(path) as file:
+        assert json.load(file) == report
+    assert report["best_fitness"] == evolution.best_solution.fitness
+    assert report["population_shape"] == list(evolution.population_shape)
+    assert report["profile"]["mode"] == "cprofile"
+    assert np.isclose(
+        report["stages"]["generation"]["total"],
+        evolution.timer.totals["generation"],
+    )
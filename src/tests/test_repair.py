@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from cellular_algorithm import ClampRepair, ReflectRepair, ResampleRepair, WrapRepair
+
+REPAIRS = [ClampRepair(), ReflectRepair(), WrapRepair(), ResampleRepair()]
+# the third column has zero width
+LOW = np.array([-5.0, 0.0, 3.0, -100.0])
+HIGH = np.array([5.0, 1.0, 3.0, 100.0])
+
+
+def random_coordinates(dtype=np.float64):
+    # most coordinates outside, some far outside (more than the range's width)
+    rng = np.random.default_rng(0)
+    coordinates = rng.uniform(-1, 2, (1000, 4)) * (HIGH - LOW + 1) * 3 + LOW
+    coordinates[:10] = (LOW + HIGH) / 2
+    return coordinates.astype(dtype)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("repair", REPAIRS, ids=lambda repair: type(repair).__name__)
+def test_repaired_coordinates_are_inside(repair, dtype):
+    coordinates = random_coordinates(dtype)
+    inside = (coordinates >= LOW) & (coordinates <= HIGH)
+    original = coordinates.copy()
+    low, high = LOW.astype(dtype), HIGH.astype(dtype)
+
+    repaired = repair.repair(coordinates, low, high, rng=np.random.default_rng(1))
+
+    assert repaired is coordinates
+    assert repaired.dtype == dtype
+    assert np.all((repaired >= low) & (repaired <= high))
+    # coordinates inside the boundaries are not modified
+    np.testing.assert_array_equal(repaired[inside], original[inside])
+    # zero-width range
+    assert np.all(repaired[:, 2] == 3)
+
+
+def test_clamp():
+    coordinates = np.array([[-7.0, 2.0, 3.5, 0.0]])
+    ClampRepair().repair(coordinates, LOW, HIGH)
+    np.testing.assert_array_equal(coordinates, [[-5, 1, 3, 0]])
+
+
+def test_reflect():
+    coordinates = np.array([[-7.0, 2.25, 2.0, 130.0], [17.0, -3.25, 3.0, -510.0]])
+    ReflectRepair().repair(coordinates, LOW, HIGH)
+    np.testing.assert_allclose(coordinates, [[-3, 0.25, 3, 70], [-3, 0.75, 3, -90]])
+
+
+def test_wrap():
+    coordinates = np.array([[-7.0, 2.25, 2.0, 130.0], [17.0, -3.25, 3.0, -510.0]])
+    WrapRepair().repair(coordinates, LOW, HIGH)
+    np.testing.assert_allclose(coordinates, [[3, 0.25, 3, -70], [-3, 0.75, 3, 90]])
+
+
+def test_resample_is_uniform():
+    coordinates = np.full((20000, 4), 1000.0)
+    ResampleRepair().repair(coordinates, LOW, HIGH, rng=np.random.default_rng(2))
+    assert np.all(coordinates[:, 2] == 3)
+    columns = [0, 1, 3]
+    scaled = (coordinates[:, columns] - LOW[columns]) / (HIGH - LOW)[columns]
+    np.testing.assert_allclose(scaled.mean(axis=0), 0.5, atol=0.01)
+    np.testing.assert_allclose(scaled.std(axis=0), 1 / np.sqrt(12), rtol=0.02)
@@ -0,0 +1,114 @@
+import random
+
+import numpy as np
+import pytest
+
+from cellular_algorithm import (
+    Individual,
+    RankSelection,
+    RouletteWheelSelection,
+    RouletteWheelSuccession,
+    TournamentSelection,
+)
+
+# rows padded like neighbourhoods of border cells - columns after `SIZES[i]`
+# are not valid candidates (and have the best fitness, so that they would win)
+FITNESS = np.array(
+    [
+        [3.0, 1.0, 4.0, 1.5, 5.0],
+        [2.0, 7.0, 1.0, -100.0, -100.0],
+        [6.0, 2.0, -100.0, -100.0, 100.0],
+    ]
+)
+SIZES = np.array([5, 3, 2])
+DRAWS = 20000
+
+
+def batch_frequencies(selection, fitness, maximize, sizes):
+    # frequencies of the columns selected by `select_batch` in each row
+    rows = np.repeat(np.arange(len(fitness)), DRAWS)
+    selected = selection.select_batch(
+        fitness[rows], maximize, 1, sizes=sizes[rows], rng=np.random.default_rng(0)
+    )[:, 0]
+    counts = np.zeros(fitness.shape)
+    np.add.at(counts, (rows, selected), 1)
+    return counts / DRAWS
+
+
+def scalar_frequencies(selection, fitness, maximize, sizes):
+    # frequencies of the columns selected by `select` from valid candidates
+    random.seed(0)
+    frequencies = np.zeros(fitness.shape)
+    for row, (row_fitness, size) in enumerate(zip(fitness, sizes)):
+        candidates = [
+            Individual(coordinates=column, fitness=value)
+            for column, value in enumerate(row_fitness[:size])
+        ]
+        for _ in range(DRAWS):
+            winner = selection.select(candidates, maximize, 1)[0]
+            frequencies[row, winner.coordinates] += 1
+    return frequencies / DRAWS
+
+
+@pytest.mark.parametrize("maximize", [False, True])
+@pytest.mark.parametrize(
+    "selection",
+    [TournamentSelection(2), TournamentSelection(3), RouletteWheelSelection()],
+    ids=["tournament2", "tournament3", "roulette"],
+)
+def test_batch_distribution_matches_select(selection, maximize):
+    fitness = np.abs(FITNESS) if maximize else FITNESS
+    batch = batch_frequencies(selection, fitness, maximize, SIZES)
+    scalar = scalar_frequencies(selection, fitness, maximize, SIZES)
+
+    padding = np.arange(fitness.shape[1]) >= SIZES[:, np.newaxis]
+    assert np.all(batch[padding] == 0)
+    np.testing.assert_allclose(batch.sum(axis=1), 1)
+    np.testing.assert_allclose(batch, scalar, atol=0.02)
+
+
+@pytest.mark.parametrize("maximize", [False, True])
+@pytest.mark.parametrize("fraction", [None, 0.4, 0.5])
+def test_rank_batch_matches_select(fraction, maximize):
+    selection = RankSelection(fraction)
+    selected = selection.select_batch(FITNESS, maximize, 2, sizes=SIZES)
+    for row, (row_fitness, size) in enumerate(zip(FITNESS, SIZES)):
+        candidates = [
+            Individual(coordinates=column, fitness=value)
+            for column, value in enumerate(row_fitness[:size])
+        ]
+        expected = [
+            individual.coordinates
+            for individual in selection.select(candidates, maximize, 2)
+        ]
+        # rows with fewer selected candidates repeat them
+        repeated = [expected[i % len(expected)] for i in range(selected.shape[1])]
+        assert list(selected[row]) == repeated
+
+
+def test_roulette_weights_when_minimizing():
+    weights = RouletteWheelSelection(offset=0.1).get_weights(
+        FITNESS[:1], False, np.ones((1, 5), dtype=bool)
+    )
+    # worst - fitness + 0.1 * (worst - best)
+    np.testing.assert_allclose(weights, [[2.4, 4.4, 1.4, 3.9, 0.4]])
+
+
+def test_roulette_can_draw_worst_candidate_when_minimizing():
+    # population is always better than offspring - the offspring still wins
+    # sometimes (weights 1.1 and 0.1)
+    population = np.zeros(DRAWS)
+    offsprings = np.ones(DRAWS)
+    replaced = RouletteWheelSuccession().replace_mask(
+        population, offsprings, False, rng=np.random.default_rng(0)
+    )
+    assert replaced.mean() == pytest.approx(0.1 / 1.2, abs=0.01)
+
+
+def test_roulette_rejects_negative_fitness_when_maximizing():
+    # padded columns are not checked
+    RouletteWheelSelection().select_batch(FITNESS, True, 1, sizes=SIZES)
+    fitness = FITNESS.copy()
+    fitness[0, 1] = -1.0
+    with pytest.raises(ValueError, match="non-negative"):
+        RouletteWheelSelection().select_batch(fitness, True, 1, sizes=SIZES)
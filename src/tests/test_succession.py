@@ -0,0 +1,113 @@
+import random
+
+import numpy as np
+import pytest
+
+from cellular_algorithm import (
+    BasicSuccession,
+    Individual,
+    RankSuccession,
+    ReplaceIfBetterSuccession,
+    ReplaceIfNotWorseSuccession,
+    RouletteWheelSuccession,
+    StochasticReplacementSuccession,
+    TournamentSuccession,
+)
+from cellular_algorithm.succession import Succession
+
+# (individual's fitness, offspring's fitness) - better, worse and equal offsprings
+PAIRS = np.array([(1.0, 2.0), (2.0, 1.0), (1.5, 1.5), (0.0, 5.0), (5.0, 0.0)])
+REPEATS = 4000
+
+
+def scalar_replace_mask(succession, population_fitness, offsprings_fitness, maximize):
+    # replacement chosen by `select` for each cell (one individual and offspring)
+    return Succession.replace_mask(
+        succession, population_fitness, offsprings_fitness, maximize
+    )
+
+
+def replace_rates(mask):
+    return mask.reshape(REPEATS, len(PAIRS)).mean(axis=0)
+
+
+@pytest.mark.parametrize("maximize", [False, True])
+@pytest.mark.parametrize(
+    "succession",
+    [
+        RankSuccession(),
+        RankSuccession(fraction=0.5),
+        BasicSuccession(),
+        ReplaceIfBetterSuccession(),
+        ReplaceIfNotWorseSuccession(),
+    ],
+    ids=lambda succession: type(succession).__name__,
+)
+def test_deterministic_mask_matches_select(succession, maximize):
+    population_fitness, offsprings_fitness = PAIRS.T
+    mask = succession.replace_mask(population_fitness, offsprings_fitness, maximize)
+    expected = scalar_replace_mask(
+        succession, population_fitness, offsprings_fitness, maximize
+    )
+    np.testing.assert_array_equal(mask, expected)
+
+
+@pytest.mark.parametrize("maximize", [False, True])
+def test_replace_if_better(maximize):
+    population_fitness, offsprings_fitness = PAIRS.T
+    better = offsprings_fitness > population_fitness
+    if not maximize:
+        better = offsprings_fitness < population_fitness
+    equal = offsprings_fitness == population_fitness
+
+    np.testing.assert_array_equal(
+        ReplaceIfBetterSuccession().replace_mask(*PAIRS.T, maximize), better
+    )
+    np.testing.assert_array_equal(
+        ReplaceIfNotWorseSuccession().replace_mask(*PAIRS.T, maximize), better | equal
+    )
+    # RankSuccession keeps the better one, individual wins ties
+    np.testing.assert_array_equal(
+        RankSuccession().replace_mask(*PAIRS.T, maximize), better
+    )
+    assert BasicSuccession().replace_mask(*PAIRS.T, maximize).all()
+
+
+@pytest.mark.parametrize("maximize", [False, True])
+@pytest.mark.parametrize(
+    "succession",
+    [TournamentSuccession(2), TournamentSuccession(3), RouletteWheelSuccession()],
+    ids=lambda succession: type(succession).__name__,
+)
+def test_random_mask_matches_select(succession, maximize):
+    population_fitness, offsprings_fitness = np.tile(PAIRS, (REPEATS, 1)).T
+
+    mask = succession.replace_mask(
+        population_fitness, offsprings_fitness, maximize, rng=np.random.default_rng(0)
+    )
+    random.seed(0)
+    expected = scalar_replace_mask(
+        succession, population_fitness, offsprings_fitness, maximize
+    )
+
+    # standard error of each rate is below 0.5 / sqrt(REPEATS) ~ 0.008
+    np.testing.assert_allclose(replace_rates(mask), replace_rates(expected), atol=0.04)
+
+
+@pytest.mark.parametrize("maximize", [False, True])
+@pytest.mark.parametrize("probability", [0, 0.3, 1])
+def test_stochastic_replacement(maximize, probability):
+    population_fitness, offsprings_fitness = np.tile(PAIRS, (REPEATS, 1)).T
+    mask = StochasticReplacementSuccession(probability).replace_mask(
+        population_fitness, offsprings_fitness, maximize, rng=np.random.default_rng(1)
+    )
+    better = ReplaceIfBetterSuccession().replace_mask(*PAIRS.T, maximize)
+    expected = np.where(better, 1, probability)
+    np.testing.assert_allclose(replace_rates(mask), expected, atol=0.04)
+
+
+def test_replacement_select_uses_mask():
+    population = [Individual(None, fitness) for fitness in [1.0, 4.0, 3.0]]
+    offsprings = [Individual(None, fitness) for fitness in [2.0, 3.0, 3.0]]
+    selected = ReplaceIfBetterSuccession().select(population, offsprings, False, 3)
+    assert list(selected) == [population[0], offsprings[1], population[2]]
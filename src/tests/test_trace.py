@@ -0,0 +1,133 @@
+import os
+import pathlib
+
+import numpy as np
+import pytest
+
+from cellular_algorithm import (
+    CellularEvolutionaryAlgorithm,
+    CompactNeighborhood,
+    FileTraceRecorder,
+    GaussianMutation,
+    ReplaceIfBetterSuccession,
+    TournamentSelection,
+    TraceFile,
+    TraceRecorder,
+    UniformCrossover,
+)
+from cellular_algorithm.utils import summary
+
+GENERATIONS = 6
+
+
+def sphere(x):
+    return np.sum(x * x, axis=-1)
+
+
+@pytest.fixture
+def evolution():
+    return CellularEvolutionaryAlgorithm(
+        CompactNeighborhood(1),
+        crossover=UniformCrossover(),
+        mutation=GaussianMutation(scale=5),
+        selection=TournamentSelection(2),
+        succession=ReplaceIfBetterSuccession(),
+        boundaries=((-100, 100),) * 3,
+        function=sphere,
+        maximize=False,
+        population_shape=(3, 4),
+        batch_function=True,
+        iterations=GENERATIONS,
+        seed=0,
+    )
+
+
+def record_run(evolution, *recorders):
+    for recorder in recorders:
+        recorder.start(evolution)
+        recorder.record(0, evolution.population)
+    for generation in range(1, GENERATIONS + 1):
+        evolution.run_single_iteration()
+        for recorder in recorders:
+            recorder.record(generation, evolution.population)
+    for recorder in recorders:
+        recorder.close()
+
+
+@pytest.mark.parametrize("every", [1, 2, 4])
+@pytest.mark.parametrize("fitness_only", [False, True])
+@pytest.mark.parametrize("chunk_frames", [1, 3])
+def test_file_matches_recorder(evolution, tmp_path, every, fitness_only, chunk_frames):
+    path = tmp_path / "trace.cea"
+    memory = TraceRecorder(every=every, fitness_only=fitness_only)
+    file = FileTraceRecorder(
+        path, every=every, fitness_only=fitness_only, chunk_frames=chunk_frames
+    )
+    record_run(evolution, memory, file)
+
+    trace = TraceFile(path)
+    assert trace.shape == np.asarray(memory).shape
+    assert trace.shape == (GENERATIONS // every + 1, 12, 1 if fitness_only else 4)
+    np.testing.assert_array_equal(trace.generations, memory.generations[: len(memory)])
+    np.testing.assert_array_equal(np.asarray(trace), np.asarray(memory))
+    np.testing.assert_array_equal(np.asarray(file.read()), np.asarray(memory))
+
+
+def test_header(evolution, tmp_path):
+    path = tmp_path / "trace.cea"
+    record_run(
+        evolution,
+        FileTraceRecorder(path, every=3, dtype=np.float32, fitness_only=True),
+    )
+    trace = TraceFile(path)
+    assert trace.header["every"] == trace.every == 3
+    assert trace.header["fitness_only"] is trace.fitness_only is True
+    assert np.dtype(trace.header["dtype"]) == trace.dtype == np.float32
+    assert trace.data.dtype == np.float32
+    assert trace.function_name == "sphere"
+    assert trace.boundaries == [[-100.0, 100.0]] * 3
+
+
+def test_only_complete_frames_are_visible(evolution, tmp_path):
+    path = tmp_path / "trace.cea"
+    recorder = FileTraceRecorder(path, chunk_frames=3)
+    recorder.start(evolution)
+    assert len(TraceFile(path)) == 0
+    assert TraceFile(path).data.shape == (0, 12, 4)
+
+    for generation in range(4):
+        recorder.record(generation, evolution.population)
+    # the fourth frame is still in the chunk buffer
+    assert len(TraceFile(path)) == 3
+
+    # file with a half-written frame (eg. read while the chunk is being written)
+    frame = recorder.data[0].tobytes()
+    with open(path, "ab") as file:
+        file.write(frame[: len(frame) // 2])
+    trace = TraceFile(path)
+    assert len(trace) == 3
+    np.testing.assert_array_equal(trace[2], np.asarray(recorder.data[2]))
+    recorder.close()
+
+
+def test_summary_accepts_paths(evolution, tmp_path):
+    path = tmp_path / "trace.cea"
+    memory = TraceRecorder(every=2)
+    file = FileTraceRecorder(path, every=2)
+    record_run(evolution, memory, file)
+
+    expected = summary(memory)
+    assert expected["generation"] == [0, 2, 4, 6]
+    assert summary(path) == expected
+    assert summary(os.fspath(path)) == expected
+    assert summary(pathlib.PurePath(path)) == expected
+    # recorder itself is os.PathLike
+    assert isinstance(file, os.PathLike)
+    assert summary(file) == expected
+
+
+def test_not_a_trace_file(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"0" * 64)
+    with pytest.raises(ValueError):
+        TraceFile(path)
@@ -0,0 +1,208 @@
+import os
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from cec2017 import transforms
+from cec2017.problem import Problem
+from cec2017.transforms import BlockRotation, generate
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (function id, components) - simple, hybrid, composition and hybrid composition
+FUNCTIONS = [(5, 1), (15, 1), (22, 3), (30, 3)]
+
+IMPORT_SCRIPT = """
+import builtins
+import sys
+
+opened = []
+builtin_open = builtins.open
+
+
+def logging_open(file, *args, **kwargs):
+    opened.append(str(file))
+    return builtin_open(file, *args, **kwargs)
+
+
+builtins.open = logging_open
+import cec2017
+import cec2017.functions
+import cec2017.problem
+import cec2017.utils
+from cec2017 import transforms
+
+data = [path for path in opened if path.endswith((".pkl", ".npy"))]
+assert not data, data
+assert transforms.load.cache_info().currsize == 0
+assert not transforms.rotations and not transforms.shuffles_cf
+assert "shifts" not in vars(transforms)
+"""
+
+GENERATE_SCRIPT = """
+import sys
+import numpy as np
+from cec2017 import transforms
+
+transforms.GENERATED_DIR = sys.argv[1]
+kwargs = transforms.generate(*map(int, sys.argv[3:]))
+np.savez(sys.argv[2], **kwargs)
+"""
+
+
+@pytest.fixture
+def generated_dir(tmp_path, monkeypatch):
+    path = tmp_path / "generated"
+    monkeypatch.setattr(transforms, "GENERATED_DIR", str(path))
+    generate.cache_clear()
+    yield path
+    generate.cache_clear()
+
+
+def assert_same_transforms(first, second):
+    assert first.keys() == second.keys()
+    for name in first:
+        np.testing.assert_array_equal(first[name], second[name])
+
+
+def test_import_does_not_load_data():
+    subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], cwd=SRC_DIR, check=True)
+
+
+def test_converted_arrays_match_pickle(tmp_path):
+    with open(transforms.PKL_PATH, "rb") as pkl_file:
+        pkl = pickle.load(pkl_file)
+
+    transforms.convert_pickle(data_dir=str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{name}.npy" for name in pkl)
+    for name, array in pkl.items():
+        converted = np.load(tmp_path / f"{name}.npy")
+        assert converted.dtype == np.asarray(array).dtype
+        np.testing.assert_array_equal(converted, array)
+
+        loaded = transforms.load(name)
+        assert not loaded.flags.writeable
+        np.testing.assert_array_equal(loaded, array)
+        single = transforms.load(name, np.float32)
+        assert not single.flags.writeable
+        if loaded.dtype.kind == "f":
+            np.testing.assert_array_equal(single, np.asarray(array, np.float32))
+        else:
+            assert single is loaded
+
+    # the lazy containers map to the same arrays
+    np.testing.assert_array_equal(transforms.rotations[10], pkl["M_D10"])
+    np.testing.assert_array_equal(transforms.shuffles_cf[30], pkl["shuffle_cf_D30"])
+    np.testing.assert_array_equal(transforms.shifts, pkl["shift"])
+
+
+@pytest.mark.parametrize("function_id, components", FUNCTIONS)
+def test_generate_is_read_only(generated_dir, function_id, components):
+    kwargs = generate(function_id, 12, 0, components)
+    assert generate(function_id, 12, 0, components) is kwargs
+    with pytest.raises(TypeError):
+        kwargs["shift" if components == 1 else "shifts"] = None
+    for array in kwargs.values():
+        assert not array.flags.writeable
+        with pytest.raises(ValueError):
+            array[0] = 0
+
+
+def test_block_rotations_are_read_only(generated_dir):
+    rotations = generate(25, 12, 0, 5, block_size=4)["rotations"]
+    assert isinstance(rotations, tuple)
+    for rotation in rotations:
+        for layer in rotation.layers:
+            for array in layer:
+                assert not array.flags.writeable
+
+
+@pytest.mark.parametrize("function_id, components", FUNCTIONS)
+def test_generate_is_deterministic(generated_dir, function_id, components):
+    first = dict(generate(function_id, 12, 3, components))
+
+    # loaded from the saved files
+    generate.cache_clear()
+    assert_same_transforms(first, generate(function_id, 12, 3, components))
+
+    # generated again
+    generate.cache_clear()
+    for path in generated_dir.iterdir():
+        path.unlink()
+    assert_same_transforms(first, generate(function_id, 12, 3, components))
+
+    # generated in another process (and another directory)
+    output = generated_dir.parent / "other.npz"
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            GENERATE_SCRIPT,
+            str(generated_dir.parent / "other"),
+            str(output),
+            str(function_id),
+            "12",
+            "3",
+            str(components),
+        ],
+        cwd=SRC_DIR,
+        check=True,
+    )
+    with np.load(output) as other:
+        assert_same_transforms(first, other)
+
+    # another seed gives other transforms
+    name = "rotation" if components == 1 else "rotations"
+    other = generate(function_id, 12, 4, components)
+    assert not np.array_equal(first[name], other[name])
+
+
+def test_block_rotations_are_deterministic(generated_dir):
+    first = generate(21, 20, 1, 3, block_size=6)["rotations"]
+    generate.cache_clear()
+    second = generate(21, 20, 1, 3, block_size=6)["rotations"]
+    for rotation, other in zip(first, second):
+        np.testing.assert_array_equal(rotation.toarray(), other.toarray())
+
+
+@pytest.mark.parametrize(
+    "dimension, block_size", [(12, 4), (10, 4), (10, 3), (7, 7), (5, 8), (30, 7)]
+)
+def test_block_rotation(dimension, block_size):
+    rng = np.random.default_rng(dimension)
+    rotation = BlockRotation.random(dimension, block_size, rng)
+    dense = rotation.toarray()
+    assert rotation.shape == dense.shape == (dimension, dimension)
+
+    identity = np.eye(dimension)
+    np.testing.assert_allclose(dense.T @ dense, identity, atol=1e-12)
+    np.testing.assert_allclose(dense @ dense.T, identity, atol=1e-12)
+    np.testing.assert_allclose(rotation.T.toarray(), dense.T, atol=1e-15)
+
+    x = rng.standard_normal(dimension)
+    X = rng.standard_normal((5, dimension))
+    np.testing.assert_allclose(rotation @ x, dense @ x, atol=1e-12)
+    np.testing.assert_allclose(rotation.T @ x, dense.T @ x, atol=1e-12)
+    np.testing.assert_allclose(rotation @ X.T, dense @ X.T, atol=1e-12)
+    np.testing.assert_allclose(X @ rotation.T, X @ dense.T, atol=1e-12)
+    np.testing.assert_allclose(X @ rotation, X @ dense, atol=1e-12)
+    np.testing.assert_allclose(
+        transforms.shift_rotate(X, x, rotation), (X - x) @ dense.T, atol=1e-12
+    )
+
+
+def test_block_rotation_astype():
+    rotation = BlockRotation.random(10, 4, np.random.default_rng(0))
+    single = rotation.astype(np.float32)
+    assert single.dtype == np.float32
+    np.testing.assert_allclose(single.toarray(), rotation.toarray(), atol=1e-6)
+
+
+@pytest.mark.parametrize("dimension", [11, 12, 16])
+def test_hybrid_with_empty_part_is_rejected(generated_dir, dimension):
+    with pytest.raises(ValueError):
+        Problem(18, dimension)
+    Problem(18, dimension + 2)
@@ -0,0 +1,78 @@
+import gc
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+from cellular_algorithm import (  # noqa: E402
+    CellularEvolutionaryAlgorithm,
+    CompactNeighborhood,
+    GaussianMutation,
+    ReplaceIfBetterSuccession,
+    TournamentSelection,
+    TraceRecorder,
+    UniformCrossover,
+)
+from cellular_algorithm.utils import record, summary  # noqa: E402
+
+# record doesn't keep the animation unless it is displayed or saved
+pytestmark = pytest.mark.filterwarnings("ignore:Animation was deleted")
+
+
+def sphere(x):
+    return np.sum(x * x, axis=-1)
+
+
+@pytest.fixture
+def traces():
+    """Trace of the same run as a TraceRecorder and as the list returned by the
+    original `run(save_trace=True)`."""
+    evolution = CellularEvolutionaryAlgorithm(
+        CompactNeighborhood(1),
+        crossover=UniformCrossover(),
+        mutation=GaussianMutation(scale=5),
+        selection=TournamentSelection(2),
+        succession=ReplaceIfBetterSuccession(),
+        boundaries=((-100, 100),) * 2,
+        function=sphere,
+        maximize=False,
+        population_shape=(4, 5),
+        batch_function=True,
+        iterations=4,
+        seed=0,
+    )
+    recorder = TraceRecorder()
+    recorder.start(evolution)
+    recorder.record(0, evolution.population)
+    population_trace = [evolution.get_population_coordinates()]
+    for generation in range(1, 5):
+        evolution.run_single_iteration()
+        recorder.record(generation, evolution.population)
+        population_trace.append(evolution.get_population_coordinates())
+    recorder.close()
+    return evolution, population_trace, recorder
+
+
+def test_summary_accepts_list_and_recorder(traces):
+    _, population_trace, recorder = traces
+    from_list = summary(population_trace)
+    from_recorder = summary(recorder)
+
+    assert from_list == from_recorder
+    assert from_list["generation"] == [0, 1, 2, 3, 4]
+    assert from_list["min_fitness"] == [
+        min(individual[-1] for individual in frame) for frame in population_trace
+    ]
+
+
+@pytest.mark.parametrize("mode", ["2D", "3D"])
+def test_record_accepts_list_and_recorder(traces, mode):
+    evolution, population_trace, recorder = traces
+    for trace in (population_trace, recorder):
+        record(trace, evolution, points=5, iteration_step=2, mode=mode)
+        plt.close("all")
+        gc.collect()